@@ -0,0 +1,475 @@
+"""Hierarchical routing: split the network into areas and route over a backbone.
+
+Like OSPF areas, nodes are partitioned into regions. For every
+area a worker process computes shortest-path trees from each of its border
+nodes (nodes with a link into another area), using only that area's links.
+The backbone joins all border nodes with the inter-area links plus
+shortcuts between borders of the same area whose path inside the area
+crosses no other border. A query connects source and destination to the
+borders of their areas and searches the backbone only. Answers are exact:
+any shortest path splits into intra-area pieces between border nodes.
+
+    python areas.py --generate grid --nodes 40000 --areas 64 --queries 200
+    python areas.py --network topology.rnet --areas 64 --workers 4 --output areas.json
+"""
+import argparse
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def partition_network(network, areas, seed=0, refine_passes=2, imbalance=1.1):
+    """Assign every node to one of areas regions of similar size.
+
+    Greedy graph growing: seeds are spread out by farthest-first BFS, then
+    the smallest area repeatedly claims the next unassigned neighbors of its
+    frontier. A few boundary refinement passes move border nodes to the
+    neighboring area holding most of their links, within the size limit and
+    only when the area they leave stays connected. Areas are connected
+    unless the graph has more components than areas; nodes of components
+    without a seed join the smallest area. Returns {node: area}.
+    """
+    nodes = list(network.nodes())
+    if not nodes:
+        return {}
+    areas = max(1, min(areas, len(nodes)))
+    limit = math.ceil(len(nodes) / areas * imbalance)
+    rng = random.Random(seed)
+
+    # Farthest-first seeds: each new seed is the node farthest from all previous ones
+    seeds = [rng.choice(nodes)]
+    distances = _bfs_levels(network, seeds)
+    while len(seeds) < areas:
+        unreached = [node for node in nodes if node not in distances]
+        candidate = unreached[0] if unreached else max(distances, key=distances.get)
+        if candidate in seeds:
+            break
+        seeds.append(candidate)
+        for node, level in _bfs_levels(network, [candidate]).items():
+            if level < distances.get(node, math.inf):
+                distances[node] = level
+
+    assignment = {}
+    sizes = [0] * len(seeds)
+    frontiers = []
+    for area, seed_node in enumerate(seeds):
+        assignment[seed_node] = area
+        sizes[area] = 1
+        frontiers.append(deque([seed_node]))
+
+    # Grow the smallest area first so areas stay balanced
+    heap = [(1, area) for area in range(len(seeds))]
+    while heap:
+        size, area = heapq.heappop(heap)
+        frontier = frontiers[area]
+        claimed = False
+        while frontier and not claimed:
+            node = frontier[0]
+            for neighbor in network[node]:
+                if neighbor not in assignment:
+                    assignment[neighbor] = area
+                    sizes[area] += 1
+                    frontier.append(neighbor)
+                    claimed = True
+                    break
+            else:
+                frontier.popleft()
+        if claimed and sizes[area] < limit:
+            heapq.heappush(heap, (sizes[area], area))
+
+    # Nodes left over (full areas around them, or seedless components) join a neighbor's area
+    leftover = deque(node for node in nodes if node not in assignment)
+    stalled = 0
+    while leftover and stalled <= len(leftover):
+        node = leftover.popleft()
+        neighbor_areas = [assignment[neighbor] for neighbor in network[node] if neighbor in assignment]
+        if neighbor_areas:
+            area = min(neighbor_areas, key=lambda a: sizes[a])
+            assignment[node] = area
+            sizes[area] += 1
+            stalled = 0
+        else:
+            leftover.append(node)
+            stalled += 1
+    for node in leftover:
+        area = min(range(len(sizes)), key=sizes.__getitem__)
+        assignment[node] = area
+        sizes[area] += 1
+
+    for _ in range(refine_passes):
+        if not _refine(network, assignment, sizes, limit):
+            break
+    return assignment
+
+
+def _bfs_levels(network, sources):
+    levels = dict.fromkeys(sources, 0)
+    queue = deque(sources)
+    while queue:
+        node = queue.popleft()
+        for neighbor in network[node]:
+            if neighbor not in levels:
+                levels[neighbor] = levels[node] + 1
+                queue.append(neighbor)
+    return levels
+
+
+def _refine(network, assignment, sizes, limit):
+    """Move border nodes to the neighboring area with most of their links; returns the number moved"""
+    moved = 0
+    for node, area in list(assignment.items()):
+        links = {}
+        for neighbor in network[node]:
+            other = assignment[neighbor]
+            links[other] = links.get(other, 0) + 1
+        # Isolated nodes and interior nodes have nowhere better to go
+        if not links or (len(links) < 2 and area in links):
+            continue
+        best = max(links, key=links.get)
+        if best != area and links[best] > links.get(area, 0) and sizes[best] < limit and sizes[area] > 1 \
+                and _can_leave(network, assignment, node, area):
+            assignment[node] = best
+            sizes[area] -= 1
+            sizes[best] += 1
+            moved += 1
+    return moved
+
+
+def _can_leave(network, assignment, node, area):
+    """True if area stays connected without node: its neighbors in area still reach each other"""
+    inside = [neighbor for neighbor in network[node] if assignment[neighbor] == area]
+    if len(inside) < 2:
+        return True
+    remaining = set(inside[1:])
+    seen = {node, inside[0]}
+    queue = deque([inside[0]])
+    while queue:
+        for neighbor in network[queue.popleft()]:
+            if neighbor not in seen and assignment[neighbor] == area:
+                remaining.discard(neighbor)
+                if not remaining:
+                    return True
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return False
+
+
+def partition_quality(network, assignment):
+    """Edge cut, balance and border counts of a partition"""
+    sizes = {}
+    for area in assignment.values():
+        sizes[area] = sizes.get(area, 0) + 1
+    cut = 0
+    borders = set()
+    for u, v in network.edges():
+        if assignment[u] != assignment[v]:
+            cut += 1
+            borders.add(u)
+            borders.add(v)
+    edges = network.number_of_edges()
+    mean = len(assignment) / len(sizes) if sizes else 0
+    return {
+        'areas': len(sizes),
+        'edge_cut': cut,
+        'cut_fraction': cut / edges if edges else 0.0,
+        'border_nodes': len(borders),
+        'largest_area': max(sizes.values(), default=0),
+        'smallest_area': min(sizes.values(), default=0),
+        'balance': max(sizes.values(), default=0) / mean if mean else 0.0,
+    }
+
+
+def _build_area(area, adjacency, borders, weight='weight'):
+    """Shortest-path trees from each border node over one area's links (runs in a worker).
+
+    adjacency is {node: [(neighbor, weight), ...]} restricted to the area.
+    Returns (area, {border: (distances, predecessors)}, shortcuts, seconds)
+    where shortcuts lists (border, other border, distance) for tree paths
+    that pass through no third border; the others are sums of these.
+    """
+    start = time.perf_counter()
+    border_set = set(borders)
+    tables = {}
+    shortcuts = []
+    for border in borders:
+        distances = {border: 0}
+        predecessors = {}
+        through_border = {border: False}
+        heap = [(0, border)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if node in through_border and node != border:
+                continue
+            if node != border:
+                parent = predecessors[node]
+                through_border[node] = through_border[parent] or (parent != border and parent in border_set)
+                if node in border_set and not through_border[node]:
+                    shortcuts.append((border, node, dist))
+            for neighbor, cost in adjacency[node]:
+                candidate = dist + cost
+                if candidate < distances.get(neighbor, math.inf):
+                    distances[neighbor] = candidate
+                    predecessors[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+        tables[border] = (distances, predecessors)
+    return area, tables, shortcuts, time.perf_counter() - start
+
+
+class AreaRouter:
+    """Exact shortest paths from per-area border tables and a border-node backbone"""
+
+    def __init__(self, network, assignment, workers=None, weight='weight', progress=None):
+        start = time.perf_counter()
+        self.network = network
+        self.assignment = assignment
+        self.weight = weight
+
+        members = {}
+        for node, area in assignment.items():
+            members.setdefault(area, []).append(node)
+        self.borders = {area: [] for area in members}
+        for node, area in assignment.items():
+            if any(assignment[neighbor] != area for neighbor in network[node]):
+                self.borders[area].append(node)
+
+        # Each worker only ever sees its own area's links
+        jobs = []
+        for area, nodes in members.items():
+            adjacency = {node: [(neighbor, attrs.get(weight, 1)) for neighbor, attrs in network[node].items()
+                                if assignment[neighbor] == area] for node in nodes}
+            jobs.append((area, adjacency, self.borders[area], weight))
+
+        self.tables = {}
+        self.shortcuts = []
+        self.build_seconds = {}
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(jobs) < 2:
+            for done, job in enumerate(jobs, 1):
+                self._collect(*_build_area(*job))
+                if progress:
+                    progress(done, len(jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [executor.submit(_build_area, *job) for job in jobs]
+                for done, future in enumerate(as_completed(futures), 1):
+                    self._collect(*future.result())
+                    if progress:
+                        progress(done, len(jobs))
+
+        # Backbone: inter-area links plus border-to-border shortcuts inside each area
+        self.backbone = {node: {} for borders in self.borders.values() for node in borders}
+        for u, v, attrs in network.edges(data=True):
+            if assignment[u] != assignment[v]:
+                cost = attrs.get(weight, 1)
+                if cost < self.backbone[u].get(v, (math.inf,))[0]:
+                    self.backbone[u][v] = self.backbone[v][u] = (cost, None)
+        for b, other, cost in self.shortcuts:
+            self.backbone[b][other] = (cost, self.assignment[b])
+        self.seconds = time.perf_counter() - start
+
+    def _collect(self, area, tables, shortcuts, seconds):
+        self.tables.update(tables)
+        self.shortcuts.extend(shortcuts)
+        self.build_seconds[area] = seconds
+
+    def backbone_size(self):
+        """(border nodes, backbone links)"""
+        return len(self.backbone), sum(len(links) for links in self.backbone.values()) // 2
+
+    def _tree_path(self, root, node):
+        """Path node -> root along root's shortest-path tree"""
+        predecessors = self.tables[root][1]
+        path = [node]
+        while node != root:
+            node = predecessors[node]
+            path.append(node)
+        return path
+
+    def _local_path(self, source, destination):
+        """Shortest path that stays inside source's area, as (cost, path)"""
+        area = self.assignment[source]
+        distances = {source: 0}
+        predecessors = {}
+        heap = [(0, source)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if node == destination:
+                path = [node]
+                while node != source:
+                    node = predecessors[node]
+                    path.append(node)
+                return dist, path[::-1]
+            if dist > distances[node]:
+                continue
+            for neighbor, attrs in self.network[node].items():
+                if self.assignment[neighbor] != area:
+                    continue
+                candidate = dist + attrs.get(self.weight, 1)
+                if candidate < distances.get(neighbor, math.inf):
+                    distances[neighbor] = candidate
+                    predecessors[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+        return math.inf, None
+
+    def query(self, source, destination):
+        """(path, cost) of a shortest path, or (None, inf) when there is none"""
+        if source == destination:
+            return [source], 0
+        source_area = self.assignment[source]
+        target_area = self.assignment[destination]
+
+        best, best_path = math.inf, None
+        if source_area == target_area:
+            best, best_path = self._local_path(source, destination)
+
+        exits = {b: self.tables[b][0][destination] for b in self.borders[target_area]
+                 if destination in self.tables[b][0]}
+        distances = {}
+        parents = {}
+        heap = []
+        for b in self.borders[source_area]:
+            dist = self.tables[b][0].get(source)
+            if dist is not None and dist < distances.get(b, math.inf):
+                distances[b] = dist
+                parents[b] = None
+                heap.append((dist, b))
+        heapq.heapify(heap)
+
+        best_exit = None
+        while heap:
+            dist, b = heapq.heappop(heap)
+            if dist >= best:
+                break
+            if dist > distances[b]:
+                continue
+            if b in exits and dist + exits[b] < best:
+                best, best_exit = dist + exits[b], b
+            for other, (cost, area) in self.backbone[b].items():
+                candidate = dist + cost
+                if candidate < distances.get(other, math.inf):
+                    distances[other] = candidate
+                    parents[other] = (b, area)
+                    heapq.heappush(heap, (candidate, other))
+
+        if best_exit is None:
+            return best_path, best
+        return self._unpack(source, destination, best_exit, parents), best
+
+    def _unpack(self, source, destination, exit_border, parents):
+        """Expand a backbone route into the full node path"""
+        hops = []
+        node = exit_border
+        while parents[node] is not None:
+            previous, area = parents[node]
+            hops.append((previous, node, area))
+            node = previous
+        first_border = node
+
+        path = self._tree_path(first_border, source)
+        for previous, node, area in reversed(hops):
+            if area is None:
+                path.append(node)
+            else:
+                path.extend(reversed(self._tree_path(previous, node)[:-1]))
+        path.extend(reversed(self._tree_path(exit_border, destination)[:-1]))
+        return path
+
+
+def _same_cost(a, b):
+    """Equal up to float rounding; sums of the same weights in another order differ in the last bits"""
+    if math.isinf(a) or math.isinf(b):
+        return a == b
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def compare_with_flat(router, network, pairs, weight='weight'):
+    """Time router queries against flat Dijkstra; returns a summary dict"""
+    import networkx as nx
+
+    flat_seconds = area_seconds = 0.0
+    mismatches = 0
+    for source, destination in pairs:
+        start = time.perf_counter()
+        try:
+            flat_cost = nx.dijkstra_path_length(network, source, destination, weight=weight)
+        except nx.NetworkXNoPath:
+            flat_cost = math.inf
+        flat_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        path, cost = router.query(source, destination)
+        area_seconds += time.perf_counter() - start
+        if not _same_cost(cost, flat_cost) or (path is not None and not _same_cost(
+                sum(network[a][b].get(weight, 1) for a, b in zip(path, path[1:])), cost)):
+            mismatches += 1
+
+    count = max(len(pairs), 1)
+    return {
+        'queries': len(pairs),
+        'flat_ms': flat_seconds / count * 1000,
+        'area_ms': area_seconds / count * 1000,
+        'speedup': flat_seconds / area_seconds if area_seconds else 0.0,
+        'mismatches': mismatches,
+    }
+
+
+def build_parser():
+    from cli import add_network_arguments
+
+    parser = argparse.ArgumentParser(description="Partition the network into areas and route hierarchically")
+    add_network_arguments(parser)
+    parser.add_argument('--areas', type=int, default=16, help="number of areas (default 16)")
+    parser.add_argument('--workers', type=int, help="worker processes for the per-area build (default: all CPUs)")
+    parser.add_argument('--queries', type=int, default=200, help="random queries timed against flat Dijkstra")
+    parser.add_argument('--output', help="write the report as JSON")
+    return parser
+
+
+def main(argv=None):
+    from cli import prepare_network
+
+    args = build_parser().parse_args(argv)
+    network, _ = prepare_network(args, need_positions=False)
+
+    start = time.perf_counter()
+    assignment = partition_network(network, args.areas, seed=args.seed or 0)
+    partition_seconds = time.perf_counter() - start
+    quality = partition_quality(network, assignment)
+    print(f"Partitioned {network.number_of_nodes()} nodes into {quality['areas']} areas in {partition_seconds:.2f}s: "
+          f"cut {quality['edge_cut']} links ({quality['cut_fraction']:.1%}), "
+          f"{quality['border_nodes']} border nodes, balance {quality['balance']:.2f}")
+
+    router = AreaRouter(network, assignment, args.workers)
+    borders, links = router.backbone_size()
+    build = sorted(router.build_seconds.values())
+    print(f"Built area tables in {router.seconds:.2f}s; per area min {build[0]:.3f}s, "
+          f"median {build[len(build) // 2]:.3f}s, max {build[-1]:.3f}s; backbone {borders} nodes, {links} links")
+
+    rng = random.Random(args.seed)
+    nodes = list(network.nodes())
+    pairs = [tuple(rng.sample(nodes, 2)) for _ in range(args.queries)] if len(nodes) > 1 else []
+    comparison = compare_with_flat(router, network, pairs)
+    print(f"{comparison['queries']} queries: flat Dijkstra {comparison['flat_ms']:.2f} ms, "
+          f"areas {comparison['area_ms']:.2f} ms ({comparison['speedup']:.1f}x), "
+          f"{comparison['mismatches']} mismatches")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'partition': dict(quality, seconds=partition_seconds),
+                       'build': {'seconds': router.seconds, 'areas': {str(area): seconds for area, seconds
+                                                                       in sorted(router.build_seconds.items())},
+                                 'backbone_nodes': borders, 'backbone_links': links},
+                       'queries': comparison}, f, indent=2)
+    return 1 if comparison['mismatches'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
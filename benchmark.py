@@ -0,0 +1,170 @@
+"""Algorithm benchmark suite with stored baselines.
+
+Every algorithm is timed on every generator at increasing sizes. Each case
+solves a fixed set of source/destination pairs; after warmup runs the
+per-query time of each repetition is recorded with perf_counter_ns and
+summarised by median and interquartile range:
+
+    python benchmark.py --sizes 50 100 200 --output baseline.json
+    python benchmark.py --sizes 50 100 200 --compare baseline.json --threshold 0.10
+
+Comparison flags a case when its median is more than threshold slower than
+the baseline and its first quartile is above the baseline's third quartile,
+so ordinary run-to-run noise is not reported. The exit status is 1 when
+any case regresses.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from generators import NETWORK_TYPES, compute_layout, generate_network, node_positions
+from routing import ALGORITHMS, find_path
+
+DEFAULT_SIZES = (50, 100, 200, 400)
+
+
+def summarize(samples):
+    """Median, quartiles and IQR of a list of nanosecond samples"""
+    if len(samples) >= 2:
+        q1, median, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    else:
+        q1 = median = q3 = samples[0]
+    return {'median_ns': median, 'q1_ns': q1, 'q3_ns': q3, 'iqr_ns': q3 - q1, 'runs': len(samples)}
+
+
+def time_case(key, network, pairs, pos=None, warmup=3, repeats=15):
+    """Per-query nanoseconds for each timed repetition over pairs"""
+    for _ in range(warmup):
+        for source, destination in pairs:
+            find_path(key, network, source, destination, pos)
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for source, destination in pairs:
+            find_path(key, network, source, destination, pos)
+        samples.append((time.perf_counter_ns() - start) / len(pairs))
+    return samples
+
+
+def case_name(key, network_type, size):
+    return f"{key}/{network_type}/{size}"
+
+
+def build_case_network(network_type, size, seed):
+    """Deterministic weighted network of about size nodes with random-layout positions"""
+    random.seed(seed)
+    network = generate_network(network_type, size, size * 2)
+    pos = node_positions(network) or compute_layout(network, "random")
+    return network, pos
+
+
+def run_suite(sizes=DEFAULT_SIZES, network_types=NETWORK_TYPES, algorithms=None, pairs_per_case=20,
+              warmup=3, repeats=15, seed=42, progress=None):
+    """Benchmark every (algorithm, generator, size) case; returns {case: summary}"""
+    keys = algorithms or [key for _, key, _ in ALGORITHMS]
+    results = {}
+    for network_type in network_types:
+        for size in sizes:
+            network, pos = build_case_network(network_type, size, seed + size)
+            rng = random.Random(seed * 31 + size)
+            node_list = list(network.nodes())
+            pairs = [tuple(rng.sample(node_list, 2)) for _ in range(pairs_per_case)]
+
+            for key in keys:
+                name = case_name(key, network_type, size)
+                summary = summarize(time_case(key, network, pairs, pos, warmup, repeats))
+                summary['nodes'] = network.number_of_nodes()
+                summary['edges'] = network.number_of_edges()
+                results[name] = summary
+                if progress:
+                    progress(name, summary)
+    return results
+
+
+def environment():
+    import networkx as nx
+
+    return {
+        'python': platform.python_version(),
+        'networkx': nx.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def save_baseline(results, filename, settings):
+    with open(filename, 'w') as f:
+        json.dump({'environment': environment(), 'settings': settings, 'results': results}, f, indent=2)
+
+
+def load_baseline(filename):
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=0.10):
+    """Rows (case, baseline median, current median, change, regressed) for cases in both runs"""
+    rows = []
+    for name, current in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        change = current['median_ns'] / previous['median_ns'] - 1 if previous['median_ns'] else 0.0
+        regressed = change > threshold and current['q1_ns'] > previous['q3_ns']
+        rows.append((name, previous['median_ns'], current['median_ns'], change, regressed))
+    return rows
+
+
+def format_summary(name, summary):
+    return (f"{name:<28} median {summary['median_ns'] / 1000:>10.1f} us   "
+            f"IQR {summary['iqr_ns'] / 1000:>9.1f} us   ({summary['runs']} runs)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark routing algorithms across generators and sizes")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--types', nargs='+', choices=NETWORK_TYPES, default=list(NETWORK_TYPES))
+    parser.add_argument('--algorithms', nargs='+', choices=[key for _, key, _ in ALGORITHMS])
+    parser.add_argument('--pairs', type=int, default=20, help="source/destination pairs per case")
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--repeats', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='BASELINE', help="compare against a stored baseline")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown of the median that counts as a regression (default 0.10)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    settings = {'pairs': args.pairs, 'warmup': args.warmup, 'repeats': args.repeats, 'seed': args.seed}
+
+    results = run_suite(args.sizes, args.types, args.algorithms, args.pairs, args.warmup, args.repeats,
+                        args.seed, progress=lambda name, summary: print(format_summary(name, summary)))
+
+    if args.output:
+        save_baseline(results, args.output, settings)
+        print(f"Baseline written to {args.output}")
+
+    if args.compare:
+        rows = compare(results, load_baseline(args.compare), args.threshold)
+        print(f"\n{'Case':<28} {'Baseline (us)':>14} {'Current (us)':>14} {'Change':>8}")
+        for name, before, after, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<28} {before / 1000:>14.1f} {after / 1000:>14.1f} {change:>+8.1%}{flag}")
+        regressions = sum(1 for row in rows if row[4])
+        print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
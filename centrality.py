@@ -0,0 +1,201 @@
+import heapq
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+_worker_network = None
+_worker_edge_index = None
+
+
+def edge_index(network):
+    """Position of each edge in network.edges(), under both orientations"""
+    index = {}
+    for i, (u, v) in enumerate(network.edges()):
+        index[(u, v)] = index[(v, u)] = i
+    return index
+
+
+def _accumulate_source(network, edges, source, node_scores, node_index, edge_scores, weight):
+    """Add one pivot's Brandes dependencies (weighted shortest paths) to the score lists"""
+    order = []
+    predecessors = {source: []}
+    sigma = {source: 1.0}
+    settled = {}
+    seen = {source: 0}
+    heap = [(0, 0, source, source)]
+    counter = 1
+
+    while heap:
+        dist, _, pred, v = heapq.heappop(heap)
+        if v in settled:
+            continue
+        if v != source:
+            sigma[v] += sigma[pred]
+        order.append(v)
+        settled[v] = dist
+        for w, data in network[v].items():
+            candidate = dist + data.get(weight, 1)
+            if w not in settled and (w not in seen or candidate < seen[w]):
+                seen[w] = candidate
+                heapq.heappush(heap, (candidate, counter, v, w))
+                counter += 1
+                sigma[w] = 0.0
+                predecessors[w] = [v]
+            elif candidate == seen.get(w):
+                sigma[w] += sigma[v]
+                predecessors[w].append(v)
+
+    delta = dict.fromkeys(order, 0.0)
+    while order:
+        w = order.pop()
+        coefficient = (1 + delta[w]) / sigma[w]
+        for v in predecessors[w]:
+            share = sigma[v] * coefficient
+            edge_scores[edges[(v, w)]] += share
+            delta[v] += share
+        if w != source:
+            node_scores[node_index[w]] += delta[w]
+
+
+def _init_worker(network):
+    global _worker_network, _worker_edge_index
+    _worker_network = network
+    _worker_edge_index = edge_index(network)
+
+
+def _accumulate_chunk(sources, weight='weight', network=None, edges=None):
+    """Summed dependencies of a batch of pivots as (node scores, edge scores) lists"""
+    network = network if network is not None else _worker_network
+    edges = edges if edges is not None else _worker_edge_index
+    node_index = {node: i for i, node in enumerate(network.nodes())}
+    node_scores = [0.0] * len(node_index)
+    edge_scores = [0.0] * network.number_of_edges()
+    for source in sources:
+        _accumulate_source(network, edges, source, node_scores, node_index, edge_scores, weight)
+    return node_scores, edge_scores
+
+
+class BetweennessResult:
+    """Estimated normalized node and edge betweenness; exact once every node was a source"""
+
+    def __init__(self, nodes, edges, sources_used, total_sources, seconds):
+        self.nodes = nodes
+        self.edges = edges
+        self.sources_used = sources_used
+        self.total_sources = total_sources
+        self.seconds = seconds
+
+    @property
+    def exact(self):
+        return self.sources_used == self.total_sources
+
+    def edge(self, u, v):
+        return self.edges.get((u, v), self.edges.get((v, u), 0.0))
+
+    def top_nodes(self, count=10):
+        return sorted(self.nodes.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def top_edges(self, count=10):
+        return sorted(self.edges.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def estimate_betweenness(network, samples=100, time_budget=None, workers=None, seed=0, weight='weight',
+                         chunk_size=None, progress=None, cancel=None):
+    """Estimate node and edge betweenness from sampled pivot sources.
+
+    samples pivots (all nodes when samples >= n gives the exact values) are
+    processed in chunks across a spawn-context process pool. When
+    time_budget seconds pass, or cancel is set, the remaining chunks are
+    dropped and the estimate is scaled by the pivots actually processed.
+    Values are normalized like networkx's betweenness_centrality and
+    edge_betweenness_centrality.
+    """
+    start = time.perf_counter()
+    nodes = list(network.nodes())
+    n = len(nodes)
+    pivots = nodes if samples >= n else random.Random(seed).sample(nodes, samples)
+    workers = workers or os.cpu_count() or 1
+    # Small chunks keep the time budget and cancellation responsive
+    chunk_size = chunk_size or max(1, min(16, len(pivots) // (workers * 8)))
+    chunks = [pivots[i:i + chunk_size] for i in range(0, len(pivots), chunk_size)]
+
+    node_totals = [0.0] * n
+    edge_totals = [0.0] * network.number_of_edges()
+    used = 0
+
+    def merge(sources, partial):
+        nonlocal used
+        for i, value in enumerate(partial[0]):
+            node_totals[i] += value
+        for i, value in enumerate(partial[1]):
+            edge_totals[i] += value
+        used += len(sources)
+        if progress:
+            progress(used, len(pivots))
+
+    def out_of_time():
+        stopped = cancel is not None and cancel.is_set()
+        return stopped or (time_budget is not None and time.perf_counter() - start > time_budget)
+
+    if workers == 1 or len(chunks) < 2:
+        edges = edge_index(network)
+        for sources in chunks:
+            if used and out_of_time():
+                break
+            merge(sources, _accumulate_chunk(sources, weight, network, edges))
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(network,),
+                                       mp_context=multiprocessing.get_context('spawn'))
+        try:
+            pending = {executor.submit(_accumulate_chunk, sources, weight): sources for sources in chunks}
+            while pending:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(pending.pop(future), future.result())
+                if used and out_of_time():
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Scale the sampled sums to all n sources, then normalize
+    scale = n / used if used else 0.0
+    node_scale = scale / ((n - 1) * (n - 2)) if n > 2 else 0.0
+    edge_scale = scale / (n * (n - 1)) if n > 1 else 0.0
+    return BetweennessResult(
+        {node: node_totals[i] * node_scale for i, node in enumerate(nodes)},
+        {edge: edge_totals[i] * edge_scale for i, edge in enumerate(network.edges())},
+        used, n, time.perf_counter() - start)
+
+
+class BetweennessJob(threading.Thread):
+    """Run estimate_betweenness on a background thread, exposing progress for polling"""
+
+    def __init__(self, network, samples=100, time_budget=None, workers=None):
+        super().__init__(daemon=True)
+        self.network = network
+        self.samples = samples
+        self.time_budget = time_budget
+        self.workers = workers
+        self.fraction = 0.0
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancel_event = threading.Event()
+
+    def _progress(self, done, total):
+        self.fraction = done / total if total else 1.0
+
+    def run(self):
+        try:
+            self.result = estimate_betweenness(self.network, self.samples, self.time_budget, self.workers,
+                                               progress=self._progress, cancel=self.cancel_event)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def cancel(self):
+        self.cancel_event.set()
@@ -0,0 +1,184 @@
+"""Headless batch runner for routing scenarios.
+
+Loads or generates a network, runs the selected algorithms over
+source/destination pairs and writes machine-readable results. Only
+networkx/numpy are imported, never tkinter or matplotlib, so it runs on
+display-less servers:
+
+    python cli.py --generate random --nodes 50 --edges 120 --seed 7 \\
+        --pairs pairs.txt --algorithms bfs,dijkstra,astar --output results.csv
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+
+from generators import LAYOUTS, NETWORK_TYPES, compute_layout, generate_network, node_positions
+from network_io import BINARY_EXTENSION, load_network_file, save_network_file
+from routing import ALGORITHM_KEYS, ALGORITHMS, POSITIONED, measured_path, path_cost
+
+RESULT_FIELDS = ["source", "destination", "algorithm", "found", "cost", "hops", "time_ms", "path"]
+
+
+def load_network(filename):
+    """Load JSON/binary networks directly and anything else through the streaming importers"""
+    if filename.lower().endswith(('.json', BINARY_EXTENSION)):
+        return load_network_file(filename)
+
+    from importers import import_network
+    compact = import_network(filename)
+    return compact.to_networkx(), compact.position_dict()
+
+
+def read_pairs(filename):
+    """Read 'source destination' pairs, comma or whitespace separated, '#' comments"""
+    pairs = []
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = [field.strip() for field in (line.split(',') if ',' in line else line.split())]
+            if len(fields) >= 2:
+                pairs.append((fields[0], fields[1]))
+    return pairs
+
+
+def run_scenarios(network, pairs, algorithm_keys, pos=None, repeats=1, counters=False, trace_memory=False):
+    """Run every algorithm on every pair; yields one result dict per run"""
+    if counters:
+        from instrumentation import SearchStats, measured_search
+
+    for source, destination in pairs:
+        for key in algorithm_keys:
+            name = ALGORITHM_KEYS[key][0]
+            known = source in network and destination in network
+            search_stats = SearchStats() if counters else None
+            if not known:
+                path, seconds = None, 0.0
+            elif counters:
+                # Time the instrumented search so time_ms and the counters describe the same run
+                path, seconds, search_stats = measured_search(key, network, source, destination, pos, repeats,
+                                                              trace_memory)
+            else:
+                path, seconds = measured_path(key, network, source, destination, pos, repeats)
+            result = {
+                'source': source,
+                'destination': destination,
+                'algorithm': name,
+                'found': path is not None,
+                'cost': path_cost(network, path) if path else None,
+                'hops': len(path) - 1 if path else None,
+                'time_ms': seconds * 1000,
+                'path': path,
+            }
+            if counters:
+                result.update(search_stats.as_dict())
+            yield result
+
+
+def write_results(results, output, fields=RESULT_FIELDS):
+    """Write results as CSV, JSON or (default) JSON lines depending on the extension"""
+    extension = os.path.splitext(output)[1].lower() if output else ''
+    stream = open(output, 'w', newline='') if output else sys.stdout
+    try:
+        if extension == '.csv':
+            writer = csv.DictWriter(stream, fieldnames=fields)
+            writer.writeheader()
+            for result in results:
+                row = dict(result)
+                row['path'] = ' '.join(map(str, result['path'])) if result['path'] else ''
+                writer.writerow(row)
+        elif extension == '.json':
+            json.dump(list(results), stream, indent=2)
+        else:
+            for result in results:
+                stream.write(json.dumps(result) + '\n')
+    finally:
+        if output:
+            stream.close()
+
+
+def add_network_arguments(parser):
+    """Options choosing, generating and laying out the network; shared with route_server"""
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--network', help="network file (.json, .rnet, edge list, GraphML or router dump)")
+    source.add_argument('--generate', choices=NETWORK_TYPES, help="generate a network of this type")
+
+    parser.add_argument('--nodes', type=int, default=10, help="nodes to generate (default 10)")
+    parser.add_argument('--edges', type=int, default=20, help="edges to generate (default 20)")
+    parser.add_argument('--obstacles', type=float, default=0.0,
+                        help="fraction of grid cells to block when generating a grid (default 0)")
+    parser.add_argument('--seed', type=int, help="random seed for reproducible generation")
+    parser.add_argument('--layout', choices=LAYOUTS + ('none',), default='spring',
+                        help="layout for A* and JPS when the network has no positions "
+                             "(default spring; random without SciPy)")
+    parser.add_argument('--save-network', help="also save the network (.json or .rnet)")
+
+
+def prepare_network(args, need_positions=True):
+    """Load or generate the network described by add_network_arguments options"""
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    if args.network:
+        network, pos = load_network(args.network)
+    else:
+        network = generate_network(args.generate, args.nodes, args.edges, args.obstacles)
+        pos = node_positions(network) or {}
+
+    if not pos and need_positions and args.layout != 'none':
+        pos = compute_layout(network, args.layout)
+
+    if args.save_network:
+        save_network_file(network, pos, args.save_network)
+    return network, pos
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run routing scenarios without the GUI")
+    add_network_arguments(parser)
+    parser.add_argument('--pairs', help="file of source/destination pairs")
+    parser.add_argument('--pair', nargs=2, action='append', metavar=('SOURCE', 'DESTINATION'),
+                        help="a source/destination pair; may be repeated")
+    parser.add_argument('--algorithms', default=','.join(key for _, key, _ in ALGORITHMS),
+                        help="comma-separated subset of " + ','.join(key for _, key, _ in ALGORITHMS))
+    parser.add_argument('--repeats', type=int, default=1, help="report the median time of this many runs")
+    parser.add_argument('--counters', action='store_true',
+                        help="time the instrumented searches and add their expanded/relaxed/heap counters")
+    parser.add_argument('--trace-memory', action='store_true', help="also record peak allocation (implies --counters)")
+    parser.add_argument('--output', help="results file (.csv, .json, otherwise JSON lines); default stdout")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    algorithm_keys = [key.strip() for key in args.algorithms.split(',') if key.strip()]
+    unknown = [key for key in algorithm_keys if key not in ALGORITHM_KEYS]
+    if unknown:
+        parser.error(f"unknown algorithms: {', '.join(unknown)}")
+
+    network, pos = prepare_network(args, need_positions=any(key in POSITIONED for key in algorithm_keys))
+
+    pairs = read_pairs(args.pairs) if args.pairs else []
+    pairs.extend(tuple(pair) for pair in args.pair or [])
+    if not pairs:
+        parser.error("no source/destination pairs given (use --pairs or --pair)")
+
+    counters = args.counters or args.trace_memory
+    fields = RESULT_FIELDS
+    if counters:
+        from instrumentation import SearchStats
+        fields = RESULT_FIELDS[:-1] + list(SearchStats.FIELDS) + RESULT_FIELDS[-1:]
+
+    results = run_scenarios(network, pairs, algorithm_keys, pos, args.repeats, counters, args.trace_memory)
+    write_results(results, args.output, fields)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""Side-by-side comparison of routing algorithms as small multiples.
+
+Every panel shows the same network, so its edges and nodes are rasterized
+once into a shared base image that is kept until the graph, layout or panel
+size changes. Each algorithm only adds a transparent overlay with its
+explored set and path. Overlays are rendered offscreen, in worker processes
+when measured render times say that pays, then alpha-composited onto the
+base and tiled into one image, so five panels cost one full render plus five
+light ones.
+"""
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.colors import to_rgb
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from instrumentation import VISIT, SearchLog, instrumented_path
+from render import AXES_BG, DESTINATION_COLOR, EDGE_COLOR, FIGURE_BG, NODE_COLOR, SOURCE_COLOR
+
+GAP = 6
+# Seconds a comparison must stand to save before worker processes are started for it
+MIN_SAVING = 0.05
+
+
+def record_panels(network, pos, source, destination, algorithms):
+    """Run each (name, key, color) search; returns one panel dict of coordinates per algorithm"""
+    from routing import path_cost
+
+    panels = []
+    for name, key, color in algorithms:
+        log = SearchLog()
+        path, stats = instrumented_path(key, network, source, destination, pos, log=log)
+        kinds, node_ids = log.as_arrays()[:2]
+        visited = np.unique(node_ids[kinds == VISIT])
+        explored = np.array([pos[log.nodes[i]] for i in visited], dtype=float).reshape(-1, 2)
+        if path:
+            summary = f"cost {path_cost(network, path):g} · {len(path) - 1} hops · {len(visited):,} explored"
+        else:
+            summary = f"no path · {len(visited):,} explored"
+        panels.append({
+            'name': name, 'color': color, 'explored': explored, 'summary': summary,
+            'path': np.array([pos[node] for node in path or ()], dtype=float).reshape(-1, 2),
+        })
+    return panels
+
+
+def grid_shape(count):
+    """(rows, columns) of a near-square grid for count panels"""
+    columns = max(1, math.ceil(math.sqrt(count)))
+    return max(1, math.ceil(count / columns)), columns
+
+
+def _bounds(xy):
+    low, high = xy.min(axis=0), xy.max(axis=0)
+    pad = np.maximum((high - low) * 0.05, 1e-9)
+    return (low[0] - pad[0], high[0] + pad[0], low[1] - pad[1], high[1] + pad[1])
+
+
+def _panel_figure(bounds, size, dpi, facecolor):
+    """Offscreen figure whose single, frameless axes fills it and spans bounds"""
+    fig = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi, facecolor=facecolor)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+    ax.set_xlim(bounds[0], bounds[1])
+    ax.set_ylim(bounds[2], bounds[3])
+    return fig, canvas, ax
+
+
+def render_base(xy, edge_xy, bounds, size, dpi=100, node_size=20):
+    """RGB array of the network itself, shared by every panel"""
+    fig, canvas, ax = _panel_figure(bounds, size, dpi, AXES_BG)
+    # All edges as one NaN-separated polyline, as in the frontier replay
+    ax.plot(edge_xy[:, 0], edge_xy[:, 1], color=EDGE_COLOR, linewidth=0.6, alpha=0.35)
+    ax.scatter(xy[:, 0], xy[:, 1], s=node_size, color=NODE_COLOR, alpha=0.5, linewidths=0)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[..., :3].copy()
+
+
+def render_overlay(panel, markers, bounds, size, dpi=100, node_size=20):
+    """RGBA array of one panel's explored set, path and labels on a transparent background"""
+    fig, canvas, ax = _panel_figure(bounds, size, dpi, 'none')
+    explored, path, color = panel['explored'], panel['path'], panel['color']
+    if len(explored):
+        ax.scatter(explored[:, 0], explored[:, 1], s=node_size, color=color, alpha=0.45, linewidths=0)
+    if len(path) > 1:
+        ax.plot(path[:, 0], path[:, 1], color=color, linewidth=3, solid_capstyle='round')
+    if 1 < len(path) <= 50:
+        ax.scatter(path[:, 0], path[:, 1], s=node_size * 1.5, color=color, edgecolors='white', linewidths=0.8)
+    for (x, y), marker_color in markers:
+        ax.scatter([x], [y], s=node_size * 4, facecolors='none', edgecolors=marker_color, linewidths=2)
+
+    label = dict(facecolor=FIGURE_BG, alpha=0.7, edgecolor='none', pad=3)
+    ax.text(0.02, 0.98, panel['name'], transform=ax.transAxes, va='top', color='white',
+            fontsize=11, weight='bold', bbox=label)
+    ax.text(0.02, 0.02, panel['summary'], transform=ax.transAxes, va='bottom', color='white',
+            fontsize=8, bbox=label)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def composite(base, overlay):
+    """Alpha-blend an RGBA overlay onto an opaque RGB base"""
+    alpha = overlay[..., 3:4].astype(np.float32) / 255
+    blended = overlay[..., :3] * alpha + base * (1 - alpha)
+    return (blended + 0.5).astype(np.uint8)
+
+
+def tile(images, columns, gap=GAP, background=FIGURE_BG):
+    """Lay equally sized RGB images out row by row with gap pixels between them"""
+    height, width = images[0].shape[:2]
+    rows = math.ceil(len(images) / columns)
+    sheet = np.empty((rows * height + (rows - 1) * gap, columns * width + (columns - 1) * gap, 3), dtype=np.uint8)
+    sheet[:] = np.round(np.array(to_rgb(background)) * 255).astype(np.uint8)
+    for i, image in enumerate(images):
+        top, left = (i // columns) * (height + gap), (i % columns) * (width + gap)
+        sheet[top:top + height, left:left + width] = image
+    return sheet
+
+
+def _warm_up():
+    """Worker initialisation: import matplotlib and load fonts before the first real overlay"""
+    empty = np.empty((0, 2))
+    render_overlay({'name': "", 'summary': "", 'color': 'white', 'explored': empty, 'path': empty},
+                   [], (0, 1, 0, 1), (10, 10))
+
+
+def _timed_overlay(*args):
+    """render_overlay in a worker, with the wall-clock time it finished"""
+    overlay = render_overlay(*args)
+    return overlay, time.time()
+
+
+class CostModel:
+    """seconds = fixed + per_point * points, fitted to the most recent measurements"""
+
+    def __init__(self, size=32):
+        self.samples = deque(maxlen=size)
+
+    def add(self, points, seconds):
+        self.samples.append((points, seconds))
+
+    def predict(self, points):
+        """Estimated seconds, or None before the first measurement"""
+        if not self.samples:
+            return None
+        xs = np.array([p for p, _ in self.samples], dtype=float)
+        ys = np.array([s for _, s in self.samples])
+        if np.ptp(xs) == 0:
+            return ys.mean() * max(points, 1) / max(xs[0], 1)
+        per_point, fixed = np.polyfit(xs, ys, 1)
+        return max(fixed, 0.0) + max(per_point, 0.0) * points
+
+
+class ComparisonRenderer:
+    """Renders comparison sheets, keeping the rasterized network between calls.
+
+    Overlays render here until measured timings predict that worker
+    processes would be faster. Each worker pays seconds of matplotlib
+    imports, so the pool is started in the background the first time it
+    could help and only used once it is warm; until then rendering stays
+    serial. Serial and parallel overlay times are both measured, so the
+    choice follows this machine rather than a fixed size.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._warming = []
+        self.serial_cost = CostModel()
+        self.parallel_cost = CostModel()
+        self._base_key = None
+        self._base_pos = None
+        self._base = None
+        self._layout = None
+
+    def _network_arrays(self, network, pos):
+        order = list(network.nodes())
+        index = {node: i for i, node in enumerate(order)}
+        xy = np.array([pos[node] for node in order], dtype=float).reshape(-1, 2)
+        edges = np.array([(index[u], index[v]) for u, v in network.edges()], dtype=np.intp).reshape(-1, 2)
+        edge_xy = np.full((len(edges), 3, 2), np.nan)
+        edge_xy[:, 0] = xy[edges[:, 0]]
+        edge_xy[:, 1] = xy[edges[:, 1]]
+        return xy, edge_xy.reshape(-1, 2)
+
+    def start_pool(self):
+        """Start the worker processes in the background; render uses them once they are warm"""
+        if self._pool is None and self.workers > 1:
+            # Spawn rather than fork so workers never inherit a live Tk interpreter
+            context = multiprocessing.get_context('spawn')
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            self._warming = [self._pool.submit(_warm_up) for _ in range(self.workers)]
+
+    @property
+    def pool_ready(self):
+        return self._pool is not None and all(future.done() for future in self._warming)
+
+    def _use_pool(self, counts):
+        """Whether workers should render these overlays, judging by measured times"""
+        if self.workers == 1 or len(counts) < 2 or not self.serial_cost.samples:
+            return False
+        serial = sum(self.serial_cost.predict(points) for points in counts)
+        parallel = self.parallel_cost.predict(sum(counts))
+        if parallel is None:
+            # Optimistic until the pool has been timed: the serial work split over the workers
+            parallel = serial / min(self.workers, len(counts))
+        if serial - parallel < MIN_SAVING:
+            return False
+        if not self.pool_ready:
+            self.start_pool()
+            return False
+        return True
+
+    def _overlays(self, panels, markers, bounds, size, dpi, node_size):
+        """Start rendering every overlay; returns a function that waits for the results"""
+        counts = [len(panel['explored']) + len(panel['path']) for panel in panels]
+        if not self._use_pool(counts):
+            def collect():
+                overlays = []
+                for panel, points in zip(panels, counts):
+                    start = time.perf_counter()
+                    overlays.append(render_overlay(panel, markers, bounds, size, dpi, node_size))
+                    self.serial_cost.add(points, time.perf_counter() - start)
+                return overlays
+            return collect
+
+        start = time.time()
+        futures = [self._pool.submit(_timed_overlay, panel, markers, bounds, size, dpi, node_size)
+                   for panel in panels]
+
+        def collect():
+            results = [future.result() for future in futures]
+            # Time to the last overlay, not including the base drawn here meanwhile
+            self.parallel_cost.add(sum(counts), max(finished for _, finished in results) - start)
+            return [overlay for overlay, _ in results]
+        return collect
+
+    def render(self, network, pos, panels, source=None, destination=None, panel_size=(400, 320),
+               columns=None, dpi=100, node_size=20, version=None):
+        """One RGB image with a panel per entry of panels (see record_panels).
+
+        version identifies the graph state (e.g. RouteCache.version); with
+        None the base image is redrawn every time.
+        """
+        if not panels:
+            raise ValueError("Nothing to compare")
+        size = (int(panel_size[0]), int(panel_size[1]))
+        key = (version, size, dpi, node_size, network.number_of_nodes(), network.number_of_edges())
+        cached = version is not None and key == self._base_key and pos is self._base_pos
+
+        if cached:
+            bounds = self._layout
+        else:
+            xy, edge_xy = self._network_arrays(network, pos)
+            bounds = _bounds(xy)
+        markers = [(pos[node], color) for node, color in ((source, SOURCE_COLOR), (destination, DESTINATION_COLOR))
+                   if node in pos]
+        # Overlays render in the workers while this process draws the base
+        collect = self._overlays(panels, markers, bounds, size, dpi, node_size)
+        if not cached:
+            self._base = render_base(xy, edge_xy, bounds, size, dpi, node_size)
+            self._base_key, self._base_pos, self._layout = key, pos, bounds
+        overlays = collect()
+
+        columns = columns or grid_shape(len(panels))[1]
+        return tile([composite(self._base, overlay) for overlay in overlays], columns)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._warming = []
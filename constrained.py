@@ -0,0 +1,137 @@
+"""Cheapest paths under resource constraints: a hop limit, a minimum link
+bandwidth and routers to avoid.
+
+Bandwidth and forbidden routers only remove links; edges without a
+'bandwidth' attribute are treated as unconstrained. The hop limit is a
+resource, handled by a label-setting search over (cost, hops) labels.
+"""
+import heapq
+import math
+from collections import deque, namedtuple
+
+Constraints = namedtuple('Constraints', ['max_hops', 'min_bandwidth', 'forbidden'])
+NO_CONSTRAINTS = Constraints(None, None, frozenset())
+
+
+def parse_constraints(max_hops=0, min_bandwidth='', forbidden=''):
+    """Constraints from form values: 0 hops or blank bandwidth means no limit,
+    forbidden is a comma or whitespace separated list of nodes"""
+    text = str(min_bandwidth).strip()
+    bandwidth = float(text) if text else None
+    nodes = frozenset(node for node in str(forbidden).replace(',', ' ').split())
+    return Constraints(int(max_hops) or None, bandwidth, nodes)
+
+
+def _link_filter(constraints):
+    forbidden = constraints.forbidden
+    min_bandwidth = constraints.min_bandwidth
+
+    def usable(u, v, attrs):
+        if u in forbidden or v in forbidden:
+            return False
+        return min_bandwidth is None or attrs.get('bandwidth', math.inf) >= min_bandwidth
+    return usable
+
+
+def _lower_bounds(network, source, destination, usable, weight, max_hops):
+    """Lower bounds on hops and cost to destination over usable links, for nodes within max_hops of it.
+
+    Hop distances are exact. The cost sweep stops once source is settled;
+    nodes it did not reach are at least that far, which is returned as the
+    default cost bound.
+    """
+    hops = {destination: 0}
+    queue = deque([destination])
+    while queue:
+        node = queue.popleft()
+        if hops[node] == max_hops:
+            continue
+        for neighbor, attrs in network[node].items():
+            if neighbor not in hops and usable(node, neighbor, attrs):
+                hops[neighbor] = hops[node] + 1
+                queue.append(neighbor)
+
+    costs = {}
+    if source not in hops:
+        return costs, hops, math.inf
+    heap = [(0, destination)]
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if node in costs:
+            continue
+        costs[node] = cost
+        if node == source:
+            break
+        for neighbor, attrs in network[node].items():
+            if neighbor in hops and neighbor not in costs and usable(node, neighbor, attrs):
+                heapq.heappush(heap, (cost + attrs.get(weight, 1), neighbor))
+    return costs, hops, costs[source]
+
+
+def constrained_path(network, source, destination, constraints=NO_CONSTRAINTS, weight='weight', stats=None):
+    """Cheapest path satisfying constraints, or None when there is none.
+
+    Labels are expanded in order of cost plus a consistent lower bound on the
+    unconstrained cost to the destination, so the first label to reach it is
+    optimal. A label is
+    pruned when a cheaper label already reached its node in no more hops, or
+    when even the fewest remaining hops would exceed the limit. Without a hop
+    limit the search is a plain Dijkstra over the usable links.
+    """
+    if source not in network or destination not in network:
+        return None
+    if source in constraints.forbidden or destination in constraints.forbidden:
+        return None
+
+    usable = _link_filter(constraints)
+    max_hops = constraints.max_hops
+    limited = max_hops is not None
+    if limited:
+        cost_bound, hop_bound, radius = _lower_bounds(network, source, destination, usable, weight, max_hops)
+        if source not in cost_bound:
+            return None
+
+    label_nodes = [source]
+    label_parents = [-1]
+    heap = [(radius if limited else 0, 0, 0, 0)]
+    fewest_hops = {}
+    pushed = popped = 0
+
+    while heap:
+        _, cost, hops, label = heapq.heappop(heap)
+        popped += 1
+        node = label_nodes[label]
+        if hops >= fewest_hops.get(node, math.inf):
+            continue
+        # Without a hop limit the first (cheapest) label at a node is the only useful one
+        fewest_hops[node] = hops if limited else -1
+        if node == destination:
+            break
+
+        next_hops = hops + 1
+        for neighbor, attrs in network[node].items():
+            if next_hops >= fewest_hops.get(neighbor, math.inf) or not usable(node, neighbor, attrs):
+                continue
+            next_cost = estimate = cost + attrs.get(weight, 1)
+            if limited:
+                if neighbor not in hop_bound or next_hops + hop_bound[neighbor] > max_hops:
+                    continue
+                estimate += cost_bound.get(neighbor, radius)
+            label_nodes.append(neighbor)
+            label_parents.append(label)
+            heapq.heappush(heap, (estimate, next_cost, next_hops, len(label_nodes) - 1))
+            pushed += 1
+    else:
+        label = None
+
+    if stats is not None:
+        stats['pushes'] = pushed
+        stats['pops'] = popped
+    if label is None:
+        return None
+
+    path = []
+    while label >= 0:
+        path.append(label_nodes[label])
+        label = label_parents[label]
+    return path[::-1]
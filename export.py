@@ -0,0 +1,174 @@
+import math
+import os
+import shutil
+import subprocess
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib import rcParams
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from packet_layer import PacketLayer
+from render import FIGURE_BG, draw_network_on, draw_path_on, set_title
+
+FRAME_PATTERN = "frame_{:06d}.png"
+
+
+def build_path_scene(network, pos, algorithms, source=None, destination=None,
+                     frames_per_hop=10, hold_frames=10, node_size=500):
+    """Scene with one segment per algorithm, each moving a packet along its path.
+
+    algorithms is a list of (name, path, color) tuples; entries without a path
+    are skipped, mirroring visualize_algorithms.
+    """
+    segments = []
+    for name, path, color in algorithms:
+        if not path or len(path) < 2:
+            continue
+        segments.append({
+            'title': f"🚀 {name} Pathfinding in Progress",
+            'highlights': [(path, color)],
+            'packets': [(path, 0, 'yellow')],
+            'packet_size': 225,
+            'hold_frames': hold_frames,
+        })
+    return {
+        'network': network, 'pos': pos, 'source': source, 'destination': destination,
+        'node_size': node_size, 'frames_per_hop': frames_per_hop, 'segments': segments,
+    }
+
+
+def build_traffic_scene(network, pos, packets, source=None, destination=None,
+                        frames_per_hop=10, node_size=500):
+    """Scene with a single segment animating many (path, start_frame, color) packets"""
+    segment = {
+        'title': f"🚦 Traffic Simulation ({len(packets)} packets)",
+        'highlights': [],
+        'packets': list(packets),
+        'packet_size': 60,
+        'hold_frames': 0,
+    }
+    return {
+        'network': network, 'pos': pos, 'source': source, 'destination': destination,
+        'node_size': node_size, 'frames_per_hop': frames_per_hop, 'segments': [segment],
+    }
+
+
+def _packet_layer(ax, scene, segment):
+    layer = PacketLayer(ax, scene['pos'], frames_per_hop=scene['frames_per_hop'],
+                        size=segment['packet_size'], linewidth=2 if len(segment['packets']) == 1 else 1.5)
+    for path, start, color in segment['packets']:
+        layer.add_packet(path, start_frame=start, color=color)
+    layer.build()
+    return layer
+
+
+def _segment_lengths(scene):
+    """Frame count of every segment, including its trailing hold"""
+    lengths = []
+    for segment in scene['segments']:
+        frames = [start + (len(path) - 1) * scene['frames_per_hop'] + 1
+                  for path, start, color in segment['packets'] if len(path) > 1]
+        lengths.append(int(math.ceil(max(frames, default=0))) + segment['hold_frames'])
+    return lengths
+
+
+def _render_chunk(scene, segment_index, first_frame, last_frame, global_offset, out_dir, figsize, dpi):
+    """Render frames [first_frame, last_frame) of one segment to PNG files"""
+    segment = scene['segments'][segment_index]
+
+    fig = Figure(figsize=figsize, dpi=dpi, facecolor=FIGURE_BG)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    draw_network_on(ax, scene['network'], scene['pos'], scene['source'], scene['destination'],
+                    node_size=scene['node_size'])
+    for path, color in segment['highlights']:
+        draw_path_on(ax, scene['network'], scene['pos'], path, color)
+    set_title(ax, segment['title'])
+    fig.tight_layout()
+
+    layer = _packet_layer(ax, scene, segment)
+    last_packet_frame = max(layer.total_frames - 1, 0)
+
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    width, height = canvas.get_width_height()
+
+    for frame in range(first_frame, last_frame):
+        canvas.restore_region(background)
+        layer.update(min(frame, last_packet_frame))
+        ax.draw_artist(layer.artist)
+        image = Image.frombuffer('RGBA', (width, height), bytes(canvas.buffer_rgba()), 'raw', 'RGBA', 0, 1)
+        image.convert('RGB').save(os.path.join(out_dir, FRAME_PATTERN.format(global_offset + frame)))
+
+    return last_frame - first_frame
+
+
+def render_frames(scene, out_dir, workers=None, chunk_size=40, figsize=(10, 8), dpi=100):
+    """Render every frame of a scene to out_dir in parallel worker processes"""
+    os.makedirs(out_dir, exist_ok=True)
+    lengths = _segment_lengths(scene)
+
+    jobs = []
+    offset = 0
+    for index, length in enumerate(lengths):
+        for start in range(0, length, chunk_size):
+            jobs.append((scene, index, start, min(start + chunk_size, length), offset, out_dir, figsize, dpi))
+        offset += length
+
+    if not jobs:
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        return sum(_render_chunk(*job) for job in jobs)
+
+    # Spawn rather than fork so workers never inherit a live Tk interpreter
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=context) as pool:
+        futures = [pool.submit(_render_chunk, *job) for job in jobs]
+        return sum(future.result() for future in futures)
+
+
+def _stitch_gif(frame_dir, count, filename, fps):
+    frames = [Image.open(os.path.join(frame_dir, FRAME_PATTERN.format(i))) for i in range(count)]
+    frames[0].save(filename, save_all=True, append_images=frames[1:],
+                   duration=max(1, int(1000 / fps)), loop=0)
+
+
+def _find_ffmpeg():
+    ffmpeg = shutil.which(rcParams['animation.ffmpeg_path'])
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg is required for MP4 export; export to .gif or a PNG folder instead")
+    return ffmpeg
+
+
+def _stitch_mp4(ffmpeg, frame_dir, filename, fps):
+    subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-framerate', str(fps),
+                    '-i', os.path.join(frame_dir, 'frame_%06d.png'),
+                    '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', filename],
+                   check=True)
+
+
+def export_scene(scene, filename, fps=20, workers=None, figsize=(10, 8), dpi=100):
+    """Export a scene to .gif, .mp4 or, for any other name, a folder of PNG frames.
+
+    Returns the number of frames written.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in ('.gif', '.mp4'):
+        return render_frames(scene, filename, workers=workers, figsize=figsize, dpi=dpi)
+    ffmpeg = _find_ffmpeg() if extension == '.mp4' else None
+
+    with tempfile.TemporaryDirectory(prefix='routing_export_') as frame_dir:
+        count = render_frames(scene, frame_dir, workers=workers, figsize=figsize, dpi=dpi)
+        if not count:
+            return 0
+        if extension == '.gif':
+            _stitch_gif(frame_dir, count, filename, fps)
+        else:
+            _stitch_mp4(ffmpeg, frame_dir, filename, fps)
+    return count
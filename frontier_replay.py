@@ -0,0 +1,121 @@
+import math
+
+import numpy as np
+from matplotlib import colormaps
+
+from instrumentation import SearchLog, instrumented_path
+from render import AXES_BG, DESTINATION_COLOR, EDGE_COLOR, FIGURE_BG, SOURCE_COLOR
+
+UNVISITED = -1.0
+UNVISITED_COLOR = '#2a3a5e'
+# Heat of an explored node once the frontier has moved on
+EXPLORED_GLOW = 0.15
+
+
+class FrontierReplay:
+    """Replay search event logs as frontier heatmaps, one panel per algorithm.
+
+    Every panel advances by the same number of events per frame, so a search
+    that does more work visibly takes longer. Each frame only folds the new
+    slice of events into a per-node "last touched" array, so the cost of a
+    frame does not depend on how long the log is.
+    """
+
+    def __init__(self, fig, network, pos, logs, source=None, destination=None,
+                 max_frames=300, decay_frames=20, node_size=40, cmap='inferno'):
+        self.fig = fig
+        self.order = list(network.nodes())
+        index = {node: i for i, node in enumerate(self.order)}
+        xy = np.array([pos[node] for node in self.order], dtype=float).reshape(-1, 2)
+
+        longest = max((len(log) for _, log in logs), default=0)
+        self.total_frames = max(1, min(max_frames, longest))
+        self.events_per_frame = max(1, math.ceil(longest / self.total_frames))
+        self.decay_events = self.events_per_frame * decay_frames
+
+        # All edges as one NaN-separated polyline; far cheaper than a LineCollection at this scale
+        edges = np.array([(index[u], index[v]) for u, v in network.edges()], dtype=np.intp).reshape(-1, 2)
+        edge_xy = np.full((len(edges), 3, 2), np.nan)
+        edge_xy[:, 0] = xy[edges[:, 0]]
+        edge_xy[:, 1] = xy[edges[:, 1]]
+        edge_xy = edge_xy.reshape(-1, 2)
+        markers = [node for node in (source, destination) if node in index]
+
+        fig.clear()
+        fig.set_facecolor(FIGURE_BG)
+        axes = fig.subplots(1, max(1, len(logs)), squeeze=False).ravel()
+        cmap = colormaps[cmap].with_extremes(under=UNVISITED_COLOR)
+
+        self.panels = []
+        for ax, (name, log) in zip(axes, logs):
+            ax.set_facecolor(AXES_BG)
+            ax.set_xticks([])
+            ax.set_yticks([])
+            ax.plot(edge_xy[:, 0], edge_xy[:, 1], color=EDGE_COLOR, linewidth=0.5, alpha=0.3, zorder=1)
+
+            # Translate the log's own node ids to this figure's node order once
+            mapping = np.array([index[node] for node in log.nodes], dtype=np.intp)
+            node_ids = mapping[log.as_arrays()[1]] if len(log) else np.empty(0, dtype=np.intp)
+
+            scatter = ax.scatter(xy[:, 0], xy[:, 1], c=np.full(len(xy), UNVISITED), s=node_size,
+                                 cmap=cmap, vmin=0, vmax=1, zorder=2, animated=True)
+
+            for node, color in zip(markers, (SOURCE_COLOR, DESTINATION_COLOR)):
+                ax.scatter(*xy[index[node]], s=node_size * 3, facecolors='none', edgecolors=color,
+                           linewidths=2, zorder=3)
+
+            ax.autoscale_view()
+            ax.set_title(name, fontsize=12, color='white', weight='bold')
+            label = ax.text(0.02, 0.02, "", transform=ax.transAxes, color='white', fontsize=9, animated=True)
+
+            self.panels.append({
+                'node_ids': node_ids,
+                'last_seen': np.full(len(xy), -np.inf),
+                'scatter': scatter,
+                'label': label,
+                'done': 0,
+            })
+
+        fig.tight_layout()
+
+    @property
+    def artists(self):
+        return [artist for panel in self.panels for artist in (panel['scatter'], panel['label'])]
+
+    def init_frame(self):
+        for panel in self.panels:
+            panel['last_seen'].fill(-np.inf)
+            panel['done'] = 0
+            panel['scatter'].set_array(np.full(len(panel['last_seen']), UNVISITED))
+            panel['label'].set_text("")
+        return self.artists
+
+    def update(self, frame):
+        """Advance every panel to the end of frame"""
+        now = min((frame + 1) * self.events_per_frame, self.total_frames * self.events_per_frame)
+        for panel in self.panels:
+            node_ids = panel['node_ids']
+            end = min(now, len(node_ids))
+            if end < panel['done']:
+                # Played backwards (e.g. the animation restarted): rebuild from scratch
+                panel['last_seen'].fill(-np.inf)
+                panel['done'] = 0
+            if end > panel['done']:
+                np.maximum.at(panel['last_seen'], node_ids[panel['done']:end],
+                              np.arange(panel['done'], end, dtype=float))
+                panel['done'] = end
+
+            last_seen = panel['last_seen']
+            visited = np.isfinite(last_seen)
+            heat = np.full(len(last_seen), UNVISITED)
+            heat[visited] = np.maximum(EXPLORED_GLOW, 1 - (end - 1 - last_seen[visited]) / self.decay_events)
+            panel['scatter'].set_array(heat)
+            panel['label'].set_text(f"{end:,} / {len(node_ids):,} events")
+        return self.artists
+
+
+def record_search(key, network, source, destination, pos=None):
+    """Run the instrumented search for key and return (path, SearchStats, SearchLog)"""
+    log = SearchLog()
+    path, stats = instrumented_path(key, network, source, destination, pos, log=log)
+    return path, stats, log
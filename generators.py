@@ -0,0 +1,190 @@
+import math
+import random
+
+import networkx as nx
+
+NETWORK_TYPES = ("random", "scale_free", "small_world", "grid", "geometric")
+LAYOUTS = ("spring", "circular", "random", "shell")
+BANDWIDTHS = (100, 1000, 10000)
+
+
+def generate_random_network(nodes, edges):
+    """Generate a random connected network"""
+    G = nx.Graph()
+
+    # Add nodes
+    for i in range(1, nodes + 1):
+        G.add_node(str(i))
+
+    # Create minimum spanning tree for connectivity
+    node_list = list(G.nodes())
+    connected = {node_list[0]}
+    unconnected = set(node_list[1:])
+
+    while unconnected:
+        source = random.choice(list(connected))
+        target = random.choice(list(unconnected))
+        weight = random.randint(1, 10)
+        G.add_edge(source, target, weight=weight)
+        connected.add(target)
+        unconnected.remove(target)
+
+    # Add remaining edges
+    remaining = edges - (nodes - 1)
+    attempts = 0
+    max_attempts = nodes * 10
+
+    while remaining > 0 and attempts < max_attempts:
+        u, v = random.sample(node_list, 2)
+        if not G.has_edge(u, v):
+            weight = random.randint(1, 10)
+            G.add_edge(u, v, weight=weight)
+            remaining -= 1
+        attempts += 1
+
+    return G
+
+
+def generate_geometric_network(nodes, edges, neighbors=None):
+    """Generate a connected random geometric network in the unit square.
+
+    Nodes get a 'pos' attribute and every edge weighs its Euclidean length.
+    Edges join nodes within the radius that gives about the requested edge
+    count, or each node's nearest neighbors when neighbors is set; nearby
+    pairs come from a uniform grid index, so construction stays near-linear.
+    Components left over are joined to the main one by their shortest link.
+    """
+    from spatial_index import SpatialIndex
+
+    pos = {str(i): (random.random(), random.random()) for i in range(1, nodes + 1)}
+    index = SpatialIndex()
+    index.rebuild(pos)
+
+    G = nx.Graph()
+    for node, xy in pos.items():
+        G.add_node(node, pos=xy)
+
+    def link(u, v):
+        G.add_edge(u, v, weight=math.dist(pos[u], pos[v]))
+
+    if neighbors:
+        for node, (x, y) in pos.items():
+            for dist, other in index.nearest_nodes(x, y, neighbors + 1):
+                if other != node:
+                    link(node, other)
+    else:
+        # n^2 * pi * r^2 / 2 pairs fall within r of each other
+        radius = math.sqrt(2 * edges / (math.pi * nodes * nodes))
+        for node, (x, y) in pos.items():
+            for other in index.nodes_within(x, y, radius):
+                if other != node:
+                    link(node, other)
+
+    components = sorted(nx.connected_components(G), key=len, reverse=True)
+    main = set(components[0])
+    for component in components[1:]:
+        best = None
+        for node in component:
+            x, y = pos[node]
+            for dist, other in index.nearest_nodes(x, y, 1, accept=main.__contains__):
+                if best is None or dist < best[0]:
+                    best = (dist, node, other)
+        link(best[1], best[2])
+        main.update(component)
+
+    return G
+
+
+def grid_dimensions(nodes):
+    """Rows and columns of the squarest grid with at least nodes cells"""
+    rows = max(1, math.isqrt(nodes))
+    return rows, -(-nodes // rows)
+
+
+def generate_grid_network(rows, cols, obstacles=0.0, cells=None):
+    """Generate a 4-connected grid with unit link costs.
+
+    The node in row r and column c is labelled str(r * cols + c + 1) and keeps
+    (c, r) as its 'pos'. Only the first cells cells are used, so the last row
+    may be partial. A fraction obstacles of the cells is then removed at
+    random, and only the largest connected region is kept.
+    """
+    cells = rows * cols if cells is None else min(cells, rows * cols)
+    G = nx.Graph()
+    for index in range(cells):
+        row, col = divmod(index, cols)
+        G.add_node(str(index + 1), pos=(col, row))
+    for index in range(cells):
+        row, col = divmod(index, cols)
+        if col + 1 < cols and index + 1 < cells:
+            G.add_edge(str(index + 1), str(index + 2), weight=1)
+        if index + cols < cells:
+            G.add_edge(str(index + 1), str(index + cols + 1), weight=1)
+
+    blocked = int(cells * obstacles)
+    if blocked:
+        G.remove_nodes_from(random.sample(list(G.nodes()), min(blocked, cells - 2)))
+        largest = max(nx.connected_components(G), key=len)
+        G.remove_nodes_from([node for node in list(G.nodes()) if node not in largest])
+    return G
+
+
+def node_positions(network):
+    """Positions stored on the nodes by the geometric or grid generator, or None"""
+    pos = nx.get_node_attributes(network, 'pos')
+    return pos if pos and len(pos) == network.number_of_nodes() else None
+
+
+def generate_network(network_type, nodes, edges, obstacles=0.0):
+    """Generate a weighted network of the given type; obstacles only applies to grids"""
+    if nodes < 2:
+        raise ValueError("Number of nodes must be at least 2")
+
+    # Generate based on type
+    if network_type == "random":
+        network = generate_random_network(nodes, edges)
+    elif network_type == "scale_free":
+        network = nx.barabasi_albert_graph(nodes, max(1, edges // nodes))
+        network = nx.relabel_nodes(network, {i: str(i + 1) for i in range(nodes)})
+    elif network_type == "small_world":
+        network = nx.watts_strogatz_graph(nodes, max(2, edges // nodes), 0.3)
+        network = nx.relabel_nodes(network, {i: str(i + 1) for i in range(nodes)})
+    elif network_type == "grid":
+        rows, cols = grid_dimensions(nodes)
+        network = generate_grid_network(rows, cols, obstacles, nodes)
+    elif network_type == "geometric":
+        network = generate_geometric_network(nodes, edges)
+    else:
+        raise ValueError(f"Unknown network type: {network_type}")
+
+    # Add random weights; geometric networks keep their lengths and grids their unit steps
+    if network_type not in ("geometric", "grid"):
+        for edge in network.edges():
+            network[edge[0]][edge[1]]['weight'] = random.randint(1, 10)
+
+    # Latency varies independently of cost, so routes trade one against the other
+    for u, v in network.edges():
+        network[u][v]['latency'] = random.randint(1, 10)
+
+    # Link capacities in Mbps
+    for u, v in network.edges():
+        network[u][v]['bandwidth'] = random.choice(BANDWIDTHS)
+
+    return network
+
+
+def compute_layout(network, layout_type="spring"):
+    """Node positions for one of the supported layouts"""
+    if layout_type == "spring":
+        try:
+            return nx.spring_layout(network, seed=42, k=2, iterations=50)
+        except ImportError:
+            # From 500 nodes networkx switches to a sparse solver that needs SciPy
+            return nx.random_layout(network, seed=42)
+    elif layout_type == "circular":
+        return nx.circular_layout(network)
+    elif layout_type == "random":
+        return nx.random_layout(network, seed=42)
+    elif layout_type == "shell":
+        return nx.shell_layout(network)
+    raise ValueError(f"Unknown layout: {layout_type}")
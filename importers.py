@@ -0,0 +1,271 @@
+import os
+import re
+import threading
+from array import array
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from network_io import CompactNetwork, _csr_from_pairs
+
+CHUNK_LINES = 65536
+
+# A node label never contains a separator, so 'R1->R3' is two nodes
+_DUMP_NODE = r"(?:(?!<->|->|--)[^\s,;])+"
+# An explicit separator is required, except after a 'link'/'adj' keyword where whitespace will do
+_DUMP_LINE = re.compile(
+    r"^\s*(?:(?P<keyword>link|adj(?:acency)?)\s+)?"
+    rf"(?P<u>{_DUMP_NODE})\s*(?(keyword)(?:<->|->|--|,|;|\s)|(?:<->|->|--|,|;))\s*(?P<v>{_DUMP_NODE})"
+    r"(?:.*?(?:metric|cost|weight)\s*[=:]?\s*(?P<w>-?\d+(?:\.\d+)?))?",
+    re.IGNORECASE
+)
+
+
+class CompactBuilder:
+    """Interns node labels and accumulates edges in typed arrays.
+
+    Edges are kept as int32/float64 arrays that grow in place, so memory
+    stays proportional to the number of edges seen rather than to the
+    Python objects a networkx graph would hold.
+    """
+
+    def __init__(self):
+        self.index = {}
+        self.labels = []
+        self.sources = array('i')
+        self.targets = array('i')
+        self.weights = array('d')
+        self.positions = {}
+        self.integral_weights = True
+
+    def node(self, label):
+        """Internal index of label, adding it if new"""
+        i = self.index.get(label)
+        if i is None:
+            i = self.index[label] = len(self.labels)
+            self.labels.append(label)
+        return i
+
+    def add_edge(self, u, v, weight=1):
+        self.sources.append(self.node(u))
+        self.targets.append(self.node(v))
+        self.weights.append(weight)
+        if self.integral_weights and not float(weight).is_integer():
+            self.integral_weights = False
+
+    def set_position(self, label, x, y):
+        self.positions[self.node(label)] = (x, y)
+
+    def finish(self):
+        """Deduplicate edges (first occurrence wins) and pack them into a CompactNetwork"""
+        n = len(self.labels)
+        us = np.frombuffer(self.sources, dtype=np.int32) if self.sources else np.empty(0, dtype=np.int32)
+        vs = np.frombuffer(self.targets, dtype=np.int32) if self.targets else np.empty(0, dtype=np.int32)
+        ws = np.frombuffer(self.weights, dtype=np.float64) if self.weights else np.empty(0)
+
+        keys = np.minimum(us, vs).astype(np.int64) * max(n, 1) + np.maximum(us, vs)
+        _, first = np.unique(keys, return_index=True)
+        del keys, _
+        first.sort()
+        us, vs, ws = us[first], vs[first], ws[first]
+        del first
+        self.sources = self.targets = self.weights = None
+        if self.integral_weights:
+            ws = ws.astype(np.int64)
+
+        indptr, indices, order = _csr_from_pairs(n, us, vs)
+        reverse = us != vs
+        weights = np.concatenate((ws, ws[reverse]))[order]
+        del order, reverse
+
+        encoded = [str(label).encode('utf-8') for label in self.labels]
+        label_offsets = np.zeros(n + 1, dtype=np.int64)
+        label_offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        label_data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+        positions = np.full((n, 2), np.nan)
+        for i, xy in self.positions.items():
+            positions[i] = xy
+
+        return CompactNetwork(indptr, indices, weights, positions,
+                              label_offsets, label_data, len(us))
+
+
+class _CountingReader:
+    """File wrapper that tracks how many bytes have been consumed"""
+
+    def __init__(self, f):
+        self.f = f
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _number(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_lines(filename, builder, parse_line, progress, cancel):
+    total = os.path.getsize(filename)
+    with open(filename, 'rb') as f:
+        while True:
+            lines = f.readlines(CHUNK_LINES * 32)
+            if not lines:
+                break
+            for raw in lines:
+                line = raw.decode('utf-8', errors='replace').strip()
+                if line and not line.startswith(('#', '%', '!')):
+                    parse_line(line, builder)
+            if progress:
+                progress(f.tell(), total)
+            if cancel is not None and cancel.is_set():
+                raise InterruptedError("Import cancelled")
+
+
+def read_edge_list(filename, builder, progress=None, cancel=None):
+    """Stream 'source,target[,weight]' rows (comma, tab or space separated)"""
+    state = {'first': True}
+
+    def parse_line(line, builder):
+        fields = [field.strip() for field in (line.split(',') if ',' in line else line.split())]
+        if len(fields) < 2:
+            return
+        weight = _number(fields[2]) if len(fields) > 2 else 1
+        if state['first']:
+            state['first'] = False
+            if len(fields) > 2 and weight is None:
+                return  # header row
+            if fields[0].lower() in ('source', 'src', 'from', 'u', 'node1'):
+                return
+        builder.add_edge(fields[0], fields[1], 1 if weight is None else weight)
+
+    _read_lines(filename, builder, parse_line, progress, cancel)
+
+
+def read_topology_dump(filename, builder, progress=None, cancel=None):
+    """Stream router dumps with one adjacency per line, e.g. 'R1 -> R2 metric 10'.
+
+    Lines need an explicit separator (->, <->, --, comma or semicolon) or a
+    leading 'link'/'adj' keyword; anything else, such as the rest of a
+    router configuration, is ignored.
+    """
+
+    def parse_line(line, builder):
+        match = _DUMP_LINE.match(line)
+        if match:
+            weight = _number(match.group('w'))
+            builder.add_edge(match.group('u'), match.group('v'), 1 if weight is None else weight)
+
+    _read_lines(filename, builder, parse_line, progress, cancel)
+
+
+def read_graphml(filename, builder, progress=None, cancel=None):
+    """Stream GraphML with iterparse, clearing elements as soon as they are read"""
+    total = os.path.getsize(filename)
+    keys = {}
+    count = 0
+    graph = None
+
+    with open(filename, 'rb') as f:
+        reader = _CountingReader(f)
+        for event, element in ET.iterparse(reader, events=('start', 'end')):
+            tag = element.tag.rsplit('}', 1)[-1]
+
+            if event == 'start':
+                if tag == 'graph':
+                    graph = element
+                continue
+
+            if tag == 'key':
+                keys[element.get('id')] = element.get('attr.name', element.get('id'))
+            elif tag == 'node':
+                data = {keys.get(d.get('key'), d.get('key')): d.text for d in element
+                        if d.tag.rsplit('}', 1)[-1] == 'data'}
+                x, y = _number(data.get('x')), _number(data.get('y'))
+                if x is not None and y is not None:
+                    builder.set_position(element.get('id'), x, y)
+                else:
+                    builder.node(element.get('id'))
+            elif tag == 'edge':
+                weight = None
+                for d in element:
+                    if d.tag.rsplit('}', 1)[-1] == 'data' and keys.get(d.get('key'), d.get('key')) == 'weight':
+                        weight = _number(d.text)
+                builder.add_edge(element.get('source'), element.get('target'), 1 if weight is None else weight)
+            else:
+                continue
+
+            # Detach processed elements so the tree never grows with the file
+            if graph is not None:
+                graph.remove(element)
+
+            count += 1
+            if count % CHUNK_LINES == 0:
+                if progress:
+                    progress(reader.bytes_read, total)
+                if cancel is not None and cancel.is_set():
+                    raise InterruptedError("Import cancelled")
+
+    if progress:
+        progress(total, total)
+
+
+READERS = {
+    'edgelist': read_edge_list,
+    'graphml': read_graphml,
+    'dump': read_topology_dump,
+}
+
+
+def detect_format(filename):
+    """Guess the importer from the file extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in ('.graphml', '.xml'):
+        return 'graphml'
+    if extension in ('.csv', '.tsv', '.edges', '.edgelist', '.txt'):
+        return 'edgelist'
+    return 'dump'
+
+
+def import_network(filename, fmt=None, progress=None, cancel=None):
+    """Stream a topology file into a CompactNetwork"""
+    builder = CompactBuilder()
+    READERS[fmt or detect_format(filename)](filename, builder, progress, cancel)
+    return builder.finish()
+
+
+class ImportJob(threading.Thread):
+    """Run import_network on a background thread, exposing progress for polling.
+
+    The GUI polls fraction/done from the Tk loop; nothing here touches Tk.
+    """
+
+    def __init__(self, filename, fmt=None):
+        super().__init__(daemon=True)
+        self.filename = filename
+        self.fmt = fmt
+        self.fraction = 0.0
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancel_event = threading.Event()
+
+    def _progress(self, done, total):
+        self.fraction = done / total if total else 1.0
+
+    def run(self):
+        try:
+            self.result = import_network(self.filename, self.fmt, self._progress, self.cancel_event)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def cancel(self):
+        self.cancel_event.set()
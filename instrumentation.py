@@ -0,0 +1,366 @@
+"""Instrumented searches that report how much work they did.
+
+The plain functions in routing stay the default; these pure-Python versions
+only run when counters are requested, so leaving instrumentation off costs
+nothing. With counters on, the GUI and cli time these searches instead of
+the routing ones (measured_search), so a row's time and counters describe
+the same code. Counters are kept in locals and written to SearchStats once
+at the end of a search.
+"""
+import heapq
+import time
+import tracemalloc
+from array import array
+from collections import deque
+
+from routing import euclidean_heuristic, heuristic_scale, negative_weight
+
+
+class SearchStats:
+    """Work counters for one search"""
+    FIELDS = ("expanded", "relaxed", "pushes", "pops", "max_frontier", "peak_bytes")
+
+    __slots__ = FIELDS
+
+    def __init__(self):
+        self.expanded = 0
+        self.relaxed = 0
+        self.pushes = 0
+        self.pops = 0
+        self.max_frontier = 0
+        self.peak_bytes = None
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+VISIT, RELAX = 0, 1
+NAN = float('nan')
+
+
+class SearchLog:
+    """Compact record of a search's visit/relax order.
+
+    Events live in typed arrays (about 21 bytes each) rather than tuples, so
+    million-event searches stay small and hand straight to NumPy for replay.
+    Nodes are stored as ids into self.nodes; parent is -1 for the source and
+    distance is NaN for unweighted searches.
+    """
+
+    def __init__(self):
+        self.nodes = []
+        self.index = {}
+        self.kinds = array('b')
+        self.node_ids = array('i')
+        self.parents = array('i')
+        self.distances = array('d')
+        self.steps = array('i')
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def node_id(self, node):
+        node_id = self.index.get(node)
+        if node_id is None:
+            node_id = self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+        return node_id
+
+    def record(self, kind, node, parent, distance, step):
+        self.kinds.append(kind)
+        self.node_ids.append(self.node_id(node))
+        self.parents.append(-1 if parent is None else self.node_id(parent))
+        self.distances.append(distance)
+        self.steps.append(step)
+
+    def as_arrays(self):
+        """Zero-copy NumPy views (kinds, node_ids, parents, distances, steps)"""
+        import numpy as np
+
+        return (np.frombuffer(self.kinds, dtype=np.int8), np.frombuffer(self.node_ids, dtype=np.intc),
+                np.frombuffer(self.parents, dtype=np.intc), np.frombuffer(self.distances, dtype=float),
+                np.frombuffer(self.steps, dtype=np.intc))
+
+
+def _build_path(parent, node):
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    return path[::-1]
+
+
+def bfs_search(network, source, destination, stats, pos=None, log=None):
+    """Bidirectional breadth-first search, matching routing.bfs_path (networkx's shortest_path).
+
+    The smaller fringe grows by one level at a time until the two searches meet.
+    """
+    if source == destination:
+        stats.expanded, stats.relaxed, stats.pushes, stats.pops, stats.max_frontier = 0, 0, 1, 0, 1
+        return [source]
+
+    succ_adj = network.succ if network.is_directed() else network.adj
+    pred_adj = network.pred if network.is_directed() else network.adj
+    pred = {source: None}
+    succ = {destination: None}
+    forward, reverse = [source], [destination]
+    expanded = relaxed = 0
+    pushes = max_frontier = 2
+    meeting = None
+
+    while forward and reverse and meeting is None:
+        # Same order and tie-breaking as networkx, so both return the same path
+        if len(forward) <= len(reverse):
+            level, forward = forward, []
+            fringe, seen, other, adjacency = forward, pred, succ, succ_adj
+        else:
+            level, reverse = reverse, []
+            fringe, seen, other, adjacency = reverse, succ, pred, pred_adj
+        for node in level:
+            expanded += 1
+            if log is not None:
+                log.record(VISIT, node, seen[node], NAN, expanded)
+            for neighbor in adjacency[node]:
+                relaxed += 1
+                if neighbor not in seen:
+                    seen[neighbor] = node
+                    fringe.append(neighbor)
+                    pushes += 1
+                    if log is not None:
+                        log.record(RELAX, neighbor, node, NAN, expanded)
+                if neighbor in other:
+                    meeting = neighbor
+                    break
+            if meeting is not None:
+                break
+        if len(forward) + len(reverse) > max_frontier:
+            max_frontier = len(forward) + len(reverse)
+
+    stats.expanded, stats.relaxed, stats.pushes, stats.pops, stats.max_frontier = (
+        expanded, relaxed, pushes, expanded, max_frontier)
+    if meeting is None:
+        return None
+    path = _build_path(pred, meeting)
+    node = succ[meeting]
+    while node is not None:
+        path.append(node)
+        node = succ[node]
+    return path
+
+
+def dfs_search(network, source, destination, stats, pos=None, log=None):
+    """Depth-first search matching routing.dfs_path"""
+    visited = {source}
+    stack = [source]
+    parent = {source: None}
+    expanded = relaxed = pops = 0
+    pushes = max_frontier = 1
+    path = None
+
+    while stack:
+        node = stack.pop()
+        pops += 1
+        if node == destination:
+            path = _build_path(parent, node)
+            break
+
+        expanded += 1
+        if log is not None:
+            log.record(VISIT, node, parent[node], NAN, expanded)
+        for neighbor in network.neighbors(node):
+            relaxed += 1
+            if neighbor not in visited:
+                visited.add(neighbor)
+                stack.append(neighbor)
+                parent[neighbor] = node
+                if log is not None:
+                    log.record(RELAX, neighbor, node, NAN, expanded)
+                pushes += 1
+        if len(stack) > max_frontier:
+            max_frontier = len(stack)
+
+    stats.expanded, stats.relaxed, stats.pushes, stats.pops, stats.max_frontier = (
+        expanded, relaxed, pushes, pops, max_frontier)
+    return path
+
+
+def _best_first(network, source, destination, stats, heuristic, log=None, weight='weight'):
+    """Shared Dijkstra/A* loop with lazy deletion; heuristic=None is Dijkstra"""
+    # Reopening nodes would chase a negative link forever
+    negative = negative_weight(network, weight)
+    if negative is not None:
+        raise ValueError(f"Negative weight {negative[2]} on link {negative[0]}-{negative[1]}; "
+                         "Dijkstra and A* need non-negative weights")
+
+    distance = {source: 0}
+    parent = {source: None}
+    closed = set()
+    h = heuristic(source, destination) if heuristic else 0
+    heap = [(h, 0, source)]
+    counter = 1
+    expanded = relaxed = pops = 0
+    pushes = max_frontier = 1
+    path = None
+
+    while heap:
+        _, _, node = heapq.heappop(heap)
+        pops += 1
+        if node in closed:
+            continue
+        if node == destination:
+            path = _build_path(parent, node)
+            break
+        closed.add(node)
+        expanded += 1
+
+        base = distance[node]
+        if log is not None:
+            log.record(VISIT, node, parent[node], base, expanded)
+        for neighbor, data in network[node].items():
+            relaxed += 1
+            candidate = base + data.get(weight, 1)
+            if candidate < distance.get(neighbor, float('inf')):
+                distance[neighbor] = candidate
+                parent[neighbor] = node
+                if log is not None:
+                    log.record(RELAX, neighbor, node, candidate, expanded)
+                # An improved distance reopens a node (heuristics need not be consistent)
+                closed.discard(neighbor)
+                priority = candidate + heuristic(neighbor, destination) if heuristic else candidate
+                heapq.heappush(heap, (priority, counter, neighbor))
+                counter += 1
+                pushes += 1
+        if len(heap) > max_frontier:
+            max_frontier = len(heap)
+
+    stats.expanded, stats.relaxed, stats.pushes, stats.pops, stats.max_frontier = (
+        expanded, relaxed, pushes, pops, max_frontier)
+    return path
+
+
+def dijkstra_search(network, source, destination, stats, pos=None, log=None):
+    """Dijkstra with a binary heap"""
+    return _best_first(network, source, destination, stats, None, log)
+
+
+def astar_search(network, source, destination, stats, pos=None, log=None):
+    """A* with the same heuristic as routing.astar_path"""
+    heuristic = euclidean_heuristic(pos, heuristic_scale(network, pos))
+    return _best_first(network, source, destination, stats, heuristic, log)
+
+
+def jps_search(network, source, destination, stats, pos=None, log=None):
+    """Jump point search on uniform-cost grids; A* on any other network"""
+    from jps import grid_index, jump_point_search
+
+    index = grid_index(network)
+    if index is None:
+        return astar_search(network, source, destination, stats, pos, log)
+    return jump_point_search(index, source, destination, stats, log)
+
+
+def bellman_ford_search(network, source, destination, stats, pos=None, log=None, weight='weight'):
+    """Queue-based Bellman-Ford (SPFA); every dequeue counts as an expansion.
+
+    Raises ValueError on a negative cycle reachable from source; in an
+    undirected network any negative link is one.
+    """
+    negative = None if network.is_directed() else negative_weight(network, weight)
+    if negative is not None:
+        raise ValueError(f"Negative cycle: link {negative[0]}-{negative[1]} has weight {negative[2]}")
+
+    distance = {source: 0}
+    parent = {source: None}
+    queue = deque([source])
+    queued = {source}
+    dequeues = {}
+    limit = network.number_of_nodes()
+    expanded = relaxed = pops = 0
+    pushes = max_frontier = 1
+
+    while queue:
+        node = queue.popleft()
+        queued.discard(node)
+        pops += 1
+        expanded += 1
+        # Without negative cycles a node is dequeued at most |V| times
+        dequeues[node] = dequeues.get(node, 0) + 1
+        if dequeues[node] > limit:
+            raise ValueError(f"Negative cycle through node {node}")
+
+        base = distance[node]
+        if log is not None:
+            log.record(VISIT, node, parent[node], base, expanded)
+        for neighbor, data in network[node].items():
+            relaxed += 1
+            candidate = base + data.get(weight, 1)
+            if candidate < distance.get(neighbor, float('inf')):
+                distance[neighbor] = candidate
+                parent[neighbor] = node
+                if log is not None:
+                    log.record(RELAX, neighbor, node, candidate, expanded)
+                if neighbor not in queued:
+                    queue.append(neighbor)
+                    queued.add(neighbor)
+                    pushes += 1
+        if len(queue) > max_frontier:
+            max_frontier = len(queue)
+
+    stats.expanded, stats.relaxed, stats.pushes, stats.pops, stats.max_frontier = (
+        expanded, relaxed, pushes, pops, max_frontier)
+    return _build_path(parent, destination) if destination in parent else None
+
+
+INSTRUMENTED = {
+    "bfs": bfs_search,
+    "dfs": dfs_search,
+    "dijkstra": dijkstra_search,
+    "bellman": bellman_ford_search,
+    "astar": astar_search,
+    "jps": jps_search,
+}
+
+
+def instrumented_path(key, network, source, destination, pos=None, trace_memory=False, log=None):
+    """Run the instrumented version of an algorithm; returns (path, SearchStats)
+
+    Pass a SearchLog as log to also record the visit/relax order.
+    """
+    stats = SearchStats()
+    search = INSTRUMENTED[key]
+
+    if not trace_memory:
+        return search(network, source, destination, stats, pos, log), stats
+
+    # Opt-in: tracemalloc slows every allocation while it is active
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        path = search(network, source, destination, stats, pos, log)
+        stats.peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if started:
+            tracemalloc.stop()
+    return path, stats
+
+
+def measured_search(key, network, source, destination, pos=None, repeats=5, trace_memory=False):
+    """Time the instrumented search repeats times; returns (path, median seconds, SearchStats).
+
+    tracemalloc slows every allocation, so peak memory comes from one extra,
+    untimed run.
+    """
+    search = INSTRUMENTED[key]
+    samples = []
+    for _ in range(max(1, repeats)):
+        stats = SearchStats()
+        start = time.perf_counter_ns()
+        path = search(network, source, destination, stats, pos)
+        samples.append(time.perf_counter_ns() - start)
+    if trace_memory:
+        stats.peak_bytes = instrumented_path(key, network, source, destination, pos, trace_memory=True)[1].peak_bytes
+    samples.sort()
+    return path, samples[len(samples) // 2] / 1e9, stats
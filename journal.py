@@ -0,0 +1,236 @@
+from collections import deque, namedtuple
+
+# One recorded edit. before/after hold what the edit replaced and installed:
+#   add_node / remove_node: (xy, ((neighbor, attrs), ...))
+#   add_edge / remove_edge / set_weight: edge attribute dict / weight
+#   move_node: xy
+#   reset / layout: whole-graph replacements, never undoable
+#   batch: after holds the tuple of Changes published together; events only
+Change = namedtuple('Change', ['kind', 'u', 'v', 'before', 'after'])
+
+INVERSE = {
+    'add_node': 'remove_node',
+    'remove_node': 'add_node',
+    'add_edge': 'remove_edge',
+    'remove_edge': 'add_edge',
+    'set_weight': 'set_weight',
+    'move_node': 'move_node',
+}
+
+
+def invert(change):
+    """The change that undoes change"""
+    return Change(INVERSE[change.kind], change.u, change.v, change.after, change.before)
+
+
+class GraphJournal:
+    """Applies every graph edit as a recorded delta with undo/redo and change events.
+
+    Each undo step is a list of Changes, so undo and redo cost only the edits
+    they replay, never a copy of the graph. Listeners are called with each
+    Change after it has been applied (undo publishes the inverse change), so
+    caches and indexes can update from the delta alone.
+    """
+
+    def __init__(self, network=None, pos=None, limit=1000):
+        self.network = network
+        self.pos = pos
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+        self.listeners = []
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self.listeners.remove(callback)
+
+    def _publish(self, change):
+        for callback in self.listeners:
+            callback(change)
+
+    def _publish_step(self, changes):
+        self._publish(changes[0] if len(changes) == 1 else Change('batch', None, None, None, tuple(changes)))
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    # Whole-graph replacements
+
+    def reset(self, network, pos):
+        """Swap in a different graph (generate, load, clear); drops the history"""
+        self.network = network
+        self.pos = pos
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._publish(Change('reset', None, None, None, None))
+
+    def replace_positions(self, pos):
+        """Install a new layout; edits in the history stay undoable"""
+        self.pos = pos
+        self._publish(Change('layout', None, None, None, None))
+
+    # Recorded edits
+
+    def _record(self, change):
+        self._apply(change)
+        self.undo_stack.append([change])
+        self.redo_stack.clear()
+        self._publish(change)
+
+    def add_node(self, node, xy):
+        self._record(Change('add_node', node, None, None, (xy, ())))
+
+    def remove_node(self, node):
+        edges = tuple((neighbor, dict(attrs)) for neighbor, attrs in self.network[node].items())
+        self._record(Change('remove_node', node, None, (self.pos.get(node), edges), None))
+
+    def add_edge(self, u, v, weight=1):
+        self._record(Change('add_edge', u, v, None, {'weight': weight}))
+
+    def remove_edge(self, u, v):
+        self._record(Change('remove_edge', u, v, dict(self.network[u][v]), None))
+
+    def set_weight(self, u, v, weight):
+        self._record(Change('set_weight', u, v, self.network[u][v].get('weight', 1), weight))
+
+    def move_node(self, node, xy):
+        self._record(Change('move_node', node, None, self.pos.get(node), xy))
+
+    def bulk_edit(self, add_nodes=(), add_edges=(), set_weights=(), remove_edges=(), remove_nodes=()):
+        """Apply many edits as one undo step with one change event; returns the number of edits.
+
+        add_nodes holds (node, xy) pairs, add_edges (u, v, weight) or
+        (u, v, attrs) triples, set_weights (u, v, weight), remove_edges (u, v)
+        and remove_nodes nodes. They are applied in that order, so edges may
+        join nodes added in the same call. Everything is validated first; on
+        a ValueError nothing has been changed.
+        """
+        add_nodes, add_edges = list(add_nodes), list(add_edges)
+        set_weights, remove_edges, remove_nodes = list(set_weights), list(remove_edges), list(remove_nodes)
+        self._validate_bulk(add_nodes, add_edges, set_weights, remove_edges, remove_nodes)
+
+        network = self.network
+        changes = []
+
+        def apply(change):
+            self._apply(change)
+            changes.append(change)
+
+        for node, xy in add_nodes:
+            apply(Change('add_node', node, None, None, (xy, ())))
+        for u, v, attrs in add_edges:
+            apply(Change('add_edge', u, v, None, dict(attrs) if isinstance(attrs, dict) else {'weight': attrs}))
+        for u, v, weight in set_weights:
+            apply(Change('set_weight', u, v, network[u][v].get('weight', 1), weight))
+        for u, v in remove_edges:
+            apply(Change('remove_edge', u, v, dict(network[u][v]), None))
+        for node in remove_nodes:
+            edges = tuple((neighbor, dict(attrs)) for neighbor, attrs in network[node].items())
+            apply(Change('remove_node', node, None, (self.pos.get(node), edges), None))
+
+        if changes:
+            self.undo_stack.append(changes)
+            self.redo_stack.clear()
+            self._publish_step(changes)
+        return len(changes)
+
+    def _validate_bulk(self, add_nodes, add_edges, set_weights, remove_edges, remove_nodes):
+        """Check a bulk edit against the graph as it will be when each part runs"""
+        network = self.network
+        problems = []
+        added = set()
+        for node, xy in add_nodes:
+            if node in network or node in added:
+                problems.append(f"node {node} already exists")
+            added.add(node)
+
+        def exists(node):
+            return node in added or node in network
+
+        links = set()
+        for u, v, attrs in add_edges:
+            if not exists(u) or not exists(v):
+                problems.append(f"edge {u}-{v} joins a missing node")
+            elif network.has_edge(u, v) or (u, v) in links:
+                problems.append(f"edge {u}-{v} already exists")
+            links.add((u, v))
+            links.add((v, u))
+
+        def linked(u, v):
+            return (u, v) in links or (u in network and network.has_edge(u, v))
+
+        for u, v, weight in set_weights:
+            if not linked(u, v):
+                problems.append(f"edge {u}-{v} does not exist")
+        dropped = set()
+        for u, v in remove_edges:
+            if not linked(u, v) or (u, v) in dropped:
+                problems.append(f"edge {u}-{v} does not exist")
+            dropped.add((u, v))
+            dropped.add((v, u))
+        removed = set()
+        for node in remove_nodes:
+            if not exists(node) or node in removed:
+                problems.append(f"node {node} does not exist")
+            removed.add(node)
+
+        if problems:
+            more = f" (and {len(problems) - 5} more)" if len(problems) > 5 else ""
+            raise ValueError("; ".join(problems[:5]) + more)
+
+    def undo(self):
+        """Revert the most recent edit; returns False when there is nothing to undo"""
+        if not self.undo_stack:
+            return False
+        changes = self.undo_stack.pop()
+        inverses = [invert(change) for change in reversed(changes)]
+        for inverse in inverses:
+            self._apply(inverse)
+        self._publish_step(inverses)
+        self.redo_stack.append(changes)
+        return True
+
+    def redo(self):
+        """Re-apply the most recently undone edit; returns False when there is nothing to redo"""
+        if not self.redo_stack:
+            return False
+        changes = self.redo_stack.pop()
+        for change in changes:
+            self._apply(change)
+        self._publish_step(changes)
+        self.undo_stack.append(changes)
+        return True
+
+    def _apply(self, change):
+        network, pos = self.network, self.pos
+        kind, u, v = change.kind, change.u, change.v
+
+        if kind == 'add_node':
+            xy, edges = change.after
+            network.add_node(u)
+            if xy is not None:
+                pos[u] = xy
+            for neighbor, attrs in edges:
+                network.add_edge(u, neighbor, **attrs)
+        elif kind == 'remove_node':
+            network.remove_node(u)
+            pos.pop(u, None)
+        elif kind == 'add_edge':
+            network.add_edge(u, v, **change.after)
+        elif kind == 'remove_edge':
+            network.remove_edge(u, v)
+        elif kind == 'set_weight':
+            network[u][v]['weight'] = change.after
+        elif kind == 'move_node':
+            if change.after is None:
+                pos.pop(u, None)
+            else:
+                pos[u] = change.after
+        else:
+            raise ValueError(f"Unknown change: {kind}")
@@ -0,0 +1,210 @@
+"""Jump point search for uniform-cost, 4-connected grid networks.
+
+A network counts as a grid when every node has a distinct integer 'pos'
+cell, links join exactly the 4-adjacent occupied cells and every link costs
+the same. Cells live in a padded occupancy bytearray, so straight runs of
+open cells are scanned with a few byte lookups, and only jump points enter
+the open list. Jump points are the turns that obstacles force, plus the goal.
+Anything else is left to A* by the callers.
+"""
+import heapq
+import math
+
+from instrumentation import RELAX, VISIT
+
+
+class GridIndex:
+    """Occupancy bitmap of a grid network, one padding cell wide on every side"""
+    __slots__ = ('width', 'open', 'nodes', 'cells', 'cost')
+
+    def __init__(self, width, height, cost):
+        self.width = width
+        self.open = bytearray(width * height)
+        self.nodes = {}
+        self.cells = {}
+        self.cost = cost
+
+    def add(self, node, x, y):
+        cell = y * self.width + x
+        self.open[cell] = 1
+        self.nodes[cell] = node
+        self.cells[node] = cell
+
+
+def build_grid_index(network, weight='weight'):
+    """GridIndex for network, or None when it is not a uniform-cost 4-connected grid"""
+    if network.is_directed() or network.is_multigraph() or network.number_of_nodes() == 0:
+        return None
+
+    coords = {}
+    for node, pos in network.nodes(data='pos'):
+        if pos is None or len(pos) < 2:
+            return None
+        x, y = pos[0], pos[1]
+        if x != int(x) or y != int(y):
+            return None
+        coords[node] = (int(x), int(y))
+
+    xs = [x for x, _ in coords.values()]
+    ys = [y for _, y in coords.values()]
+    min_x, min_y = min(xs), min(ys)
+    width, height = max(xs) - min_x + 3, max(ys) - min_y + 3
+    # Very sparse layouts would need a huge bitmap for few cells
+    if width * height > 4 * len(coords) + 1024:
+        return None
+
+    index = GridIndex(width, height, None)
+    for node, (x, y) in coords.items():
+        index.add(node, x - min_x + 1, y - min_y + 1)
+    if len(index.nodes) != len(coords):
+        return None
+
+    # Every link joins adjacent cells at one cost, and there are as many links as adjacent pairs
+    cells = index.cells
+    cost = None
+    links = 0
+    for u, neighbors in network.adj.items():
+        cell = cells[u]
+        links += len(neighbors)
+        for v, attrs in neighbors.items():
+            if abs(cells[v] - cell) not in (1, width):
+                return None
+            w = attrs.get(weight, 1)
+            if w != cost:
+                if cost is not None or w <= 0:
+                    return None
+                cost = w
+    grid = index.open
+    adjacent = sum(grid[cell + 1] + grid[cell + width] for cell in index.nodes)
+    if 2 * adjacent != links:
+        return None
+    index.cost = 1 if cost is None else cost
+    return index
+
+
+def grid_index(network, weight='weight'):
+    """Cached build_grid_index; routing.forget_search_caches drops it after edits"""
+    graph = network.graph
+    if 'grid_index' not in graph:
+        graph['grid_index'] = build_grid_index(network, weight)
+    return graph['grid_index']
+
+
+def _jump_horizontal(grid, cell, step, goal, width):
+    """Scan along a row until a jump point; returns its cell or -1 at a wall"""
+    while True:
+        cell += step
+        if not grid[cell]:
+            return -1
+        if cell == goal:
+            return cell
+        # Forced neighbour: an opening above or below that the previous cell could not reach
+        if (grid[cell + width] and not grid[cell + width - step]) or \
+                (grid[cell - width] and not grid[cell - width - step]):
+            return cell
+
+
+def _jump_vertical(grid, cell, step, goal, width):
+    """Scan along a column; a cell is a jump point if a row scan from it finds one"""
+    while True:
+        cell += step
+        if not grid[cell]:
+            return -1
+        if cell == goal:
+            return cell
+        if (grid[cell + 1] and not grid[cell + 1 - step]) or (grid[cell - 1] and not grid[cell - 1 - step]):
+            return cell
+        if _jump_horizontal(grid, cell, 1, goal, width) >= 0 or _jump_horizontal(grid, cell, -1, goal, width) >= 0:
+            return cell
+
+
+def jump_point_search(index, source, destination, stats=None, log=None):
+    """Shortest path between two nodes of a GridIndex, or None.
+
+    A* over jump points with the Manhattan distance, which is exact on an
+    open grid. stats and log take the same SearchStats and SearchLog as the
+    instrumented searches; a jump counts as one relaxation.
+    """
+    start = index.cells.get(source)
+    goal = index.cells.get(destination)
+    if start is None or goal is None:
+        return None
+
+    grid, width, cost = index.open, index.width, index.cost
+    goal_row, goal_col = divmod(goal, width)
+
+    def estimate(cell):
+        row, col = divmod(cell, width)
+        return abs(row - goal_row) + abs(col - goal_col)
+
+    distance = {start: 0}
+    parent = {start: -1}
+    closed = set()
+    # Ties go to the deeper label, which heads straight for the goal on open ground
+    heap = [(estimate(start), 0, start)]
+    expanded = relaxed = pops = 0
+    pushes = max_frontier = 1
+    found = False
+
+    while heap:
+        _, _, cell = heapq.heappop(heap)
+        pops += 1
+        if cell in closed:
+            continue
+        if cell == goal:
+            found = True
+            break
+        closed.add(cell)
+        expanded += 1
+
+        base = distance[cell]
+        previous = parent[cell]
+        if log is not None:
+            log.record(VISIT, index.nodes[cell], index.nodes.get(previous), base * cost, expanded)
+        if previous < 0:
+            steps = (1, -1, width, -width)
+        elif abs(cell - previous) < width:
+            forward = 1 if cell > previous else -1
+            steps = (forward, width, -width)
+        else:
+            forward = width if cell > previous else -width
+            steps = (forward, 1, -1)
+
+        for step in steps:
+            relaxed += 1
+            if step == 1 or step == -1:
+                jump = _jump_horizontal(grid, cell, step, goal, width)
+                if jump < 0 or jump in closed:
+                    continue
+                candidate = base + abs(jump - cell)
+            else:
+                jump = _jump_vertical(grid, cell, step, goal, width)
+                if jump < 0 or jump in closed:
+                    continue
+                candidate = base + abs(jump - cell) // width
+            if candidate < distance.get(jump, math.inf):
+                distance[jump] = candidate
+                parent[jump] = cell
+                if log is not None:
+                    log.record(RELAX, index.nodes[jump], index.nodes[cell], candidate * cost, expanded)
+                heapq.heappush(heap, (candidate + estimate(jump), -candidate, jump))
+                pushes += 1
+        if len(heap) > max_frontier:
+            max_frontier = len(heap)
+
+    if stats is not None:
+        stats.expanded, stats.relaxed, stats.pushes, stats.pops, stats.max_frontier = (
+            expanded, relaxed, pushes, pops, max_frontier)
+    if not found:
+        return None
+
+    # Jump points are joined by straight runs; fill in the cells between them
+    path = [index.nodes[goal]]
+    cell = goal
+    while parent[cell] >= 0:
+        previous = parent[cell]
+        step = (1 if cell > previous else -1) * (1 if abs(cell - previous) < width else width)
+        while cell != previous:
+            cell -= step
+            path.append(index.nodes[cell])
+    return path[::-1]
@@ -1,19 +1,30 @@
-import networkx as nx
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
+import time
+
+STARTUP_CLOCK = time.perf_counter()
+
 import random
-from matplotlib.lines import Line2D
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-import time
-import matplotlib
-from matplotlib.patches import Circle
-import json
 from datetime import datetime
 
-matplotlib.use("TkAgg")
+from journal import GraphJournal
+from metrics import NetworkMetrics
+from result_store import QueryBatchJob, ResultStore, path_preview
+from results_table import ResultsTable
+from route_cache import RouteCache
+from spatial_index import SpatialIndex
+
+# Heavy modules (networkx, numpy, matplotlib) are imported on first use so the
+# window comes up immediately; see check_startup for the enforced budget.
+STARTUP_BUDGET = 0.75
+HEAVY_MODULES = ("networkx", "numpy", "matplotlib")
+
+WELCOME_TEXT = ("Welcome to Advanced Network Routing Simulator v2.0\n\n"
+                "🚀 Generate a network to begin\n"
+                "✏ Use manual mode for custom networks\n"
+                "🧠 Compare different routing algorithms\n"
+                "📊 View detailed performance statistics")
 
 
 class ModernNetworkRoutingSimulator:
@@ -40,6 +51,8 @@ class ModernNetworkRoutingSimulator:
             "dijkstra": "#2ecc71",
             "bellman": "#9b59b6",
             "astar": "#f39c12",
+            "jps": "#e84393",
+            "constrained": "#1abc9c",
             "button_hover": "#00b8d4"
         }
 
@@ -50,17 +63,61 @@ class ModernNetworkRoutingSimulator:
         self.destination = None
         self.manual_mode = False
         self.selected_nodes = []
+        self.selected_edge = None
         self.node_positions = {}
         self.edge_weights = {}
 
         # Animation variables
         self.animation = None
-        self.packet = None
+        self.packet_layer = None
+        self.frames_per_hop = 10
         self.current_algorithm = None
+        self.last_algorithms = []
+        self.last_traffic = []
+
+        # Canvas hit-testing
+        self.spatial_index = SpatialIndex()
+        self.timing_repeats = 5
+        self.node_pick_radius = 0.1
+        self.edge_pick_radius = 0.04
+
+        # Background topology import
+        self.import_job = None
+
+        # Memoized routes, invalidated by every graph change
+        self.route_cache = RouteCache()
+
+        # Every edit goes through the journal, which drives undo/redo and incremental updates
+        self.journal = GraphJournal()
+        self.journal.subscribe(self.on_graph_change)
+        self.metrics = NetworkMetrics()
+        self.redraw_pending = False
 
         # Performance tracking
         self.algorithm_stats = {}
 
+        # Sampled betweenness centrality
+        self.betweenness = None
+        self.betweenness_job = None
+        self.top_n = 10
+        self.startup_seconds = None
+
+        # Pareto front of the last multi-objective query
+        self.pareto_routes = []
+        self.pareto_max_labels = 50
+
+        # Every query result, shown in the Results tab
+        self.results = ResultStore()
+        self.query_job = None
+
+        # Side-by-side comparison; keeps the rasterized network between runs
+        self.comparison_renderer = None
+
+        # Link-weight trace replay
+        self.trace_replay = None
+        self.trace_job = None
+        self.trace_routes = 50
+
         # Setup styles
         self.setup_styles()
 
@@ -84,6 +141,10 @@ class ModernNetworkRoutingSimulator:
         style.map('Modern.TButton', background=[('active', self.colors["button_hover"])])
         style.configure('Modern.TCheckbutton', background=self.colors["card_bg"],
                         foreground=self.colors["text_primary"], font=('Arial', 9))
+        style.configure('Treeview', background=self.colors["primary_bg"], fieldbackground=self.colors["primary_bg"],
+                        foreground=self.colors["text_primary"], font=('Consolas', 9))
+        style.configure('Treeview.Heading', background=self.colors["card_bg"],
+                        foreground=self.colors["accent"], font=('Arial', 9, 'bold'))
 
     def create_modern_ui(self):
         # Main container
@@ -133,6 +194,9 @@ class ModernNetworkRoutingSimulator:
         # Tab 5: Statistics
         self.create_stats_tab(notebook)
 
+        # Tab 6: Query Results
+        self.create_results_tab(notebook)
+
     def create_generation_tab(self, notebook):
         gen_frame = ttk.Frame(notebook, style='Modern.TFrame')
         notebook.add(gen_frame, text='🔧 Generate')
@@ -161,6 +225,15 @@ class ModernNetworkRoutingSimulator:
                                fg=self.colors["text_primary"], highlightthickness=0)
         edges_scale.grid(row=1, column=1, sticky='ew', padx=5)
 
+        # Share of grid cells blocked as obstacles
+        tk.Label(params_frame, text="Grid obstacles (%):", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).grid(row=2, column=0, sticky='w', pady=2)
+        self.obstacles_var = tk.IntVar(value=0)
+        obstacles_scale = tk.Scale(params_frame, from_=0, to=40, orient='horizontal',
+                                   variable=self.obstacles_var, bg=self.colors["card_bg"],
+                                   fg=self.colors["text_primary"], highlightthickness=0)
+        obstacles_scale.grid(row=2, column=1, sticky='ew', padx=5)
+
         params_frame.columnconfigure(1, weight=1)
 
         # Network types
@@ -171,7 +244,7 @@ class ModernNetworkRoutingSimulator:
 
         self.network_type = tk.StringVar(value="random")
         types = [("Random", "random"), ("Scale-Free", "scale_free"),
-                 ("Small World", "small_world"), ("Grid", "grid")]
+                 ("Small World", "small_world"), ("Grid", "grid"), ("Geometric", "geometric")]
 
         for i, (text, value) in enumerate(types):
             tk.Radiobutton(type_frame, text=text, variable=self.network_type, value=value,
@@ -235,6 +308,16 @@ class ModernNetworkRoutingSimulator:
         tk.Button(add_edge_frame, text="Add Edge", command=self.add_manual_edge,
                   bg=self.colors["accent"], fg='white', font=('Arial', 8)).pack(side='left')
 
+        # Undo / redo
+        history_frame = tk.Frame(controls_frame, bg=self.colors["card_bg"])
+        history_frame.pack(fill='x', pady=2)
+        tk.Button(history_frame, text="↶ Undo", command=self.undo_edit,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(side='left', fill='x', expand=True,
+                                                                                padx=2)
+        tk.Button(history_frame, text="↷ Redo", command=self.redo_edit,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(side='right', fill='x', expand=True,
+                                                                                padx=2)
+
         # Clear network
         tk.Button(controls_frame, text="🗑 Clear Network", command=self.clear_network,
                   bg=self.colors["error"], fg='white', font=('Arial', 10, 'bold')).pack(pady=5)
@@ -248,6 +331,8 @@ class ModernNetworkRoutingSimulator:
         tk.Button(io_frame, text="📂 Load", command=self.load_network,
                   bg=self.colors["warning"], fg='white', font=('Arial', 9)).pack(side='right', fill='x', expand=True,
                                                                                  padx=2)
+        tk.Button(controls_frame, text="📥 Import Topology", command=self.import_topology,
+                  bg=self.colors["warning"], fg='white', font=('Arial', 9)).pack(fill='x', padx=2, pady=(0, 5))
 
     def create_algorithm_tab(self, notebook):
         algo_frame = ttk.Frame(notebook, style='Modern.TFrame')
@@ -279,6 +364,33 @@ class ModernNetworkRoutingSimulator:
         dest_combo.pack(side='right')
         self.dest_combo = dest_combo
 
+        # Constrained routing
+        self.constrained_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(route_frame, text="Constrained route", variable=self.constrained_var,
+                       bg=self.colors["card_bg"], fg=self.colors["text_primary"],
+                       font=('Arial', 9)).pack(anchor='w', pady=(5, 0))
+
+        hops_frame = tk.Frame(route_frame, bg=self.colors["card_bg"])
+        hops_frame.pack(fill='x', pady=2)
+        tk.Label(hops_frame, text="Max hops (0 = any):", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).pack(side='left')
+        self.max_hops_var = tk.IntVar(value=0)
+        tk.Spinbox(hops_frame, from_=0, to=1000, textvariable=self.max_hops_var, width=7).pack(side='right')
+
+        bandwidth_frame = tk.Frame(route_frame, bg=self.colors["card_bg"])
+        bandwidth_frame.pack(fill='x', pady=2)
+        tk.Label(bandwidth_frame, text="Min bandwidth (Mbps):", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).pack(side='left')
+        self.min_bandwidth_var = tk.StringVar(value="")
+        tk.Entry(bandwidth_frame, textvariable=self.min_bandwidth_var, width=8).pack(side='right')
+
+        avoid_frame = tk.Frame(route_frame, bg=self.colors["card_bg"])
+        avoid_frame.pack(fill='x', pady=2)
+        tk.Label(avoid_frame, text="Avoid nodes:", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).pack(side='left')
+        self.avoid_nodes_var = tk.StringVar(value="")
+        tk.Entry(avoid_frame, textvariable=self.avoid_nodes_var, width=14).pack(side='right')
+
         # Algorithm selection
         algo_select_frame = tk.LabelFrame(algo_frame, text="Select Algorithms",
                                           bg=self.colors["card_bg"], fg=self.colors["accent"],
@@ -291,7 +403,8 @@ class ModernNetworkRoutingSimulator:
             ("DFS", "dfs_var", self.colors["dfs"]),
             ("Dijkstra", "dijkstra_var", self.colors["dijkstra"]),
             ("Bellman-Ford", "bellman_var", self.colors["bellman"]),
-            ("A*", "astar_var", self.colors["astar"])
+            ("A*", "astar_var", self.colors["astar"]),
+            ("JPS (grids)", "jps_var", self.colors["jps"])
         ]
 
         for i, (name, var_name, color) in enumerate(algorithms):
@@ -307,6 +420,35 @@ class ModernNetworkRoutingSimulator:
                            bg=self.colors["card_bg"], fg=self.colors["text_primary"],
                            font=('Arial', 9)).pack(side='left')
 
+        # Search instrumentation
+        counters_frame = tk.LabelFrame(algo_frame, text="Search Counters",
+                                       bg=self.colors["card_bg"], fg=self.colors["accent"],
+                                       font=('Arial', 10, 'bold'), padx=10, pady=10)
+        counters_frame.pack(fill='x', padx=5, pady=5)
+
+        self.counters_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(counters_frame, text="Count expansions, relaxations and heap ops",
+                       variable=self.counters_var, bg=self.colors["card_bg"], fg=self.colors["text_primary"],
+                       font=('Arial', 9)).pack(anchor='w')
+        self.trace_memory_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(counters_frame, text="Trace peak memory (slower)",
+                       variable=self.trace_memory_var, bg=self.colors["card_bg"], fg=self.colors["text_primary"],
+                       font=('Arial', 9)).pack(anchor='w')
+
+        # Multi-objective routes
+        pareto_frame = tk.LabelFrame(algo_frame, text="Pareto Routes (cost / latency / hops)",
+                                     bg=self.colors["card_bg"], fg=self.colors["accent"],
+                                     font=('Arial', 10, 'bold'), padx=10, pady=10)
+        pareto_frame.pack(fill='x', padx=5, pady=5)
+
+        tk.Button(pareto_frame, text="🎯 Find Pareto Routes", command=self.find_pareto_routes,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(fill='x')
+        self.pareto_listbox = tk.Listbox(pareto_frame, height=5, bg=self.colors["primary_bg"],
+                                         fg=self.colors["text_primary"], font=('Consolas', 9),
+                                         selectbackground=self.colors["accent"], exportselection=False)
+        self.pareto_listbox.pack(fill='x', pady=(5, 0))
+        self.pareto_listbox.bind('<<ListboxSelect>>', self.on_pareto_select)
+
         # Run button
         run_btn = tk.Button(algo_frame, text="🏃 Run Algorithms",
                             command=self.run_algorithms,
@@ -342,6 +484,85 @@ class ModernNetworkRoutingSimulator:
                               fg=self.colors["text_primary"], highlightthickness=0)
         node_scale.pack(fill='x')
 
+        # Traffic simulation
+        traffic_frame = tk.LabelFrame(viz_frame, text="Traffic Simulation",
+                                      bg=self.colors["card_bg"], fg=self.colors["accent"],
+                                      font=('Arial', 10, 'bold'), padx=10, pady=10)
+        traffic_frame.pack(fill='x', padx=5, pady=5)
+
+        tk.Label(traffic_frame, text="Packets:", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).pack(anchor='w')
+        self.traffic_packets_var = tk.IntVar(value=200)
+        traffic_scale = tk.Scale(traffic_frame, from_=1, to=5000, orient='horizontal',
+                                 variable=self.traffic_packets_var, bg=self.colors["card_bg"],
+                                 fg=self.colors["text_primary"], highlightthickness=0)
+        traffic_scale.pack(fill='x')
+
+        tk.Button(traffic_frame, text="🚦 Simulate Traffic", command=self.simulate_traffic,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(fill='x', pady=(5, 0))
+
+        # Network analysis
+        analysis_frame = tk.LabelFrame(viz_frame, text="Network Analysis",
+                                       bg=self.colors["card_bg"], fg=self.colors["accent"],
+                                       font=('Arial', 10, 'bold'), padx=10, pady=10)
+        analysis_frame.pack(fill='x', padx=5, pady=5)
+
+        tk.Label(analysis_frame, text="Pivot samples (accuracy):", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).pack(anchor='w')
+        self.betweenness_samples_var = tk.IntVar(value=100)
+        tk.Scale(analysis_frame, from_=10, to=2000, orient='horizontal',
+                 variable=self.betweenness_samples_var, bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"], highlightthickness=0).pack(fill='x')
+
+        tk.Label(analysis_frame, text="Time budget (s):", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).pack(anchor='w')
+        self.betweenness_budget_var = tk.IntVar(value=10)
+        tk.Scale(analysis_frame, from_=1, to=120, orient='horizontal',
+                 variable=self.betweenness_budget_var, bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"], highlightthickness=0).pack(fill='x')
+
+        self.show_betweenness_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(analysis_frame, text="Show betweenness overlay", variable=self.show_betweenness_var,
+                       command=self.refresh_visualization, bg=self.colors["card_bg"],
+                       fg=self.colors["text_primary"], font=('Arial', 9)).pack(anchor='w')
+
+        tk.Button(analysis_frame, text="📈 Compute Betweenness", command=self.compute_betweenness,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(fill='x', pady=(5, 0))
+
+        tk.Label(analysis_frame, text="Trace hold timer (s):", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).pack(anchor='w', pady=(5, 0))
+        self.trace_interval_var = tk.DoubleVar(value=1.0)
+        tk.Scale(analysis_frame, from_=0, to=10, resolution=0.1, orient='horizontal',
+                 variable=self.trace_interval_var, bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"], highlightthickness=0).pack(fill='x')
+
+        tk.Button(analysis_frame, text="⏱ Replay Weight Trace", command=self.replay_weight_trace,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(fill='x', pady=(5, 0))
+
+        # Search frontier replay
+        replay_frame = tk.LabelFrame(viz_frame, text="Search Replay",
+                                     bg=self.colors["card_bg"], fg=self.colors["accent"],
+                                     font=('Arial', 10, 'bold'), padx=10, pady=10)
+        replay_frame.pack(fill='x', padx=5, pady=5)
+
+        tk.Button(replay_frame, text="🔥 Replay Search Frontier", command=self.replay_search_frontier,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(fill='x')
+        tk.Button(replay_frame, text="🔲 Compare Side by Side", command=self.compare_side_by_side,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(fill='x', pady=(5, 0))
+
+        # Export
+        export_frame = tk.LabelFrame(viz_frame, text="Export",
+                                     bg=self.colors["card_bg"], fg=self.colors["accent"],
+                                     font=('Arial', 10, 'bold'), padx=10, pady=10)
+        export_frame.pack(fill='x', padx=5, pady=5)
+
+        tk.Button(export_frame, text="🎬 Export Paths", command=self.export_path_animation,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(side='left', fill='x', expand=True,
+                                                                                padx=2)
+        tk.Button(export_frame, text="🎬 Export Traffic", command=self.export_traffic_animation,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(side='right', fill='x', expand=True,
+                                                                                padx=2)
+
         # Layout selection
         layout_frame = tk.LabelFrame(viz_frame, text="Layout Options",
                                      bg=self.colors["card_bg"], fg=self.colors["accent"],
@@ -375,9 +596,49 @@ class ModernNetworkRoutingSimulator:
                                   fg=self.colors["text_primary"], font=('Consolas', 9))
         self.stats_text.pack(fill='both', expand=True, padx=5, pady=5)
 
+        stats_buttons = tk.Frame(stats_frame, bg=self.colors["card_bg"])
+        stats_buttons.pack(pady=5)
+
+        tk.Button(stats_buttons, text="💾 Export Stats", command=self.export_statistics,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(side='left', padx=2)
+
         # Clear stats button
-        tk.Button(stats_frame, text="🗑 Clear Stats", command=self.clear_stats,
-                  bg=self.colors["error"], fg='white', font=('Arial', 9)).pack(pady=5)
+        tk.Button(stats_buttons, text="🗑 Clear Stats", command=self.clear_stats,
+                  bg=self.colors["error"], fg='white', font=('Arial', 9)).pack(side='left', padx=2)
+
+    def create_results_tab(self, notebook):
+        results_frame = ttk.Frame(notebook, style='Modern.TFrame')
+        notebook.add(results_frame, text='📋 Results')
+
+        # Random query batches
+        batch_frame = tk.LabelFrame(results_frame, text="Query Batch",
+                                    bg=self.colors["card_bg"], fg=self.colors["accent"],
+                                    font=('Arial', 10, 'bold'), padx=10, pady=10)
+        batch_frame.pack(fill='x', padx=5, pady=5)
+
+        tk.Label(batch_frame, text="Random pairs:", bg=self.colors["card_bg"],
+                 fg=self.colors["text_primary"]).pack(side='left')
+        self.query_pairs_var = tk.IntVar(value=1000)
+        tk.Spinbox(batch_frame, from_=1, to=100000, increment=100, textvariable=self.query_pairs_var,
+                   width=8).pack(side='left', padx=5)
+        tk.Button(batch_frame, text="🎲 Run Query Batch", command=self.run_query_batch,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(side='left', padx=2)
+
+        # Only the visible page of rows is ever put into the widget
+        self.results_table = ResultsTable(results_frame, self.results, rows=18, on_open=self.open_result,
+                                          bg=self.colors["card_bg"])
+        self.results_table.pack(fill='both', expand=True, padx=5, pady=5)
+
+        results_buttons = tk.Frame(results_frame, bg=self.colors["card_bg"])
+        results_buttons.pack(pady=5)
+
+        self.results_count_var = tk.StringVar(value="0 results")
+        tk.Label(results_buttons, textvariable=self.results_count_var, bg=self.colors["card_bg"],
+                 fg=self.colors["text_secondary"], font=('Arial', 9)).pack(side='left', padx=5)
+        tk.Button(results_buttons, text="💾 Export Results", command=self.export_results,
+                  bg=self.colors["accent"], fg='white', font=('Arial', 9)).pack(side='left', padx=2)
+        tk.Button(results_buttons, text="🗑 Clear Results", command=self.clear_results,
+                  bg=self.colors["error"], fg='white', font=('Arial', 9)).pack(side='left', padx=2)
 
     def create_visualization_panel(self, parent):
         viz_container = tk.Frame(parent, bg=self.colors["secondary_bg"], relief='raised', bd=2)
@@ -403,17 +664,31 @@ class ModernNetworkRoutingSimulator:
         tk.Button(btn_frame, text="🔄", command=self.refresh_visualization,
                   bg='white', fg=self.colors["accent"], font=('Arial', 12)).pack(side='left', padx=2)
 
-        # Matplotlib figure
-        self.fig, self.ax = plt.subplots(figsize=(10, 8), facecolor='#1a1a2e')
+        # The matplotlib figure is built on first use; until then show a plain welcome label
+        self.viz_container = viz_container
+        self.fig = self.ax = self.canvas = None
+        self.welcome_label = tk.Label(viz_container, text=WELCOME_TEXT, justify='center',
+                                      font=('Arial', 14, 'bold'), bg=self.colors["card_bg"],
+                                      fg=self.colors["accent"])
+        self.welcome_label.pack(fill='both', expand=True, padx=5, pady=5)
+
+    def ensure_figure(self):
+        """Create the matplotlib figure and canvas the first time they are needed"""
+        if self.canvas is not None:
+            return
+
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig = Figure(figsize=(10, 8), facecolor='#1a1a2e')
+        self.ax = self.fig.add_subplot(111)
         self.ax.set_facecolor('#16213e')
         self.fig.tight_layout()
 
-        # Canvas
-        self.canvas = FigureCanvasTkAgg(self.fig, master=viz_container)
+        self.welcome_label.pack_forget()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.viz_container)
         self.canvas.get_tk_widget().pack(fill='both', expand=True, padx=5, pady=5)
-
-        # Initial display
-        self.show_welcome_message()
+        self.canvas.mpl_connect('button_press_event', self.on_canvas_click)
 
     def create_status_panel(self, parent):
         status_container = tk.Frame(parent, bg=self.colors["secondary_bg"], relief='raised', bd=2)
@@ -449,16 +724,22 @@ class ModernNetworkRoutingSimulator:
 
     def bind_events(self):
         """Bind mouse events for manual editing"""
-        self.canvas.mpl_connect('button_press_event', self.on_canvas_click)
+        # Canvas clicks are connected in ensure_figure once the canvas exists
+        self.root.bind('<Map>', self.on_first_map)
+        self.root.bind('<Control-z>', lambda event: self.undo_edit())
+        self.root.bind('<Control-y>', lambda event: self.redo_edit())
+
+    def on_first_map(self, event):
+        """Record when the window first becomes visible"""
+        if event.widget is self.root and self.startup_seconds is None:
+            self.startup_seconds = time.perf_counter() - STARTUP_CLOCK
 
     def show_welcome_message(self):
         """Show welcome message on startup"""
+        if self.canvas is None:
+            return
         self.ax.clear()
-        self.ax.text(0.5, 0.5, "Welcome to Advanced Network Routing Simulator v2.0\n\n"
-                               "🚀 Generate a network to begin\n"
-                               "✏ Use manual mode for custom networks\n"
-                               "🧠 Compare different routing algorithms\n"
-                               "📊 View detailed performance statistics",
+        self.ax.text(0.5, 0.5, WELCOME_TEXT,
                      horizontalalignment='center', verticalalignment='center',
                      fontsize=14, color=self.colors["accent"], weight='bold',
                      bbox=dict(boxstyle="round,pad=1", facecolor=self.colors["card_bg"], alpha=0.8))
@@ -488,27 +769,19 @@ class ModernNetworkRoutingSimulator:
             self.status_var.set("Generating network...")
             self.root.update()
 
-            # Generate based on type
-            if network_type == "random":
-                self.network = self.generate_random_network(nodes, edges)
-            elif network_type == "scale_free":
-                self.network = nx.barabasi_albert_graph(nodes, max(1, edges // nodes))
-                self.network = nx.relabel_nodes(self.network, {i: str(i + 1) for i in range(nodes)})
-            elif network_type == "small_world":
-                self.network = nx.watts_strogatz_graph(nodes, max(2, edges // nodes), 0.3)
-                self.network = nx.relabel_nodes(self.network, {i: str(i + 1) for i in range(nodes)})
-            elif network_type == "grid":
-                size = int(np.sqrt(nodes))
-                self.network = nx.grid_2d_graph(size, size)
-                self.network = nx.convert_node_labels_to_integers(self.network, first_label=1)
-                self.network = nx.relabel_nodes(self.network, {i: str(i) for i in self.network.nodes()})
-
-            # Add random weights
-            for edge in self.network.edges():
-                self.network[edge[0]][edge[1]]['weight'] = random.randint(1, 10)
-
-            # Update layout
-            self.update_layout()
+            from generators import generate_network, node_positions
+            self.network = generate_network(network_type, nodes, edges, self.obstacles_var.get() / 100)
+            self.journal.reset(self.network, self.pos)
+            self.last_algorithms = []
+            self.last_traffic = []
+
+            # Geometric and grid networks come with their own coordinates; the rest get a layout
+            native = node_positions(self.network)
+            if native:
+                self.pos = native
+                self.journal.replace_positions(self.pos)
+            else:
+                self.update_layout()
 
             # Update combo boxes
             node_list = list(self.network.nodes())
@@ -529,66 +802,28 @@ class ModernNetworkRoutingSimulator:
 
     def generate_random_network(self, nodes, edges):
         """Generate a random connected network"""
-        G = nx.Graph()
-
-        # Add nodes
-        for i in range(1, nodes + 1):
-            G.add_node(str(i))
-
-        # Create minimum spanning tree for connectivity
-        node_list = list(G.nodes())
-        connected = {node_list[0]}
-        unconnected = set(node_list[1:])
-
-        while unconnected:
-            source = random.choice(list(connected))
-            target = random.choice(list(unconnected))
-            weight = random.randint(1, 10)
-            G.add_edge(source, target, weight=weight)
-            connected.add(target)
-            unconnected.remove(target)
-
-        # Add remaining edges
-        remaining = edges - (nodes - 1)
-        attempts = 0
-        max_attempts = nodes * 10
-
-        while remaining > 0 and attempts < max_attempts:
-            u, v = random.sample(node_list, 2)
-            if not G.has_edge(u, v):
-                weight = random.randint(1, 10)
-                G.add_edge(u, v, weight=weight)
-                remaining -= 1
-            attempts += 1
-
-        return G
+        from generators import generate_random_network
+        return generate_random_network(nodes, edges)
 
     def update_layout(self):
         """Update network layout"""
         if not self.network:
             return
 
-        layout_type = self.layout_var.get()
+        from generators import compute_layout
+        self.pos = compute_layout(self.network, self.layout_var.get())
+        self.journal.replace_positions(self.pos)
 
-        if layout_type == "spring":
-            self.pos = nx.spring_layout(self.network, seed=42, k=2, iterations=50)
-        elif layout_type == "circular":
-            self.pos = nx.circular_layout(self.network)
-        elif layout_type == "random":
-            self.pos = nx.random_layout(self.network, seed=42)
-        elif layout_type == "shell":
-            self.pos = nx.shell_layout(self.network)
-
-        if hasattr(self, 'canvas'):
-            self.draw_network()
+        self.draw_network()
 
     def draw_network(self):
         """Draw the network with modern styling"""
         if not self.network:
             return
 
-        self.ax.clear()
-        self.ax.set_facecolor('#16213e')
+        from render import draw_network_on
+        self.ensure_figure()
+
         # Get source and destination
         try:
             source = self.source_var.get()
@@ -606,75 +841,14 @@ class ModernNetworkRoutingSimulator:
             source = nodes_list[0] if nodes_list else None
             destination = nodes_list[-1] if len(nodes_list) > 1 else nodes_list[0] if nodes_list else None
 
-            # Node colors with gradient effect
-        node_colors = []
-        for node in self.network.nodes():
-            if node == source:
-                node_colors.append('#00ff88')  # Bright green for source
-            elif node == destination:
-                node_colors.append('#ff6b6b')  # Bright red for destination
-            else:
-                node_colors.append('#00d4ff')  # Cyan for regular nodes
-
-        # Draw nodes with enhanced styling
-        nx.draw_networkx_nodes(self.network, self.pos,
-                               node_color=node_colors,
-                               node_size=self.node_size_var.get(),
-                               alpha=0.9,
-                               linewidths=2,
-                               edgecolors='white',
-                               ax=self.ax)
-
-        # Draw edges with varied thickness based on weight
-        edges = self.network.edges()
-        weights = [self.network[u][v].get('weight', 1) for u, v in edges]
-        max_weight = max(weights) if weights else 1
-        edge_widths = [2 + 3 * (w / max_weight) for w in weights]
-
-        nx.draw_networkx_edges(self.network, self.pos,
-                               edge_color='#4a90e2',
-                               width=edge_widths,
-                               alpha=0.6,
-                               ax=self.ax)
-
-        # Draw labels with better visibility
-        nx.draw_networkx_labels(self.network, self.pos,
-                                font_size=10,
-                                font_color='white',
-                                font_weight='bold',
-                                ax=self.ax)
-
-        # Draw edge labels (weights)
-        edge_labels = nx.get_edge_attributes(self.network, 'weight')
-        nx.draw_networkx_edge_labels(self.network, self.pos,
-                                     edge_labels=edge_labels,
-                                     font_size=8,
-                                     font_color='#ffeb3b',
-                                     bbox=dict(boxstyle="round,pad=0.2",
-                                               facecolor='black', alpha=0.7),
-                                     ax=self.ax)
-
-        # Add grid and styling
-        self.ax.grid(True, alpha=0.2, color='white')
-        self.ax.set_title(f"Network Topology ({len(self.network.nodes())} nodes, {len(self.network.edges())} edges)",
-                          fontsize=14, color='white', weight='bold', pad=20)
-
-        # Remove axes
-        self.ax.set_xticks([])
-        self.ax.set_yticks([])
+        # A frontier replay replaces the single axes with one panel per algorithm
+        if self.ax not in self.fig.axes or len(self.fig.axes) != 1:
+            self.fig.clear()
+            self.ax = self.fig.add_subplot(111)
 
-        # Add legend for node types
-        legend_elements = [
-            Line2D([0], [0], marker='o', color='w', markerfacecolor='#00ff88',
-                   markersize=10, label='Source'),
-            Line2D([0], [0], marker='o', color='w', markerfacecolor='#ff6b6b',
-                   markersize=10, label='Destination'),
-            Line2D([0], [0], marker='o', color='w', markerfacecolor='#00d4ff',
-                   markersize=10, label='Regular Node')
-        ]
-        self.ax.legend(handles=legend_elements, loc='upper right',
-                       facecolor='#16213e', edgecolor='white',
-                       labelcolor='white', fontsize=9)
+        centrality = self.betweenness if self.show_betweenness_var.get() else None
+        draw_network_on(self.ax, self.network, self.pos, source, destination,
+                        node_size=self.node_size_var.get(), centrality=centrality)
 
         self.canvas.draw()
 
@@ -682,6 +856,10 @@ class ModernNetworkRoutingSimulator:
         """Toggle manual editing mode"""
         self.manual_mode = self.manual_mode_var.get()
         if self.manual_mode:
+            # Clicks need a canvas; on a fresh start the welcome axes take the first nodes
+            if self.canvas is None:
+                self.ensure_figure()
+                self.show_welcome_message()
             self.status_var.set("Manual mode enabled - Click to add nodes, select nodes to connect")
         else:
             self.status_var.set("Manual mode disabled")
@@ -697,15 +875,8 @@ class ModernNetworkRoutingSimulator:
 
         # Find closest node if clicking near one
         closest_node = None
-        min_distance = float('inf')
-
         if self.network and self.pos:
-            for node in self.network.nodes():
-                node_x, node_y = self.pos[node]
-                distance = np.sqrt((x - node_x) * 2 + (y - node_y) * 2)
-                if distance < 0.1 and distance < min_distance:  # Threshold for node selection
-                    min_distance = distance
-                    closest_node = node
+            closest_node = self.spatial_index.nearest_node(x, y, self.node_pick_radius)
 
         if closest_node:
             # Select/deselect node
@@ -719,15 +890,141 @@ class ModernNetworkRoutingSimulator:
                 # If two nodes selected, create edge
                 if len(self.selected_nodes) == 2:
                     self.create_edge_between_selected()
+            return
+
+        # Select a link if clicking near one
+        closest_edge = None
+        if self.network and self.pos:
+            closest_edge = self.spatial_index.nearest_edge(x, y, self.edge_pick_radius)
+
+        if closest_edge:
+            self.select_edge(*closest_edge)
         else:
             # Add new node at click position
             self.add_node_at_position(x, y)
 
+    def select_edge(self, u, v):
+        """Select a link and load it into the manual edge controls"""
+        if self.selected_edge in ((u, v), (v, u)):
+            self.selected_edge = None
+            self.status_var.set(f"Deselected edge {u}-{v}")
+            return
+
+        self.selected_edge = (u, v)
+        weight = self.network[u][v].get('weight', 1)
+        self.edge_from_var.set(u)
+        self.edge_to_var.set(v)
+        self.edge_weight_var.set(str(weight))
+        self.status_var.set(f"Selected edge {u}-{v} with weight {weight}")
+
+    def invalidate_routes(self):
+        """Drop memoized routes after any change to the graph or its node positions"""
+        self.route_cache.invalidate()
+        if self.pareto_routes:
+            self.pareto_routes = []
+            self.pareto_listbox.delete(0, tk.END)
+
+    def start_empty_network(self):
+        """Begin a new, empty network for manual editing"""
+        import networkx as nx
+        self.network = nx.Graph()
+        self.pos = {}
+        self.journal.reset(self.network, self.pos)
+
+    def on_graph_change(self, change):
+        """Update caches, the hit-test index and the node lists from one journal change"""
+        kind = change.kind
+        # A batch carries many edits but refreshes the view once
+        changes = change.after if kind == 'batch' else (change,)
+
+        if kind == 'reset':
+            self.metrics.rebuild(self.network)
+        else:
+            for item in changes:
+                self.metrics.apply(item)
+        if self.network is not None:
+            from routing import forget_search_caches
+            forget_search_caches(self.network)
+
+        # An isolated new node cannot change any existing route
+        if any(not (item.kind == 'add_node' and not item.after[1]) for item in changes):
+            self.invalidate_routes()
+        if any(item.kind not in ('layout', 'move_node') for item in changes):
+            self.betweenness = None
+
+        if kind == 'layout':
+            self.rebuild_spatial_index()
+        else:
+            for item in changes:
+                self.update_spatial_index(item)
+
+        if self.selected_edge and not (self.network and self.network.has_edge(*self.selected_edge)):
+            self.selected_edge = None
+
+        if any(item.kind in ('add_node', 'remove_node') for item in changes):
+            self.update_node_combos()
+        if kind not in ('reset', 'layout'):
+            self.schedule_redraw()
+
+    def update_spatial_index(self, change):
+        """Fold one node or edge change into the hit-test index"""
+        kind, u, v = change.kind, change.u, change.v
+        if kind == 'add_node':
+            xy, edges = change.after
+            if xy is not None:
+                self.spatial_index.update_node(u, xy)
+            for neighbor, attrs in edges:
+                self.spatial_index.add_edge(u, neighbor)
+        elif kind == 'remove_node':
+            self.spatial_index.remove_node(u)
+            if u in self.selected_nodes:
+                self.selected_nodes.remove(u)
+        elif kind == 'add_edge':
+            self.spatial_index.add_edge(u, v)
+        elif kind == 'remove_edge':
+            self.spatial_index.remove_edge(u, v)
+        elif kind == 'move_node':
+            if change.after is not None:
+                self.spatial_index.update_node(u, change.after)
+
+    def schedule_redraw(self):
+        """Coalesce the redraws requested by several changes into one idle-time draw"""
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.root.after_idle(self.flush_redraw)
+
+    def flush_redraw(self):
+        self.redraw_pending = False
+        if self.network:
+            self.draw_network()
+        else:
+            self.show_welcome_message()
+
+    def undo_edit(self):
+        """Undo the last manual edit"""
+        if self.journal.undo():
+            self.status_var.set("Undid last edit")
+        else:
+            self.status_var.set("Nothing to undo")
+
+    def redo_edit(self):
+        """Redo the last undone edit"""
+        if self.journal.redo():
+            self.status_var.set("Redid edit")
+        else:
+            self.status_var.set("Nothing to redo")
+
+    def rebuild_spatial_index(self):
+        """Re-index all node positions and edges for canvas hit-testing"""
+        if self.network and self.pos:
+            self.spatial_index.rebuild(self.pos, self.network.edges())
+        else:
+            self.spatial_index.clear()
+
     def add_node_at_position(self, x, y):
         """Add a new node at the specified position"""
-        if not self.network:
-            self.network = nx.Graph()
-            self.pos = {}
+        if self.network is None:
+            self.start_empty_network()
 
         # Generate new node ID
         existing_nums = []
@@ -740,14 +1037,7 @@ class ModernNetworkRoutingSimulator:
         new_id = str(max(existing_nums) + 1 if existing_nums else 1)
 
         # Add node
-        self.network.add_node(new_id)
-        self.pos[new_id] = (x, y)
-
-        # Update combo boxes
-        self.update_node_combos()
-
-        # Redraw
-        self.draw_network()
+        self.journal.add_node(new_id, (x, y))
         self.status_var.set(f"Added node {new_id}")
 
     def add_manual_node(self):
@@ -757,24 +1047,18 @@ class ModernNetworkRoutingSimulator:
             messagebox.showerror("Error", "Please enter a node ID")
             return
 
-        if not self.network:
-            self.network = nx.Graph()
-            self.pos = {}
+        if self.network is None:
+            self.start_empty_network()
 
         if node_id in self.network.nodes():
             messagebox.showerror("Error", f"Node {node_id} already exists")
             return
 
         # Add node at random position
-        self.network.add_node(node_id)
-        self.pos[node_id] = (random.uniform(-1, 1), random.uniform(-1, 1))
+        self.journal.add_node(node_id, (random.uniform(-1, 1), random.uniform(-1, 1)))
 
         # Clear input
         self.new_node_var.set("")
-
-        # Update and redraw
-        self.update_node_combos()
-        self.draw_network()
         self.status_var.set(f"Added node {node_id}")
 
     def add_manual_edge(self):
@@ -808,17 +1092,35 @@ class ModernNetworkRoutingSimulator:
             return
 
         # Add edge
-        self.network.add_edge(from_node, to_node, weight=weight)
+        self.journal.add_edge(from_node, to_node, weight)
 
         # Clear inputs
         self.edge_from_var.set("")
         self.edge_to_var.set("")
         self.edge_weight_var.set("1")
-
-        # Redraw
-        self.draw_network()
         self.status_var.set(f"Added edge {from_node}-{to_node} with weight {weight}")
 
+    def bulk_edit(self, add_nodes=(), add_edges=(), set_weights=(), remove_edges=(), remove_nodes=()):
+        """Apply many edits as one undo step with a single refresh, for scripts and importers.
+
+        Takes the same arguments as GraphJournal.bulk_edit, except that
+        add_nodes may also list bare node ids, which get a random position.
+        Raises ValueError without changing anything if any edit is invalid.
+        """
+        if self.network is None:
+            self.start_empty_network()
+
+        nodes = []
+        for item in add_nodes:
+            if isinstance(item, tuple):
+                nodes.append(item)
+            else:
+                nodes.append((item, (random.uniform(-1, 1), random.uniform(-1, 1))))
+
+        count = self.journal.bulk_edit(nodes, add_edges, set_weights, remove_edges, remove_nodes)
+        self.status_var.set(f"Applied {count} edits")
+        return count
+
     def create_edge_between_selected(self):
         """Create edge between two selected nodes"""
         if len(self.selected_nodes) != 2:
@@ -830,9 +1132,8 @@ class ModernNetworkRoutingSimulator:
             self.status_var.set(f"Edge {node1}-{node2} already exists")
         else:
             weight = random.randint(1, 10)
-            self.network.add_edge(node1, node2, weight=weight)
+            self.journal.add_edge(node1, node2, weight)
             self.status_var.set(f"Created edge {node1}-{node2} with weight {weight}")
-            self.draw_network()
 
         # Clear selection
         self.selected_nodes.clear()
@@ -849,7 +1150,12 @@ class ModernNetworkRoutingSimulator:
         if messagebox.askyesno("Confirm", "Are you sure you want to clear the network?"):
             self.network = None
             self.pos = None
+            self.journal.reset(None, None)
             self.selected_nodes.clear()
+            self.selected_edge = None
+            self.spatial_index.clear()
+            self.last_algorithms = []
+            self.last_traffic = []
             self.source_combo['values'] = []
             self.dest_combo['values'] = []
             self.show_welcome_message()
@@ -862,20 +1168,15 @@ class ModernNetworkRoutingSimulator:
             return
 
         from tkinter import filedialog
+        from network_io import BINARY_EXTENSION, save_network_file
         filename = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", ".json"), ("All files", ".*")]
+            filetypes=[("JSON files", ".json"), ("Binary network", BINARY_EXTENSION), ("All files", ".*")]
         )
 
         if filename:
             try:
-                data = {
-                    'nodes': list(self.network.nodes()),
-                    'edges': [(u, v, self.network[u][v]) for u, v in self.network.edges()],
-                    'positions': self.pos
-                }
-                with open(filename, 'w') as f:
-                    json.dump(data, f, indent=2)
+                save_network_file(self.network, self.pos, filename)
                 self.status_var.set(f"Network saved to {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save: {str(e)}")
@@ -883,26 +1184,24 @@ class ModernNetworkRoutingSimulator:
     def load_network(self):
         """Load network from file"""
         from tkinter import filedialog
+        from network_io import BINARY_EXTENSION, load_network_file
         filename = filedialog.askopenfilename(
-            filetypes=[("JSON files", ".json"), ("All files", ".*")]
+            filetypes=[("Network files", f".json {BINARY_EXTENSION}"), ("JSON files", ".json"),
+                       ("Binary network", BINARY_EXTENSION), ("All files", ".*")]
         )
 
         if filename:
             try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-
-                self.network = nx.Graph()
-                self.network.add_nodes_from(data['nodes'])
-
-                for u, v, attrs in data['edges']:
-                    self.network.add_edge(u, v, **attrs)
-
-                self.pos = data.get('positions', {})
+                self.network, self.pos = load_network_file(filename)
+                self.journal.reset(self.network, self.pos)
+                self.last_algorithms = []
+                self.last_traffic = []
 
                 # If no positions, generate them
                 if not self.pos:
                     self.update_layout()
+                else:
+                    self.rebuild_spatial_index()
 
                 self.update_node_combos()
                 self.draw_network()
@@ -911,11 +1210,146 @@ class ModernNetworkRoutingSimulator:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load: {str(e)}")
 
+    def import_topology(self):
+        """Stream an edge list, GraphML or router dump in on a background thread"""
+        from tkinter import filedialog
+        filename = filedialog.askopenfilename(
+            filetypes=[("Edge lists", ".csv .tsv .edges .edgelist .txt"), ("GraphML", ".graphml .xml"),
+                       ("Topology dumps", ".dump .log .txt"), ("All files", ".*")]
+        )
+
+        if filename:
+            from importers import ImportJob
+            self.import_job = ImportJob(filename)
+            self.import_job.start()
+            self.poll_import()
+
+    def poll_import(self):
+        """Report import progress in the status bar until the job finishes"""
+        job = self.import_job
+        if not job.done:
+            self.status_var.set(f"Importing topology... {job.fraction:.0%}")
+            self.root.after(100, self.poll_import)
+            return
+
+        self.import_job = None
+        if job.error is not None:
+            messagebox.showerror("Error", f"Failed to import: {str(job.error)}")
+            self.status_var.set("Import failed")
+            return
+
+        self.status_var.set("Building network...")
+        self.root.update()
+        self.network = job.result.to_networkx()
+        self.pos = job.result.position_dict()
+        self.journal.reset(self.network, self.pos)
+        self.last_algorithms = []
+        self.last_traffic = []
+
+        if len(self.pos) < self.network.number_of_nodes():
+            self.update_layout()
+        else:
+            self.rebuild_spatial_index()
+
+        self.update_node_combos()
+        self.draw_network()
+        self.status_var.set(f"Imported {self.network.number_of_nodes()} nodes, "
+                            f"{self.network.number_of_edges()} edges from {job.filename}")
+
+    def compute_betweenness(self):
+        """Estimate node and edge betweenness on a background thread"""
+        if not self.network:
+            messagebox.showerror("Error", "Please generate a network first")
+            return
+        if self.betweenness_job is not None:
+            self.betweenness_job.cancel()
+
+        from centrality import BetweennessJob
+        # The job works on a snapshot so edits made meanwhile cannot race with it
+        self.betweenness_job = BetweennessJob(self.network.copy(), self.betweenness_samples_var.get(),
+                                              self.betweenness_budget_var.get())
+        self.betweenness_job.graph_version = self.route_cache.version
+        self.betweenness_job.start()
+        self.poll_betweenness()
+
+    def poll_betweenness(self):
+        """Report betweenness progress until the job finishes, then show the overlay and table"""
+        job = self.betweenness_job
+        if job is None:
+            return
+        if not job.done:
+            self.status_var.set(f"Computing betweenness... {job.fraction:.0%}")
+            self.root.after(100, self.poll_betweenness)
+            return
+
+        self.betweenness_job = None
+        if job.error is not None:
+            messagebox.showerror("Error", f"Failed to compute betweenness: {str(job.error)}")
+            self.status_var.set("Betweenness failed")
+            return
+        if job.graph_version != self.route_cache.version:
+            self.status_var.set("Network changed during analysis; betweenness discarded")
+            return
+
+        self.betweenness = job.result
+        self.draw_network()
+        self.update_statistics_display()
+        self.status_var.set(f"Betweenness from {job.result.sources_used} pivots in {job.result.seconds:.1f}s")
+
+    def replay_weight_trace(self):
+        """Replay a link-weight trace against a copy of the network and report route flaps"""
+        if not self.network:
+            messagebox.showerror("Error", "Please generate a network first")
+            return
+
+        import routing
+        keys = [key for name, key, function in routing.ALGORITHMS if getattr(self, f"{key}_var").get()]
+        if not keys:
+            messagebox.showwarning("Warning", "Please select at least one algorithm")
+            return
+
+        from tkinter import filedialog
+        filename = filedialog.askopenfilename(
+            filetypes=[("Weight traces", ".csv .tsv .txt"), ("All files", ".*")]
+        )
+        if not filename:
+            return
+        if self.trace_job is not None:
+            self.trace_job.cancel()
+
+        from traces import TraceJob, sample_pairs
+        # Monitored routes are sampled from the network; the trace is applied to a copy
+        network = self.network.copy()
+        self.trace_job = TraceJob(network, filename, sample_pairs(network, self.trace_routes), keys,
+                                  dict(self.pos), self.trace_interval_var.get())
+        self.trace_job.start()
+        self.poll_trace_replay()
+
+    def poll_trace_replay(self):
+        """Report trace replay progress until the job finishes, then show the summary"""
+        job = self.trace_job
+        if job is None:
+            return
+        if not job.done:
+            self.status_var.set(f"Replaying weight trace... {job.fraction:.0%}")
+            self.root.after(100, self.poll_trace_replay)
+            return
+
+        self.trace_job = None
+        if job.error is not None:
+            messagebox.showerror("Error", f"Failed to replay trace: {str(job.error)}")
+            self.status_var.set("Trace replay failed")
+            return
+
+        self.trace_replay = job.result
+        self.update_statistics_display()
+        self.status_var.set(f"Replayed {job.result.updates} updates in {job.result.seconds:.1f}s")
+
     def customize_colors(self):
         """Open color customization dialog"""
         color_window = tk.Toplevel(self.root)
         color_window.title("Customize Colors")
-        color_window.geometry("400x300")
+        color_window.geometry("400x340")
         color_window.configure(bg=self.colors["primary_bg"])
 
         # Color options
@@ -924,7 +1358,9 @@ class ModernNetworkRoutingSimulator:
             ("DFS Algorithm", "dfs"),
             ("Dijkstra Algorithm", "dijkstra"),
             ("Bellman-Ford Algorithm", "bellman"),
-            ("A* Algorithm", "astar")
+            ("A* Algorithm", "astar"),
+            ("Jump Point Search", "jps"),
+            ("Constrained Route", "constrained")
         ]
 
         for i, (name, key) in enumerate(color_options):
@@ -969,106 +1405,162 @@ class ModernNetworkRoutingSimulator:
 
         # Run selected algorithms
         algorithms = []
-
-        if self.bfs_var.get():
-            start_time = time.time()
-            bfs_result = self.bfs_path(source, destination)
-            bfs_time = time.time() - start_time
-            algorithms.append(("BFS", bfs_result, self.colors["bfs"], bfs_time))
-
-        if self.dfs_var.get():
-            start_time = time.time()
-            dfs_result = self.dfs_path(source, destination)
-            dfs_time = time.time() - start_time
-            algorithms.append(("DFS", dfs_result, self.colors["dfs"], dfs_time))
-
-        if self.dijkstra_var.get():
-            start_time = time.time()
-            dijkstra_result = self.dijkstra_path(source, destination)
-            dijkstra_time = time.time() - start_time
-            algorithms.append(("Dijkstra", dijkstra_result, self.colors["dijkstra"], dijkstra_time))
-
-        if self.bellman_var.get():
-            start_time = time.time()
-            bellman_result = self.bellman_ford_path(source, destination)
-            bellman_time = time.time() - start_time
-            algorithms.append(("Bellman-Ford", bellman_result, self.colors["bellman"], bellman_time))
-
-        if self.astar_var.get():
-            start_time = time.time()
-            astar_result = self.astar_path(source, destination)
-            astar_time = time.time() - start_time
-            algorithms.append(("A*", astar_result, self.colors["astar"], astar_time))
+        counters = {}
+
+        # Median of a few runs; a single sub-millisecond run is mostly timer noise
+        import routing
+        cached = 0
+        for name, key, function in routing.ALGORITHMS:
+            if not getattr(self, f"{key}_var").get():
+                continue
+
+            # With counters on, the instrumented search is the one timed, so time and counters match
+            counted = self.counters_var.get()
+            trace_memory = counted and self.trace_memory_var.get()
+            cache_key = ('counted', key) if counted else key
+            entry = self.route_cache.lookup(cache_key, source, destination)
+            if entry is None or (trace_memory and entry['counters']['peak_bytes'] is None):
+                if counted:
+                    from instrumentation import measured_search
+                    path, exec_time, search_stats = measured_search(key, self.network, source, destination,
+                                                                    self.pos, self.timing_repeats, trace_memory)
+                    entry = {'path': path, 'time': exec_time, 'counters': search_stats.as_dict()}
+                else:
+                    path, exec_time = routing.measured_path(key, self.network, source, destination, self.pos,
+                                                            self.timing_repeats)
+                    entry = {'path': path, 'time': exec_time, 'counters': None}
+                self.route_cache.store(cache_key, source, destination, entry)
+            else:
+                cached += 1
+            algorithms.append((name, entry['path'], self.colors[key], entry['time']))
+            if counted:
+                counters[name] = entry['counters']
+
+        # Cheapest route honoring the hop, bandwidth and avoid-node constraints
+        if self.constrained_var.get():
+            constraints = self.route_constraints()
+            if constraints is None:
+                return
+            entry = self.route_cache.lookup(('constrained', constraints), source, destination)
+            if entry is None:
+                from constrained import constrained_path
+                samples = []
+                for _ in range(self.timing_repeats):
+                    start = time.perf_counter()
+                    path = constrained_path(self.network, source, destination, constraints)
+                    samples.append(time.perf_counter() - start)
+                entry = {'path': path, 'time': sorted(samples)[len(samples) // 2]}
+                self.route_cache.store(('constrained', constraints), source, destination, entry)
+            else:
+                cached += 1
+            algorithms.append(("Constrained", entry['path'], self.colors["constrained"], entry['time']))
 
         if not algorithms:
             messagebox.showwarning("Warning", "Please select at least one algorithm")
             return
 
+        self.last_algorithms = [(name, path, color) for name, path, color, exec_time in algorithms]
+
         # Display results
-        self.display_results(algorithms, source, destination)
+        self.display_results(algorithms, source, destination, counters)
+        if cached:
+            self.status_var.set(f"{cached} of {len(algorithms)} routes served from cache")
 
         # Start visualization
         self.visualize_algorithms(algorithms)
 
-    def bfs_path(self, source, destination):
-        """Breadth-First Search pathfinding"""
+    def route_constraints(self):
+        """Constraints from the Route Configuration controls, or None after reporting bad input"""
+        from constrained import parse_constraints
         try:
-            return nx.shortest_path(self.network, source=source, target=destination)
-        except nx.NetworkXNoPath:
+            constraints = parse_constraints(self.max_hops_var.get(), self.min_bandwidth_var.get(),
+                                            self.avoid_nodes_var.get())
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Max hops and minimum bandwidth must be numbers")
             return None
 
+        unknown = [node for node in constraints.forbidden if node not in self.network]
+        if unknown:
+            messagebox.showerror("Error", f"Unknown nodes to avoid: {', '.join(sorted(unknown))}")
+            return None
+        return constraints
+
+    def bfs_path(self, source, destination):
+        """Breadth-First Search pathfinding"""
+        import routing
+        return routing.bfs_path(self.network, source, destination)
+
     def dfs_path(self, source, destination):
         """Depth-First Search pathfinding"""
-        visited = {source}
-        stack = [source]
-        parent = {source: None}
-
-        while stack:
-            node = stack.pop()
-            if node == destination:
-                path = []
-                while node is not None:
-                    path.append(node)
-                    node = parent[node]
-                return path[::-1]
-
-            for neighbor in self.network.neighbors(node):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    stack.append(neighbor)
-                    parent[neighbor] = node
-        return None
+        import routing
+        return routing.dfs_path(self.network, source, destination)
 
     def dijkstra_path(self, source, destination):
         """Dijkstra's shortest path algorithm"""
-        try:
-            return nx.dijkstra_path(self.network, source=source, target=destination, weight='weight')
-        except nx.NetworkXNoPath:
-            return None
+        import routing
+        return routing.dijkstra_path(self.network, source, destination)
 
     def bellman_ford_path(self, source, destination):
         """Bellman-Ford shortest path algorithm"""
-        try:
-            return nx.bellman_ford_path(self.network, source=source, target=destination, weight='weight')
-        except nx.NetworkXNoPath:
-            return None
+        import routing
+        return routing.bellman_ford_path(self.network, source, destination)
 
     def astar_path(self, source, destination):
         """A* pathfinding algorithm"""
-        try:
-            def heuristic(u, v):
-                # Euclidean distance heuristic
-                if self.pos and u in self.pos and v in self.pos:
-                    x1, y1 = self.pos[u]
-                    x2, y2 = self.pos[v]
-                    return np.sqrt((x1 - x2) * 2 + (y1 - y2) * 2)
-                return 0
-
-            return nx.astar_path(self.network, source, destination, heuristic=heuristic, weight='weight')
-        except nx.NetworkXNoPath:
-            return None
+        import routing
+        return routing.astar_path(self.network, source, destination, self.pos)
+
+    def find_pareto_routes(self):
+        """List the non-dominated routes over cost, latency and hop count"""
+        if not self.network:
+            messagebox.showerror("Error", "Please generate a network first")
+            return
+
+        source = self.source_var.get()
+        destination = self.dest_var.get()
+        if source not in self.network.nodes() or destination not in self.network.nodes():
+            messagebox.showerror("Error", "Invalid source or destination node")
+            return
+
+        entry = self.route_cache.lookup('pareto', source, destination)
+        if entry is None:
+            from pareto import pareto_paths
+            start = time.perf_counter()
+            entry = {'routes': pareto_paths(self.network, source, destination, max_labels=self.pareto_max_labels),
+                     'time': time.perf_counter() - start}
+            self.route_cache.store('pareto', source, destination, entry)
+        self.pareto_routes = entry['routes']
+
+        self.pareto_listbox.delete(0, tk.END)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, f"🎯 Pareto Routes: {source} → {destination}\n")
+        self.results_text.insert(tk.END, "=" * 50 + "\n\n")
+        if not self.pareto_routes:
+            self.results_text.insert(tk.END, "No path found\n")
+        for i, route in enumerate(self.pareto_routes):
+            self.pareto_listbox.insert(tk.END, f"{i + 1}. {route.describe()}")
+            self.results_text.insert(tk.END, f"🔹 {route.describe()}\n   Path: {path_preview(route.path, 12)}\n\n")
+
+        if self.pareto_routes:
+            self.pareto_listbox.selection_set(0)
+            self.on_pareto_select()
+        self.status_var.set(f"{len(self.pareto_routes)} non-dominated routes in {entry['time'] * 1000:.1f} ms")
+
+    def on_pareto_select(self, event=None):
+        """Highlight the Pareto route selected in the list"""
+        selection = self.pareto_listbox.curselection()
+        if not selection or selection[0] >= len(self.pareto_routes):
+            return
+        route = self.pareto_routes[selection[0]]
+
+        from render import draw_path_on, set_title
+        self.stop_animation()
+        self.draw_network()
+        draw_path_on(self.ax, self.network, self.pos, route.path, self.colors["accent"])
+        set_title(self.ax, f"🎯 Pareto Route {selection[0] + 1}: {route.describe()}")
+        self.canvas.draw()
 
-    def display_results(self, algorithms, source, destination):
+    def display_results(self, algorithms, source, destination, counters=None):
         """Display algorithm results and statistics"""
         self.results_text.insert(tk.END, f"🎯 Route Analysis: {source} → {destination}\n")
         self.results_text.insert(tk.END, "=" * 50 + "\n\n")
@@ -1093,15 +1585,17 @@ class ModernNetworkRoutingSimulator:
                     'hops': hop_count,
                     'time': exec_time
                 }
+                self.algorithm_stats[name].update((counters or {}).get(name, {}))
 
                 # Display result
                 self.results_text.insert(tk.END, f"🔹 {name}:\n")
-                self.results_text.insert(tk.END, f"   Path: {' → '.join(path)}\n")
+                self.results_text.insert(tk.END, f"   Path: {path_preview(path, 12)}\n")
                 self.results_text.insert(tk.END, f"   Cost: {path_cost} units\n")
                 self.results_text.insert(tk.END, f"   Hops: {hop_count}\n")
                 self.results_text.insert(tk.END, f"   Time: {exec_time:.6f}s\n\n")
             else:
                 self.results_text.insert(tk.END, f"🔹 {name}: No path found\n\n")
+            self.results.append(source, destination, name, path, path_cost if path else 0, exec_time)
 
         # Performance comparison
         if results_data:
@@ -1117,40 +1611,104 @@ class ModernNetworkRoutingSimulator:
 
         # Update statistics tab
         self.update_statistics_display()
+        self.refresh_results_table()
 
     def update_statistics_display(self):
         """Update the statistics tab with detailed metrics"""
         self.stats_text.delete(1.0, tk.END)
 
-        if not self.algorithm_stats:
+        if not self.algorithm_stats and self.betweenness is None and self.trace_replay is None:
             self.stats_text.insert(tk.END, "No statistics available. Run algorithms first.")
             return
 
         self.stats_text.insert(tk.END, "🏆 ALGORITHM PERFORMANCE STATISTICS\n")
         self.stats_text.insert(tk.END, "=" * 50 + "\n\n")
 
-        # Network info
+        # Network info, maintained incrementally by the metrics store
         if self.network:
+            metrics = self.metrics
+            min_degree, mean_degree, max_degree = metrics.degree_summary()
+            diameter, average_path, exact = metrics.path_estimate()
+            approx = "" if exact else "~"
             self.stats_text.insert(tk.END, f"📊 Network Information:\n")
-            self.stats_text.insert(tk.END, f"   Nodes: {len(self.network.nodes())}\n")
-            self.stats_text.insert(tk.END, f"   Edges: {len(self.network.edges())}\n")
-            self.stats_text.insert(tk.END, f"   Density: {nx.density(self.network):.3f}\n")
-            self.stats_text.insert(tk.END, f"   Connected: {'Yes' if nx.is_connected(self.network) else 'No'}\n\n")
-
-        # Algorithm comparison table
-        self.stats_text.insert(tk.END,
-                               f"{'Algorithm':<15} {'Cost':<8} {'Hops':<6} {'Time (ms)':<10} {'Efficiency':<10}\n")
-        self.stats_text.insert(tk.END, "-" * 60 + "\n")
-
-        best_cost = min(stats['cost'] for stats in self.algorithm_stats.values() if stats['cost'] > 0)
+            self.stats_text.insert(tk.END, f"   Nodes: {metrics.nodes}\n")
+            self.stats_text.insert(tk.END, f"   Edges: {metrics.edges}\n")
+            self.stats_text.insert(tk.END, f"   Density: {metrics.density:.3f}\n")
+            self.stats_text.insert(tk.END, f"   Connected: {'Yes' if metrics.is_connected() else 'No'} "
+                                           f"({metrics.component_count()} component(s))\n")
+            self.stats_text.insert(tk.END, f"   Degree: min {min_degree}, mean {mean_degree:.2f}, max {max_degree}\n")
+            weights = metrics.weight_summary()
+            if weights:
+                self.stats_text.insert(tk.END, f"   Weight: min {weights[0]}, mean {weights[1]:.2f}, "
+                                               f"max {weights[2]}\n")
+            self.stats_text.insert(tk.END, f"   Diameter: {approx}{diameter} hops   "
+                                           f"Avg path: {approx}{average_path:.2f} hops\n\n")
+
+        # Route cache effectiveness
+        cache = self.route_cache
+        self.stats_text.insert(tk.END, f"⚡ Route Cache:\n")
+        self.stats_text.insert(tk.END, f"   Hits: {cache.hits}   Misses: {cache.misses}   "
+                                       f"Hit rate: {cache.hit_rate:.1%}\n")
+        self.stats_text.insert(tk.END, f"   Entries: {len(cache)} / {cache.entries.maxsize}   "
+                                       f"Graph version: {cache.version}\n\n")
+
+        if self.algorithm_stats:
+            self.insert_algorithm_tables()
+
+        # Betweenness hot spots
+        if self.betweenness is not None:
+            result = self.betweenness
+            label = "exact" if result.exact else f"{result.sources_used}/{result.total_sources} pivots"
+            self.stats_text.insert(tk.END, f"\n🔥 Hot Routers (betweenness, {label}, {result.seconds:.1f}s):\n")
+            for node, score in result.top_nodes(self.top_n):
+                self.stats_text.insert(tk.END, f"   {node:<15} {score:.4f}\n")
+            self.stats_text.insert(tk.END, f"\n🔥 Hot Links:\n")
+            for (u, v), score in result.top_edges(self.top_n):
+                self.stats_text.insert(tk.END, f"   {f'{u}-{v}':<15} {score:.4f}\n")
+
+        # Route stability under the last replayed weight trace
+        if self.trace_replay is not None:
+            replay = self.trace_replay
+            self.stats_text.insert(tk.END, f"\n⏱ Weight Trace Replay ({replay.updates} updates, "
+                                           f"{replay.windows} windows, {replay.seconds:.1f}s):\n")
+            self.stats_text.insert(tk.END,
+                                   f"{'Algorithm':<15} {'Routes':<7} {'Recomputes':<11} {'Flaps':<7} "
+                                   f"{'Stale mean':<11} {'Stale max':<10}\n")
+            self.stats_text.insert(tk.END, "-" * 65 + "\n")
+            for row in replay.summary():
+                self.stats_text.insert(tk.END,
+                                       f"{row['algorithm']:<15} {row['routes']:<7} {row['recomputes']:<11} "
+                                       f"{row['flaps']:<7} {row['stale_mean']:<11.3f} {row['stale_max']:<10.3f}\n")
+
+    def insert_algorithm_tables(self):
+        """Algorithm comparison table for the statistics tab, with search counters when collected"""
+        counted = any('expanded' in stats for stats in self.algorithm_stats.values())
+        header = f"{'Algorithm':<15} {'Cost':<8} {'Hops':<6} {'Time (ms)':<10} {'Efficiency':<10}"
+        if counted:
+            # Counted rows were timed on the instrumented searches that produced the counters
+            self.stats_text.insert(tk.END, "Rows with counters: time and counters come from the same instrumented search\n")
+            header += f" {'Expanded':<9} {'Relaxed':<9} {'Pushes':<8} {'Pops':<8} {'Frontier':<9} {'Peak KB':<8}"
+        self.stats_text.insert(tk.END, header + "\n")
+        self.stats_text.insert(tk.END, "-" * (115 if counted else 60) + "\n")
+
+        costs = [stats['cost'] for stats in self.algorithm_stats.values() if stats['cost'] > 0]
+        best_cost = min(costs) if costs else 0
 
         for name, stats in self.algorithm_stats.items():
             cost = stats['cost']
             hops = stats['hops']
             time_ms = stats['time'] * 1000
-            efficiency = best_cost / cost if cost > 0 else 0
-
-            self.stats_text.insert(tk.END, f"{name:<15} {cost:<8} {hops:<6} {time_ms:<10.3f} {efficiency:<10.3f}\n")
+            # A zero-cost route cannot be beaten
+            efficiency = best_cost / cost if cost > 0 else 1.0
+
+            row = f"{name:<15} {cost:<8} {hops:<6} {time_ms:<10.3f} {efficiency:<10.3f}"
+            if 'expanded' in stats:
+                peak = f"{stats['peak_bytes'] / 1024:.1f}" if stats['peak_bytes'] is not None else "-"
+                row += (f" {stats['expanded']:<9} {stats['relaxed']:<9} {stats['pushes']:<8} "
+                        f"{stats['pops']:<8} {stats['max_frontier']:<9} {peak:<8}")
+            elif counted:
+                row += f" {'-':<9} {'-':<9} {'-':<8} {'-':<8} {'-':<9} {'-':<8}"
+            self.stats_text.insert(tk.END, row + "\n")
 
     def visualize_algorithms(self, algorithms):
         """Visualize algorithm paths with animations"""
@@ -1179,36 +1737,27 @@ class ModernNetworkRoutingSimulator:
             except:
                 pass
 
+        import matplotlib.animation as animation
+        from packet_layer import PacketLayer
+        from render import draw_path_on
+
         # Redraw network
         self.draw_network()
 
         # Highlight the path
-        path_edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
-        nx.draw_networkx_edges(self.network, self.pos, edgelist=path_edges,
-                               edge_color=color, width=5, alpha=0.8, ax=self.ax)
+        draw_path_on(self.ax, self.network, self.pos, path, color)
 
         # Create packet animation
-        if not hasattr(self, 'packet') or self.packet is None:
-            self.packet, = self.ax.plot([], [], 'o', color='yellow', markersize=15,
-                                        markeredgecolor='black', markeredgewidth=2)
-
-        # Get positions along path
-        path_positions = [self.pos[node] for node in path]
-
-        def init_animation():
-            self.packet.set_data([], [])
-            return self.packet,
-
-        def animate_packet(frame):
-            if frame < len(path_positions):
-                x, y = path_positions[frame]
-                self.packet.set_data([x], [y])
-            return self.packet,
+        self.packet_layer = PacketLayer(self.ax, self.pos, frames_per_hop=self.frames_per_hop,
+                                        color='yellow', size=225, linewidth=2)
+        self.packet_layer.add_packet(path)
+        self.packet_layer.build()
 
         # Create and start animation
         self.animation = animation.FuncAnimation(
-            self.fig, animate_packet, init_func=init_animation,
-            frames=len(path_positions), interval=self.speed_var.get(),
+            self.fig, self.packet_layer.update, init_func=self.packet_layer.init_frame,
+            frames=self.packet_layer.total_frames,
+            interval=max(1, self.speed_var.get() // self.frames_per_hop),
             repeat=False, blit=True
         )
 
@@ -1219,6 +1768,192 @@ class ModernNetworkRoutingSimulator:
 
         self.status_var.set(f"Visualizing {algorithm_name} algorithm")
 
+    def replay_search_frontier(self):
+        """Replay what each selected algorithm explored, side by side, as a frontier heatmap"""
+        if not self.network:
+            messagebox.showerror("Error", "Please generate a network first")
+            return
+
+        source = self.source_var.get()
+        destination = self.dest_var.get()
+        if source not in self.network.nodes() or destination not in self.network.nodes():
+            messagebox.showerror("Error", "Invalid source or destination node")
+            return
+
+        import routing
+        keys = [(name, key) for name, key, function in routing.ALGORITHMS if getattr(self, f"{key}_var").get()]
+        if not keys:
+            messagebox.showwarning("Warning", "Please select at least one algorithm")
+            return
+
+        self.stop_animation()
+        self.status_var.set("Recording search events...")
+        self.root.update_idletasks()
+
+        import matplotlib.animation as animation
+        from frontier_replay import FrontierReplay, record_search
+
+        logs = [(name, record_search(key, self.network, source, destination, self.pos)[2]) for name, key in keys]
+
+        self.ensure_figure()
+        replay = FrontierReplay(self.fig, self.network, self.pos, logs, source, destination,
+                                node_size=max(10, self.node_size_var.get() // 10))
+        self.animation = animation.FuncAnimation(
+            self.fig, replay.update, init_func=replay.init_frame, frames=replay.total_frames,
+            interval=max(1, self.speed_var.get() // 10), repeat=False, blit=True
+        )
+        self.canvas.draw()
+        total = sum(len(log) for _, log in logs)
+        self.status_var.set(f"Replaying {total:,} search events across {len(logs)} algorithm(s)")
+
+    def compare_side_by_side(self):
+        """Show every selected algorithm's explored set and path in its own panel at once"""
+        if not self.network:
+            messagebox.showerror("Error", "Please generate a network first")
+            return
+
+        source = self.source_var.get()
+        destination = self.dest_var.get()
+        if source not in self.network.nodes() or destination not in self.network.nodes():
+            messagebox.showerror("Error", "Invalid source or destination node")
+            return
+
+        import routing
+        keys = [(name, key, self.colors[key]) for name, key, function in routing.ALGORITHMS
+                if getattr(self, f"{key}_var").get()]
+        if not keys:
+            messagebox.showwarning("Warning", "Please select at least one algorithm")
+            return
+
+        self.stop_animation()
+        self.status_var.set("Recording searches...")
+        self.root.update_idletasks()
+
+        try:
+            from comparison import GAP, ComparisonRenderer, grid_shape, record_panels
+
+            panels = record_panels(self.network, self.pos, source, destination, keys)
+            self.status_var.set(f"Rendering {len(panels)} panel(s)...")
+            self.root.update_idletasks()
+
+            self.ensure_figure()
+            width, height = self.canvas.get_width_height()
+            rows, columns = grid_shape(len(panels))
+            panel_size = (max(50, (width - GAP * (columns - 1)) // columns),
+                          max(50, (height - GAP * (rows - 1)) // rows))
+            if self.comparison_renderer is None:
+                self.comparison_renderer = ComparisonRenderer()
+            image = self.comparison_renderer.render(
+                self.network, self.pos, panels, source, destination, panel_size=panel_size,
+                columns=columns, dpi=self.fig.dpi, node_size=max(2, self.node_size_var.get() // 10),
+                version=self.route_cache.version)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to compare algorithms: {str(e)}")
+            self.status_var.set("Comparison failed")
+            return
+
+        # draw_network restores the single axes afterwards
+        self.fig.clear()
+        ax = self.fig.add_axes((0, 0, 1, 1))
+        ax.imshow(image)
+        ax.set_axis_off()
+        self.canvas.draw()
+        self.status_var.set(f"Comparing {len(panels)} algorithm(s) from {source} to {destination}")
+
+    def simulate_traffic(self):
+        """Animate many packets between random node pairs at the same time"""
+        if not self.network or self.network.number_of_nodes() < 2:
+            messagebox.showerror("Error", "Please generate a network first")
+            return
+
+        import matplotlib.animation as animation
+        import networkx as nx
+        from packet_layer import PacketLayer
+
+        self.stop_animation()
+        self.draw_network()
+
+        count = self.traffic_packets_var.get()
+        node_list = list(self.network.nodes())
+        colors = [self.colors[key] for key in ("bfs", "dfs", "dijkstra", "bellman", "astar")]
+        routes = {}
+
+        self.packet_layer = PacketLayer(self.ax, self.pos, frames_per_hop=self.frames_per_hop, size=60)
+        self.last_traffic = []
+        spread = max(1, count // 50) * self.frames_per_hop
+        for i in range(count):
+            source, destination = random.sample(node_list, 2)
+            if source not in routes:
+                routes[source] = nx.single_source_dijkstra_path(self.network, source, weight='weight')
+            path = routes[source].get(destination)
+            if path:
+                packet = (path, random.randrange(spread), colors[i % len(colors)])
+                self.last_traffic.append(packet)
+                self.packet_layer.add_packet(packet[0], start_frame=packet[1], color=packet[2])
+        self.packet_layer.build()
+
+        self.animation = animation.FuncAnimation(
+            self.fig, self.packet_layer.update, init_func=self.packet_layer.init_frame,
+            frames=self.packet_layer.total_frames,
+            interval=max(1, self.speed_var.get() // self.frames_per_hop),
+            repeat=False, blit=True
+        )
+
+        self.ax.set_title(f"🚦 Traffic Simulation ({len(self.packet_layer)} packets)",
+                          fontsize=14, color='white', weight='bold')
+        self.canvas.draw()
+        self.status_var.set(f"Simulating {len(self.packet_layer)} packets")
+
+    def ask_export_filename(self):
+        """Ask where to write an exported animation"""
+        from tkinter import filedialog
+        return filedialog.asksaveasfilename(
+            defaultextension=".gif",
+            filetypes=[("GIF animation", ".gif"), ("MP4 video", ".mp4"), ("PNG frame folder", ".*")]
+        )
+
+    def run_export(self, scene, filename):
+        """Render a scene to filename off-screen and report the outcome"""
+        from export import export_scene
+
+        self.status_var.set(f"Exporting animation to {filename}...")
+        self.root.update()
+        try:
+            frames = export_scene(scene, filename, fps=max(1, 1000 * self.frames_per_hop // self.speed_var.get()),
+                                  figsize=tuple(self.fig.get_size_inches()) if self.fig else (10, 8),
+                                  dpi=self.fig.dpi if self.fig else 100)
+            self.status_var.set(f"Exported {frames} frames to {filename}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+
+    def export_path_animation(self):
+        """Export every algorithm's packet traversal from the last run"""
+        if not self.network or not any(path for name, path, color in self.last_algorithms):
+            messagebox.showerror("Error", "Please run algorithms first")
+            return
+
+        filename = self.ask_export_filename()
+        if filename:
+            from export import build_path_scene
+            scene = build_path_scene(self.network, self.pos, self.last_algorithms,
+                                     self.source_var.get(), self.dest_var.get(),
+                                     frames_per_hop=self.frames_per_hop, node_size=self.node_size_var.get())
+            self.run_export(scene, filename)
+
+    def export_traffic_animation(self):
+        """Export the last traffic simulation"""
+        if not self.network or not self.last_traffic:
+            messagebox.showerror("Error", "Please simulate traffic first")
+            return
+
+        filename = self.ask_export_filename()
+        if filename:
+            from export import build_traffic_scene
+            scene = build_traffic_scene(self.network, self.pos, self.last_traffic,
+                                        self.source_var.get(), self.dest_var.get(),
+                                        frames_per_hop=self.frames_per_hop, node_size=self.node_size_var.get())
+            self.run_export(scene, filename)
+
     def pause_animation(self):
         """Pause current animation"""
         if hasattr(self, 'animation') and self.animation is not None:
@@ -1245,6 +1980,137 @@ class ModernNetworkRoutingSimulator:
         else:
             self.show_welcome_message()
 
+    def export_statistics(self):
+        """Export the algorithm statistics, including any search counters, to CSV or JSON"""
+        if not self.algorithm_stats:
+            messagebox.showwarning("Warning", "No statistics to export. Run algorithms first.")
+            return
+
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json")]
+        )
+        if not filename:
+            return
+
+        import csv
+        import json
+        from instrumentation import SearchStats
+
+        rows = []
+        for name, stats in self.algorithm_stats.items():
+            row = {'algorithm': name, 'cost': stats['cost'], 'hops': stats['hops'],
+                   'time_ms': stats['time'] * 1000}
+            row.update({field: stats.get(field) for field in SearchStats.FIELDS})
+            row['path'] = ' '.join(stats['path'])
+            rows.append(row)
+
+        try:
+            with open(filename, 'w', newline='') as f:
+                if filename.lower().endswith('.json'):
+                    json.dump(rows, f, indent=2)
+                else:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                    writer.writeheader()
+                    writer.writerows(rows)
+            self.status_var.set(f"Statistics exported to {filename}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export statistics: {str(e)}")
+
+    def refresh_results_table(self):
+        """Show the current page of the results store and its size"""
+        self.results_table.refresh()
+        self.results_count_var.set(f"{len(self.results):,} results")
+
+    def run_query_batch(self):
+        """Route random node pairs with the selected algorithms on a background thread"""
+        if not self.network or self.network.number_of_nodes() < 2:
+            messagebox.showerror("Error", "Please generate a network first")
+            return
+
+        import routing
+        keys = [key for name, key, function in routing.ALGORITHMS if getattr(self, f"{key}_var").get()]
+        if not keys:
+            messagebox.showwarning("Warning", "Please select at least one algorithm")
+            return
+        if self.query_job is not None:
+            self.query_job.cancel()
+
+        # Queries run on a copy so edits made meanwhile cannot race the searches
+        network = self.network.copy()
+        nodes = list(network.nodes())
+        pairs = [tuple(random.sample(nodes, 2)) for _ in range(max(1, self.query_pairs_var.get()))]
+        self.query_job = QueryBatchJob(network, pairs, keys, dict(self.pos or {}))
+        self.query_job.start()
+        self.poll_query_batch()
+
+    def poll_query_batch(self):
+        """Report query batch progress until the job finishes, then show its rows"""
+        job = self.query_job
+        if job is None:
+            return
+        if not job.done:
+            self.status_var.set(f"Running query batch... {job.fraction:.0%}")
+            self.root.after(100, self.poll_query_batch)
+            return
+
+        self.query_job = None
+        if job.error is not None:
+            messagebox.showerror("Error", f"Failed to run query batch: {str(job.error)}")
+            self.status_var.set("Query batch failed")
+            return
+
+        self.results.extend(job.result)
+        self.refresh_results_table()
+        self.status_var.set(f"Query batch added {len(job.result):,} results")
+
+    def open_result(self, index):
+        """Show a result's full path and highlight it when it still fits the network"""
+        path = self.results.path(index)
+        source, destination, name, cost, hops = self.results.row(index)[:5]
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, f"🔹 {name}: {source} → {destination}   Cost: {cost}   Hops: {hops}\n")
+        self.results_text.insert(tk.END, f"   Path: {' → '.join(path) if path else 'No path found'}\n")
+
+        if path and self.network and all(self.network.has_edge(u, v) for u, v in zip(path, path[1:])):
+            from render import draw_path_on, set_title
+            self.stop_animation()
+            self.draw_network()
+            draw_path_on(self.ax, self.network, self.pos, path, self.colors["accent"])
+            set_title(self.ax, f"📋 {name}: {source} → {destination}")
+            self.canvas.draw()
+
+    def export_results(self):
+        """Save the results store as CSV, JSON or JSON lines"""
+        if not len(self.results):
+            messagebox.showwarning("Warning", "No results to export")
+            return
+
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json"), ("JSON lines", "*.jsonl")]
+        )
+        if not filename:
+            return
+
+        try:
+            from cli import write_results
+            write_results(self.results.as_dicts(), filename)
+            self.status_var.set(f"Exported {len(self.results):,} results to {filename}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export results: {str(e)}")
+
+    def clear_results(self):
+        """Drop every stored query result"""
+        if self.query_job is not None:
+            self.query_job.cancel()
+            self.query_job = None
+        self.results.clear()
+        self.refresh_results_table()
+        self.status_var.set("Results cleared")
+
     def clear_stats(self):
         """Clear statistics"""
         self.algorithm_stats.clear()
@@ -1254,19 +2120,40 @@ class ModernNetworkRoutingSimulator:
 
     def main(self):
         root = tk.Tk()
-        app = ModernNetworkRoutingSimulator(root)
+        ModernNetworkRoutingSimulator(root)
         root.mainloop()
 
     if __name__ == "_main_":
         main()
+
+
+def check_startup(budget=STARTUP_BUDGET):
+    """Time process start to a visible window and fail if over budget or heavy modules loaded eagerly"""
+    root = tk.Tk()
+    app = ModernNetworkRoutingSimulator(root)
+    root.update()
+    elapsed = app.startup_seconds if app.startup_seconds is not None else time.perf_counter() - STARTUP_CLOCK
+    eager = [name for name in HEAVY_MODULES if name in sys.modules]
+    root.destroy()
+
+    print(f"Startup: {elapsed:.3f}s (budget {budget:.2f}s)")
+    if eager:
+        print(f"Imported at startup: {', '.join(eager)}")
+    return 0 if elapsed <= budget and not eager else 1
+
+
 def main():
+    if "--startup-check" in sys.argv[1:]:
+        sys.exit(check_startup())
+
     try:
         root = tk.Tk()
-        app = ModernNetworkRoutingSimulator(root)
+        ModernNetworkRoutingSimulator(root)
         root.mainloop()
     except Exception as e:
         print(f"Error: {e}")
         input("Press Enter to close...")
 
+
 if __name__ == "__main__":
     main()
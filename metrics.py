@@ -0,0 +1,214 @@
+import random
+from collections import Counter, deque
+
+
+class NetworkMetrics:
+    """Network statistics kept up to date from journal changes instead of full recomputation.
+
+    Node/edge counts, the degree histogram and edge-weight summaries are
+    adjusted per change. Connectivity uses union-find, which only supports
+    additions; a removal marks it stale and it is rebuilt on next use.
+    Diameter and average path length are estimated from a few BFS sweeps and
+    cached until the graph changes.
+    """
+
+    def __init__(self, samples=16, seed=0):
+        self.samples = samples
+        self.seed = seed
+        self.network = None
+        self.clear()
+
+    def clear(self):
+        self.nodes = 0
+        self.edges = 0
+        self.degree = {}
+        self.degree_histogram = Counter()
+        self.weights = Counter()
+        self.weight_total = 0
+        self.parent = {}
+        self.size = {}
+        self.components = 0
+        self.components_stale = False
+        self._path_estimate = None
+
+    # Union-find
+
+    def _find(self, node):
+        parent = self.parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def _union(self, u, v):
+        ru, rv = self._find(u), self._find(v)
+        if ru == rv:
+            return
+        if self.size[ru] < self.size[rv]:
+            ru, rv = rv, ru
+        self.parent[rv] = ru
+        self.size[ru] += self.size[rv]
+        self.components -= 1
+
+    def _rebuild_components(self):
+        self.parent = {node: node for node in self.degree}
+        self.size = {node: 1 for node in self.degree}
+        self.components = len(self.degree)
+        for u, v in self.network.edges():
+            self._union(u, v)
+        self.components_stale = False
+
+    # Incremental updates
+
+    def _set_degree(self, node, degree):
+        old = self.degree.get(node)
+        if old is not None:
+            self.degree_histogram[old] -= 1
+            if not self.degree_histogram[old]:
+                del self.degree_histogram[old]
+        if degree is None:
+            self.degree.pop(node, None)
+        else:
+            self.degree[node] = degree
+            self.degree_histogram[degree] += 1
+
+    def _add_weight(self, weight, count=1):
+        self.weights[weight] += count
+        if not self.weights[weight]:
+            del self.weights[weight]
+        self.weight_total += weight * count
+
+    def _node_added(self, node):
+        self.nodes += 1
+        self._set_degree(node, 0)
+        self.parent[node] = node
+        self.size[node] = 1
+        self.components += 1
+
+    def _edge_added(self, u, v, weight):
+        self.edges += 1
+        self._set_degree(u, self.degree[u] + 1)
+        self._set_degree(v, self.degree[v] + 1)
+        self._add_weight(weight)
+        if not self.components_stale:
+            self._union(u, v)
+
+    def _edge_removed(self, u, v, weight):
+        self.edges -= 1
+        self._set_degree(u, self.degree[u] - 1)
+        self._set_degree(v, self.degree[v] - 1)
+        self._add_weight(weight, -1)
+        self.components_stale = True
+
+    def rebuild(self, network):
+        """Recompute everything for a replaced graph"""
+        self.clear()
+        self.network = network
+        if network is None:
+            return
+        for node in network.nodes():
+            self._node_added(node)
+        for u, v, data in network.edges(data=True):
+            self._edge_added(u, v, data.get('weight', 1))
+
+    def apply(self, change):
+        """Fold one journal Change (already applied to the graph) into the metrics"""
+        kind, u, v = change.kind, change.u, change.v
+        if kind in ('reset', 'layout', 'move_node'):
+            return
+        self._path_estimate = None
+
+        if kind == 'add_node':
+            self._node_added(u)
+            for neighbor, attrs in change.after[1]:
+                self._edge_added(u, neighbor, attrs.get('weight', 1))
+        elif kind == 'remove_node':
+            for neighbor, attrs in change.before[1]:
+                self._edge_removed(u, neighbor, attrs.get('weight', 1))
+            self._set_degree(u, None)
+            self.nodes -= 1
+            self.components_stale = True
+        elif kind == 'add_edge':
+            self._edge_added(u, v, change.after.get('weight', 1))
+        elif kind == 'remove_edge':
+            self._edge_removed(u, v, change.before.get('weight', 1))
+        elif kind == 'set_weight':
+            self._add_weight(change.before, -1)
+            self._add_weight(change.after)
+
+    # Queries
+
+    @property
+    def density(self):
+        if self.nodes < 2:
+            return 0.0
+        return 2 * self.edges / (self.nodes * (self.nodes - 1))
+
+    def component_count(self):
+        if self.components_stale:
+            self._rebuild_components()
+        return self.components
+
+    def is_connected(self):
+        return self.nodes > 0 and self.component_count() == 1
+
+    def degree_summary(self):
+        """(min, mean, max) degree"""
+        if not self.nodes:
+            return 0, 0.0, 0
+        return min(self.degree_histogram), 2 * self.edges / self.nodes, max(self.degree_histogram)
+
+    def weight_summary(self):
+        """(min, mean, max) edge weight, or None without edges"""
+        if not self.edges:
+            return None
+        return min(self.weights), self.weight_total / self.edges, max(self.weights)
+
+    def _bfs(self, source):
+        distances = {source: 0}
+        queue = deque([source])
+        adjacency = self.network.adj
+        while queue:
+            node = queue.popleft()
+            step = distances[node] + 1
+            for neighbor in adjacency[node]:
+                if neighbor not in distances:
+                    distances[neighbor] = step
+                    queue.append(neighbor)
+        return distances
+
+    def path_estimate(self):
+        """(diameter, average path length, exact) in hops from sampled BFS sweeps
+
+        With more nodes than samples the diameter is a lower bound, improved
+        by sweeping again from the farthest node found, and the average path
+        length is the mean over the sampled sources.
+        """
+        if self._path_estimate is not None:
+            return self._path_estimate
+        nodes = list(self.degree)
+        if len(nodes) < 2:
+            self._path_estimate = (0, 0.0, True)
+            return self._path_estimate
+
+        exact = len(nodes) <= self.samples
+        sources = nodes if exact else random.Random(self.seed).sample(nodes, self.samples)
+
+        diameter = 0
+        total = pairs = 0
+        farthest = None
+        for source in sources:
+            distances = self._bfs(source)
+            node, eccentricity = max(distances.items(), key=lambda item: item[1])
+            if eccentricity >= diameter:
+                diameter, farthest = eccentricity, node
+            total += sum(distances.values())
+            pairs += len(distances) - 1
+
+        if not exact and farthest is not None:
+            diameter = max(diameter, max(self._bfs(farthest).values()))
+
+        self._path_estimate = (diameter, total / pairs if pairs else 0.0, exact)
+        return self._path_estimate
@@ -0,0 +1,275 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+BINARY_MAGIC = b'RNET'
+BINARY_VERSION = 1
+BINARY_EXTENSION = '.rnet'
+_ALIGNMENT = 64
+
+
+def save_json(network, pos, filename):
+    """Save nodes, per-edge attributes and positions as indented JSON"""
+    data = {
+        'nodes': list(network.nodes()),
+        'edges': [(u, v, network[u][v]) for u, v in network.edges()],
+        'positions': {node: [float(c) for c in xy] for node, xy in (pos or {}).items()}
+    }
+    with open(filename, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_json(filename):
+    """Load a network saved by save_json; returns (network, positions)"""
+    import networkx as nx
+
+    with open(filename, 'r') as f:
+        data = json.load(f)
+
+    network = nx.Graph()
+    network.add_nodes_from(data['nodes'])
+
+    for u, v, attrs in data['edges']:
+        network.add_edge(u, v, **attrs)
+
+    return network, data.get('positions', {})
+
+
+class CompactNetwork:
+    """Read-only undirected network stored as CSR arrays.
+
+    indptr/indices/weights hold both directions of every edge (self-loops
+    once), positions is an (n, 2) array (NaN where unknown) and labels are
+    kept as one UTF-8 blob with an offset table. When opened with load_binary
+    the arrays are views into a memory map, so nothing is read until touched.
+    """
+
+    def __init__(self, indptr, indices, weights, positions, label_offsets, label_data,
+                 edge_count, edge_attrs=None, label_kind='str'):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.positions = positions
+        self.label_offsets = label_offsets
+        self.label_data = label_data
+        self.edge_count = edge_count
+        self.edge_attrs = edge_attrs or {}
+        self.label_kind = label_kind
+        self._labels = None
+        self._index = None
+
+    def number_of_nodes(self):
+        return len(self.indptr) - 1
+
+    def number_of_edges(self):
+        return self.edge_count
+
+    def label(self, i):
+        """Label of the node with internal index i"""
+        raw = bytes(self.label_data[self.label_offsets[i]:self.label_offsets[i + 1]]).decode('utf-8')
+        return int(raw) if self.label_kind == 'int' else raw
+
+    @property
+    def labels(self):
+        if self._labels is None:
+            blob = bytes(self.label_data).decode('utf-8')
+            offsets = self.label_offsets.tolist()
+            if len(blob) == len(self.label_data):
+                labels = [blob[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+            else:
+                labels = [self.label(i) for i in range(len(offsets) - 1)]
+            if self.label_kind == 'int':
+                labels = [int(label) for label in labels]
+            self._labels = labels
+        return self._labels
+
+    def index_of(self, label):
+        """Internal index of a node label"""
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index[label]
+
+    def neighbors(self, i):
+        """Internal indices adjacent to node i"""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def neighbor_weights(self, i):
+        """Weights of the edges leaving node i, aligned with neighbors(i)"""
+        return self.weights[self.indptr[i]:self.indptr[i + 1]]
+
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def position_dict(self):
+        """Positions keyed by label, skipping nodes without coordinates"""
+        coords = np.asarray(self.positions)
+        known = ~np.isnan(coords).any(axis=1)
+        labels = self.labels
+        return {labels[i]: (float(coords[i, 0]), float(coords[i, 1])) for i in np.flatnonzero(known)}
+
+    def to_networkx(self):
+        """Materialise an nx.Graph with weight and numeric edge attributes"""
+        import networkx as nx
+
+        labels = self.labels
+        sources = np.repeat(np.arange(self.number_of_nodes(), dtype=np.int64), self.degree())
+        keep = sources <= self.indices
+        src = sources[keep].tolist()
+        dst = np.asarray(self.indices[keep]).tolist()
+        attr_names = ['weight'] + list(self.edge_attrs)
+        columns = [np.asarray(self.weights[keep]).tolist()] + \
+                  [np.asarray(values[keep]).tolist() for values in self.edge_attrs.values()]
+
+        network = nx.Graph()
+        network.add_nodes_from(labels)
+        network.add_edges_from(
+            (labels[u], labels[v], {name: value for name, value in zip(attr_names, row) if value == value})
+            for u, v, *row in zip(src, dst, *columns)
+        )
+        return network
+
+    @classmethod
+    def from_networkx(cls, network, pos=None, weight='weight'):
+        """Pack an nx.Graph (and optional positions) into CSR arrays"""
+        nodes = list(network.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        n = len(nodes)
+
+        label_kind = _label_kind(nodes)
+        encoded = [str(node).encode('utf-8') for node in nodes]
+        label_offsets = np.zeros(n + 1, dtype=np.int64)
+        label_offsets[1:] = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        label_data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+        edges = list(network.edges(data=True))
+        numeric = [key for key in {k for _, _, attrs in edges for k in attrs}
+                   if key != weight and all(isinstance(attrs.get(key, 0), (int, float, np.number))
+                                            and not isinstance(attrs.get(key, 0), bool) for _, _, attrs in edges)]
+
+        us = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+        vs = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+        integral = all(isinstance(attrs.get(weight, 1), (int, np.integer)) for _, _, attrs in edges)
+        ws = np.fromiter((attrs.get(weight, 1) for _, _, attrs in edges),
+                         dtype=np.int64 if integral else np.float64, count=len(edges))
+        extra = {key: np.fromiter((attrs.get(key, np.nan) for _, _, attrs in edges), dtype=np.float64,
+                                  count=len(edges)) for key in sorted(numeric)}
+
+        indptr, indices, order = _csr_from_pairs(n, us, vs)
+        reverse = us != vs
+        both = lambda values: np.concatenate((values, values[reverse]))[order]
+
+        positions = np.full((n, 2), np.nan)
+        for node, xy in (pos or {}).items():
+            if node in index:
+                positions[index[node]] = xy[:2]
+
+        index_dtype = np.int32 if n < 2 ** 31 else np.int64
+        return cls(indptr, indices.astype(index_dtype), both(ws), positions, label_offsets, label_data,
+                   len(edges), {key: both(values) for key, values in extra.items()}, label_kind)
+
+
+def _label_kind(nodes):
+    """'int' or 'str', the one type every label must share to survive a round trip"""
+    kinds = {'int' if isinstance(node, (int, np.integer)) and not isinstance(node, (bool, np.bool_))
+             else 'str' if isinstance(node, str) else type(node).__name__ for node in nodes}
+    unsupported = kinds - {'int', 'str'}
+    if unsupported:
+        raise ValueError(f"Node labels must be int or str, not {', '.join(sorted(unsupported))}")
+    if len(kinds) > 1:
+        raise ValueError("Node labels must be all int or all str, not a mix")
+    return kinds.pop() if kinds else 'str'
+
+
+def _csr_from_pairs(n, us, vs):
+    """Symmetric CSR from undirected (u, v) pairs; also returns the sort order"""
+    reverse = us != vs
+    sources = np.concatenate((us, vs[reverse]))
+    targets = np.concatenate((vs, us[reverse]))
+    order = np.argsort(sources, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return indptr, targets[order], order
+
+
+def save_binary(compact, filename):
+    """Write a CompactNetwork as a header plus 64-byte aligned raw arrays"""
+    arrays = {
+        'indptr': compact.indptr,
+        'indices': compact.indices,
+        'weights': compact.weights,
+        'positions': compact.positions,
+        'label_offsets': compact.label_offsets,
+        'label_data': compact.label_data,
+    }
+    for key, values in compact.edge_attrs.items():
+        arrays[f'edge_attr:{key}'] = values
+
+    entries = []
+    offset = 0
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        entries.append({'name': name, 'dtype': values.dtype.str, 'shape': list(values.shape), 'offset': offset})
+        offset += values.nbytes
+
+    header = json.dumps({'version': BINARY_VERSION, 'directed': False, 'edges': int(compact.edge_count),
+                         'label_kind': compact.label_kind, 'arrays': entries}).encode('utf-8')
+    preamble = len(BINARY_MAGIC) + 4 + len(header)
+    data_start = -(-preamble // _ALIGNMENT) * _ALIGNMENT
+
+    with open(filename, 'wb') as f:
+        f.write(BINARY_MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for entry, values in zip(entries, arrays.values()):
+            f.write(b'\0' * (data_start + entry['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(values).tobytes())
+
+
+def load_binary(filename, mmap=True):
+    """Open a file written by save_binary; arrays are memory-mapped unless mmap=False"""
+    with open(filename, 'rb') as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{filename} is not a binary network file")
+        (header_len,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    if header.get('version') != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary network version {header.get('version')}")
+
+    preamble = len(BINARY_MAGIC) + 4 + header_len
+    data_start = -(-preamble // _ALIGNMENT) * _ALIGNMENT
+    if mmap and os.path.getsize(filename) > data_start:
+        buffer = np.memmap(filename, dtype=np.uint8, mode='r')
+    else:
+        with open(filename, 'rb') as f:
+            buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+    arrays = {}
+    for entry in header['arrays']:
+        dtype = np.dtype(entry['dtype'])
+        count = int(np.prod(entry['shape'], dtype=np.int64))
+        start = data_start + entry['offset']
+        arrays[entry['name']] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(entry['shape'])
+
+    edge_attrs = {name.split(':', 1)[1]: values for name, values in arrays.items() if name.startswith('edge_attr:')}
+    return CompactNetwork(arrays['indptr'], arrays['indices'], arrays['weights'], arrays['positions'],
+                          arrays['label_offsets'], arrays['label_data'], header['edges'], edge_attrs,
+                          header['label_kind'])
+
+
+def save_network_file(network, pos, filename):
+    """Save in the format implied by the extension (.rnet binary, otherwise JSON)"""
+    if filename.lower().endswith(BINARY_EXTENSION):
+        save_binary(CompactNetwork.from_networkx(network, pos), filename)
+    else:
+        save_json(network, pos, filename)
+
+
+def load_network_file(filename):
+    """Load either format by extension; returns (network, positions)"""
+    if filename.lower().endswith(BINARY_EXTENSION):
+        compact = load_binary(filename)
+        return compact.to_networkx(), compact.position_dict()
+    return load_json(filename)
@@ -0,0 +1,107 @@
+import numpy as np
+
+
+class PacketLayer:
+    """Animate many packets along their paths with a single scatter artist.
+
+    Every packet path is flattened into one coordinate array so the position
+    of all packets for a frame is a handful of NumPy operations, independent
+    of how many packets are in flight.
+    """
+
+    def __init__(self, ax, pos, frames_per_hop=10, color='yellow', size=120,
+                 edgecolor='black', linewidth=1.5, zorder=5):
+        self.ax = ax
+        self.pos = pos
+        self.frames_per_hop = max(1, int(frames_per_hop))
+        self.default_color = color
+
+        self._paths = []
+        self._colors = []
+        self._starts = []
+        self._speeds = []
+
+        self._coords = np.empty((0, 2))
+        self._offset = np.empty(0, dtype=np.intp)
+        self._hops = np.empty(0, dtype=np.intp)
+        self._t0 = np.empty(0)
+        self._rate = np.empty(0)
+
+        self.artist = ax.scatter([], [], s=size, c=color, edgecolors=edgecolor,
+                                 linewidths=linewidth, zorder=zorder, animated=True)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def add_packet(self, path, start_frame=0, speed=1.0, color=None):
+        """Queue a packet to travel along path, starting at start_frame"""
+        if not path or len(path) < 2:
+            return
+        self._paths.append([self.pos[node] for node in path])
+        self._colors.append(color or self.default_color)
+        self._starts.append(start_frame)
+        self._speeds.append(speed)
+
+    def clear(self):
+        """Remove all packets"""
+        self._paths.clear()
+        self._colors.clear()
+        self._starts.clear()
+        self._speeds.clear()
+        self.build()
+
+    def build(self):
+        """Pack the queued paths into flat arrays used by every frame"""
+        if self._paths:
+            lengths = np.fromiter((len(p) for p in self._paths), dtype=np.intp, count=len(self._paths))
+            self._coords = np.asarray([xy for p in self._paths for xy in p], dtype=float)
+            self._offset = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            self._hops = lengths - 1
+        else:
+            self._coords = np.empty((0, 2))
+            self._offset = np.empty(0, dtype=np.intp)
+            self._hops = np.empty(0, dtype=np.intp)
+        self._t0 = np.asarray(self._starts, dtype=float)
+        self._rate = np.asarray(self._speeds, dtype=float) / self.frames_per_hop
+
+        self.artist.set_offsets(np.full((len(self._paths), 2), np.nan))
+        if self._paths:
+            self.artist.set_facecolors(self._colors)
+
+    @property
+    def total_frames(self):
+        """Number of frames until the last packet reaches its destination"""
+        if not len(self._hops):
+            return 0
+        return int(np.ceil(np.max(self._t0 + self._hops / self._rate))) + 1
+
+    def offsets_at(self, frame):
+        """Positions of all packets at frame; packets not in flight are NaN"""
+        progress = (frame - self._t0) * self._rate
+        hop = np.clip(np.floor(progress).astype(np.intp), 0, np.maximum(self._hops - 1, 0))
+        frac = np.clip(progress - hop, 0.0, 1.0)[:, None]
+
+        a = self._coords[self._offset + hop]
+        b = self._coords[self._offset + hop + 1]
+        offsets = a + (b - a) * frac
+
+        offsets[(progress < 0) | (progress > self._hops)] = np.nan
+        return offsets
+
+    def init_frame(self):
+        """FuncAnimation init_func: hide all packets"""
+        self.artist.set_offsets(np.full((len(self._paths), 2), np.nan))
+        return self.artist,
+
+    def update(self, frame):
+        """FuncAnimation func: move every packet to its position for frame"""
+        if len(self._paths):
+            self.artist.set_offsets(self.offsets_at(frame))
+        return self.artist,
+
+    def remove(self):
+        """Detach the scatter artist from its axes"""
+        try:
+            self.artist.remove()
+        except (ValueError, NotImplementedError):
+            pass
@@ -0,0 +1,133 @@
+"""Multi-objective routing: the Pareto front of paths over several edge metrics.
+
+Each objective is an edge attribute summed along the path ('hops' counts
+edges); edges missing an attribute count 1 for it. A path is on the front
+when no other path is at least as good on every objective.
+"""
+import heapq
+from collections import deque
+
+OBJECTIVES = ('weight', 'latency', 'hops')
+OBJECTIVE_NAMES = {'weight': "Cost", 'latency': "Latency", 'hops': "Hops"}
+
+
+def edge_costs(attrs, objectives=OBJECTIVES):
+    return tuple(1 if objective == 'hops' else attrs.get(objective, 1) for objective in objectives)
+
+
+def _covered(costs, labels):
+    """True when some label is at least as good as costs on every objective"""
+    for other in labels:
+        for mine, theirs in zip(costs, other):
+            if theirs > mine:
+                break
+        else:
+            return True
+    return False
+
+
+def lower_bounds(network, destination, objectives=OBJECTIVES):
+    """Per objective, the single-objective distance from every node to destination"""
+    import networkx as nx
+
+    bounds = []
+    for objective in objectives:
+        if objective == 'hops':
+            distances = {destination: 0}
+            queue = deque([destination])
+            while queue:
+                node = queue.popleft()
+                for neighbor in network[node]:
+                    if neighbor not in distances:
+                        distances[neighbor] = distances[node] + 1
+                        queue.append(neighbor)
+        else:
+            distances = nx.single_source_dijkstra_path_length(
+                network, destination, weight=lambda u, v, attrs, key=objective: attrs.get(key, 1))
+        bounds.append(distances)
+    return {node: tuple(distances[node] for distances in bounds) for node in bounds[0]}
+
+
+class ParetoPath:
+    """One non-dominated path and its objective totals"""
+    __slots__ = ('path', 'costs', 'objectives')
+
+    def __init__(self, path, costs, objectives):
+        self.path = path
+        self.costs = costs
+        self.objectives = objectives
+
+    def as_dict(self):
+        return dict(zip(self.objectives, self.costs))
+
+    def describe(self):
+        return ", ".join(f"{OBJECTIVE_NAMES.get(name, name)} {value:g}"
+                         for name, value in zip(self.objectives, self.costs))
+
+
+def pareto_paths(network, source, destination, objectives=OBJECTIVES, max_labels=None, stats=None):
+    """Pareto front of source-destination paths, sorted lexicographically by objectives.
+
+    Multi-criteria label setting: labels (cost vectors with a parent link)
+    are settled in lexicographic order, so a settled label is never beaten
+    later. A label is dropped when a settled label at its node is at least as
+    good, or when its costs plus the single-objective distances to the
+    destination are already matched by a path on the front. With max_labels,
+    each node settles at most that many labels, which bounds the work on
+    large graphs at the price of possibly missing some trade-offs.
+    """
+    if source not in network or destination not in network:
+        return []
+    bounds = lower_bounds(network, destination, objectives)
+    if source not in bounds:
+        return []
+
+    zero = (0,) * len(objectives)
+    label_nodes = [source]
+    label_parents = [-1]
+    heap = [(zero, 0)]
+    settled = {}
+    front = []
+    front_labels = []
+    pushed = 1
+
+    while heap:
+        costs, label = heapq.heappop(heap)
+        node = label_nodes[label]
+        node_labels = settled.setdefault(node, [])
+        if _covered(costs, node_labels) or (max_labels and len(node_labels) >= max_labels):
+            continue
+        node_labels.append(costs)
+        if node == destination:
+            front.append(costs)
+            front_labels.append(label)
+            continue
+        if front and _covered(tuple(c + b for c, b in zip(costs, bounds[node])), front):
+            continue
+
+        for neighbor, attrs in network[node].items():
+            bound = bounds.get(neighbor)
+            if bound is None:
+                continue
+            extended = tuple(c + e for c, e in zip(costs, edge_costs(attrs, objectives)))
+            if _covered(extended, settled.get(neighbor, ())):
+                continue
+            if front and _covered(tuple(c + b for c, b in zip(extended, bound)), front):
+                continue
+            label_nodes.append(neighbor)
+            label_parents.append(label)
+            heapq.heappush(heap, (extended, len(label_nodes) - 1))
+            pushed += 1
+
+    if stats is not None:
+        stats['labels'] = pushed
+        stats['settled'] = sum(len(labels) for labels in settled.values())
+
+    results = []
+    for costs, label in zip(front, front_labels):
+        path = []
+        while label >= 0:
+            path.append(label_nodes[label])
+            label = label_parents[label]
+        results.append(ParetoPath(path[::-1], costs, objectives))
+    return results
@@ -0,0 +1,118 @@
+import networkx as nx
+from matplotlib import colormaps
+from matplotlib.lines import Line2D
+
+FIGURE_BG = '#1a1a2e'
+AXES_BG = '#16213e'
+SOURCE_COLOR = '#00ff88'
+DESTINATION_COLOR = '#ff6b6b'
+NODE_COLOR = '#00d4ff'
+EDGE_COLOR = '#4a90e2'
+EDGE_LABEL_COLOR = '#ffeb3b'
+CENTRALITY_CMAP = 'plasma'
+
+
+def draw_network_on(ax, network, pos, source=None, destination=None, node_size=500, centrality=None):
+    """Draw the network on ax with the simulator's modern styling
+
+    centrality (a BetweennessResult) scales nodes by betweenness and colors
+    edges by edge betweenness.
+    """
+    ax.clear()
+    ax.set_facecolor(AXES_BG)
+
+    # Node colors with gradient effect
+    node_colors = []
+    for node in network.nodes():
+        if node == source:
+            node_colors.append(SOURCE_COLOR)  # Bright green for source
+        elif node == destination:
+            node_colors.append(DESTINATION_COLOR)  # Bright red for destination
+        else:
+            node_colors.append(NODE_COLOR)  # Cyan for regular nodes
+
+    # Betweenness overlay: node area grows with the share of shortest paths through it
+    node_sizes = node_size
+    if centrality is not None:
+        top = max(centrality.nodes.values(), default=0) or 1
+        node_sizes = [node_size * (0.4 + 2.6 * centrality.nodes.get(node, 0) / top) for node in network.nodes()]
+
+    # Draw nodes with enhanced styling
+    nx.draw_networkx_nodes(network, pos,
+                           node_color=node_colors,
+                           node_size=node_sizes,
+                           alpha=0.9,
+                           linewidths=2,
+                           edgecolors='white',
+                           ax=ax)
+
+    # Draw edges with varied thickness based on weight
+    edges = network.edges()
+    weights = [network[u][v].get('weight', 1) for u, v in edges]
+    max_weight = max(weights) if weights else 1
+    edge_widths = [2 + 3 * (w / max_weight) for w in weights]
+
+    if centrality is None:
+        nx.draw_networkx_edges(network, pos,
+                               edge_color=EDGE_COLOR,
+                               width=edge_widths,
+                               alpha=0.6,
+                               ax=ax)
+    else:
+        nx.draw_networkx_edges(network, pos,
+                               edge_color=[centrality.edge(u, v) for u, v in edges],
+                               edge_cmap=colormaps[CENTRALITY_CMAP],
+                               width=edge_widths,
+                               alpha=0.8,
+                               ax=ax)
+
+    # Draw labels with better visibility
+    nx.draw_networkx_labels(network, pos,
+                            font_size=10,
+                            font_color='white',
+                            font_weight='bold',
+                            ax=ax)
+
+    # Draw edge labels (weights)
+    edge_labels = nx.get_edge_attributes(network, 'weight')
+    nx.draw_networkx_edge_labels(network, pos,
+                                 edge_labels=edge_labels,
+                                 font_size=8,
+                                 font_color=EDGE_LABEL_COLOR,
+                                 bbox=dict(boxstyle="round,pad=0.2",
+                                           facecolor='black', alpha=0.7),
+                                 ax=ax)
+
+    # Add grid and styling
+    ax.grid(True, alpha=0.2, color='white')
+    ax.set_title(f"Network Topology ({len(network.nodes())} nodes, {len(network.edges())} edges)",
+                 fontsize=14, color='white', weight='bold', pad=20)
+
+    # Remove axes
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+    # Add legend for node types
+    legend_elements = [
+        Line2D([0], [0], marker='o', color='w', markerfacecolor=SOURCE_COLOR,
+               markersize=10, label='Source'),
+        Line2D([0], [0], marker='o', color='w', markerfacecolor=DESTINATION_COLOR,
+               markersize=10, label='Destination'),
+        Line2D([0], [0], marker='o', color='w', markerfacecolor=NODE_COLOR,
+               markersize=10, label='Regular Node')
+    ]
+    ax.legend(handles=legend_elements, loc='upper right',
+              facecolor=AXES_BG, edgecolor='white',
+              labelcolor='white', fontsize=9)
+
+
+def draw_path_on(ax, network, pos, path, color):
+    """Highlight a path's edges on ax"""
+    path_edges = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
+    nx.draw_networkx_edges(network, pos, edgelist=path_edges,
+                           edge_color=color, width=5, alpha=0.8, ax=ax)
+
+
+def set_title(ax, title):
+    """Set an axes title in the simulator's heading style"""
+    ax.set_title(title, fontsize=14, color='white', weight='bold')
@@ -0,0 +1,211 @@
+"""Columnar store for route query results.
+
+Each column is a typed array (node and algorithm names are interned to
+ids), and paths are concatenated into one array of node ids with offsets.
+A 100,000-row batch with long paths then costs a few megabytes rather than
+a tuple and list per row. Sorting returns an order of row indices, cached
+until the next append, so views can page through it without copying rows.
+"""
+import math
+import threading
+from array import array
+
+COLUMNS = ('source', 'destination', 'algorithm', 'cost', 'hops', 'time_ms', 'path')
+HEADINGS = {'source': "Source", 'destination': "Dest", 'algorithm': "Algorithm", 'cost': "Cost",
+            'hops': "Hops", 'time_ms': "Time (ms)", 'path': "Path"}
+
+
+def path_preview(path, limit=6):
+    """Path joined with arrows; longer paths keep their ends and the hop count"""
+    if not path:
+        return "-"
+    if len(path) <= limit:
+        return ' → '.join(map(str, path))
+    head = ' → '.join(map(str, path[:limit - 2]))
+    return f"{head} → … → {path[-1]} ({len(path) - 1} hops)"
+
+
+def _natural_key(label):
+    text = str(label)
+    return (0, int(text), '') if text.isdigit() else (1, 0, text)
+
+
+class ResultStore:
+    """Route query results, one typed array per column"""
+
+    def __init__(self):
+        self.labels = []
+        self.label_ids = {}
+        self.algorithms = []
+        self.algorithm_ids = {}
+        self.sources = array('i')
+        self.destinations = array('i')
+        self.algorithm_column = array('i')
+        self.costs = array('d')
+        self.hops = array('i')
+        self.times = array('d')
+        self.path_nodes = array('i')
+        self.path_starts = array('q', [0])
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.sources)
+
+    def _label_id(self, node):
+        label_id = self.label_ids.get(node)
+        if label_id is None:
+            label_id = self.label_ids[node] = len(self.labels)
+            self.labels.append(node)
+        return label_id
+
+    def append(self, source, destination, algorithm, path, cost, seconds):
+        """Add one result; path None (with any cost) means no route was found"""
+        algorithm_id = self.algorithm_ids.get(algorithm)
+        if algorithm_id is None:
+            algorithm_id = self.algorithm_ids[algorithm] = len(self.algorithms)
+            self.algorithms.append(algorithm)
+
+        self.sources.append(self._label_id(source))
+        self.destinations.append(self._label_id(destination))
+        self.algorithm_column.append(algorithm_id)
+        self.costs.append(cost if path else math.inf)
+        self.hops.append(len(path) - 1 if path else -1)
+        self.times.append(seconds * 1000)
+        if path:
+            self.path_nodes.extend(self._label_id(node) for node in path)
+        self.path_starts.append(len(self.path_nodes))
+        self._orders.clear()
+
+    def extend(self, other):
+        """Append every row of another store, column by column"""
+        labels = [self._label_id(label) for label in other.labels]
+        algorithms = []
+        for name in other.algorithms:
+            if name not in self.algorithm_ids:
+                self.algorithm_ids[name] = len(self.algorithms)
+                self.algorithms.append(name)
+            algorithms.append(self.algorithm_ids[name])
+
+        self.sources.extend(map(labels.__getitem__, other.sources))
+        self.destinations.extend(map(labels.__getitem__, other.destinations))
+        self.algorithm_column.extend(map(algorithms.__getitem__, other.algorithm_column))
+        self.costs.extend(other.costs)
+        self.hops.extend(other.hops)
+        self.times.extend(other.times)
+        offset = len(self.path_nodes)
+        if labels == list(range(len(labels))):
+            # Ids already agree, as when the first batch goes into an empty store
+            self.path_nodes.extend(other.path_nodes)
+        else:
+            self.path_nodes.extend(map(labels.__getitem__, other.path_nodes))
+        self.path_starts.extend(offset + start for start in other.path_starts[1:])
+        self._orders.clear()
+
+    def clear(self):
+        self.__init__()
+
+    def path(self, index):
+        """Full path of a row as node labels, or None"""
+        start, end = self.path_starts[index], self.path_starts[index + 1]
+        if start == end:
+            return None
+        labels = self.labels
+        return [labels[node] for node in self.path_nodes[start:end]]
+
+    def row(self, index, limit=6):
+        """Display values for a row, with a shortened path"""
+        start, end = self.path_starts[index], self.path_starts[index + 1]
+        labels, nodes = self.labels, self.path_nodes
+        # Only the shown nodes are looked up, however long the path
+        if start == end:
+            preview = "-"
+        elif end - start <= limit:
+            preview = ' → '.join(str(labels[node]) for node in nodes[start:end])
+        else:
+            head = ' → '.join(str(labels[node]) for node in nodes[start:start + limit - 2])
+            preview = f"{head} → … → {labels[nodes[end - 1]]} ({end - start - 1} hops)"
+        found = end > start
+        return (labels[self.sources[index]], labels[self.destinations[index]],
+                self.algorithms[self.algorithm_column[index]],
+                f"{self.costs[index]:g}" if found else "-", self.hops[index] if found else "-",
+                f"{self.times[index]:.3f}", preview)
+
+    def order(self, column=None, descending=False):
+        """Row indices sorted by column (insertion order for None); cached until the next append"""
+        key = (column, descending)
+        cached = self._orders.get(key)
+        if cached is not None:
+            return cached
+
+        count = len(self)
+        if column is None:
+            indices = list(range(count))
+            if descending:
+                indices.reverse()
+        else:
+            if column in ('source', 'destination', 'algorithm'):
+                names = self.algorithms if column == 'algorithm' else self.labels
+                ranks = [0] * len(names)
+                for rank, name_id in enumerate(sorted(range(len(names)), key=lambda i: _natural_key(names[i]))):
+                    ranks[name_id] = rank
+                values = {'source': self.sources, 'destination': self.destinations,
+                          'algorithm': self.algorithm_column}[column]
+                keys = [ranks[value] for value in values]
+            elif column == 'path':
+                keys = self.hops
+            else:
+                keys = {'cost': self.costs, 'hops': self.hops, 'time_ms': self.times}[column]
+            indices = sorted(range(count), key=keys.__getitem__, reverse=descending)
+        self._orders[key] = indices
+        return indices
+
+    def as_dicts(self):
+        """Rows as dicts in insertion order, for export"""
+        for index in range(len(self)):
+            found = self.hops[index] >= 0
+            yield {'source': self.labels[self.sources[index]],
+                   'destination': self.labels[self.destinations[index]],
+                   'algorithm': self.algorithms[self.algorithm_column[index]],
+                   'found': found, 'cost': self.costs[index] if found else None,
+                   'hops': self.hops[index] if found else None,
+                   'time_ms': self.times[index], 'path': self.path(index)}
+
+
+class QueryBatchJob(threading.Thread):
+    """Route random node pairs with several algorithms on a background thread into a new ResultStore"""
+
+    def __init__(self, network, pairs, algorithm_keys, pos=None):
+        super().__init__(daemon=True)
+        self.network = network
+        self.pairs = pairs
+        self.algorithm_keys = algorithm_keys
+        self.pos = pos
+        self.fraction = 0.0
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        import routing
+
+        try:
+            store = ResultStore()
+            total = len(self.pairs)
+            for done, (source, destination) in enumerate(self.pairs):
+                if self.cancel_event.is_set():
+                    break
+                for key in self.algorithm_keys:
+                    name = routing.ALGORITHM_KEYS[key][0]
+                    path, seconds = routing.timed_path(key, self.network, source, destination, self.pos)
+                    cost = routing.path_cost(self.network, path) if path else 0
+                    store.append(source, destination, name, path, cost, seconds)
+                self.fraction = (done + 1) / total
+            self.result = store
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def cancel(self):
+        self.cancel_event.set()
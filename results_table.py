@@ -0,0 +1,97 @@
+"""Virtual, sortable Treeview over a ResultStore.
+
+The Treeview only ever holds one page of items. Scrolling rewrites their
+values from the store's cached sort order, so the cost of a refresh depends
+on the page height and not on the number of results.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from result_store import COLUMNS, HEADINGS
+
+WIDTHS = {'source': 55, 'destination': 55, 'algorithm': 85, 'cost': 60, 'hops': 45, 'time_ms': 70, 'path': 260}
+
+
+class ResultsTable(tk.Frame):
+    """Paged view of a ResultStore; click a heading to sort, double-click a row to open it"""
+
+    def __init__(self, parent, store, rows=15, on_open=None, **options):
+        super().__init__(parent, **options)
+        self.store = store
+        self.rows = rows
+        self.on_open = on_open
+        self.first = 0
+        self.sort_column = None
+        self.descending = False
+
+        self.tree = ttk.Treeview(self, columns=COLUMNS, show='headings', height=rows, selectmode='browse')
+        for column in COLUMNS:
+            self.tree.heading(column, text=HEADINGS[column], command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=WIDTHS[column], stretch=column == 'path', anchor='w')
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.on_scrollbar)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        # Scrolling is ours: the Treeview never holds more than one page
+        self.tree.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-1, 'units'))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(1, 'units'))
+        self.tree.bind('<Prior>', lambda event: self.scroll(-1, 'pages'))
+        self.tree.bind('<Next>', lambda event: self.scroll(1, 'pages'))
+        self.tree.bind('<Double-1>', self.on_double_click)
+
+        self.items = [self.tree.insert('', 'end', values=()) for _ in range(rows)]
+        self.indices = [None] * rows
+        self.refresh()
+
+    def sort_by(self, column):
+        """Sort on column; clicking the same heading again reverses the order"""
+        if self.sort_column == column:
+            self.descending = not self.descending
+        else:
+            self.sort_column, self.descending = column, False
+        for name in COLUMNS:
+            arrow = (" ▼" if self.descending else " ▲") if name == column else ""
+            self.tree.heading(name, text=HEADINGS[name] + arrow)
+        self.first = 0
+        self.refresh()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.first = int(float(amount) * len(self.store))
+            self.refresh()
+        else:
+            self.scroll(int(amount), unit)
+
+    def scroll(self, amount, unit):
+        self.first += amount * (self.rows - 1 if unit == 'pages' else 1)
+        self.refresh()
+        return 'break'
+
+    def refresh(self):
+        """Fill the visible page from the store; call after the store changes"""
+        store = self.store
+        total = len(store)
+        self.first = max(0, min(self.first, total - self.rows))
+        order = store.order(self.sort_column, self.descending)
+        for slot, item in enumerate(self.items):
+            position = self.first + slot
+            if position < total:
+                index = order[position]
+                self.indices[slot] = index
+                self.tree.item(item, values=store.row(index))
+            else:
+                self.indices[slot] = None
+                self.tree.item(item, values=())
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def on_double_click(self, event):
+        item = self.tree.identify_row(event.y)
+        if not item or self.on_open is None:
+            return
+        index = self.indices[self.items.index(item)]
+        if index is not None:
+            self.on_open(index)
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+
+class LRUCache(OrderedDict):
+    """OrderedDict bounded to maxsize entries, evicting the least recently used"""
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def lookup(self, key):
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def store(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class RouteCache:
+    """Route results memoized on (graph version, algorithm, source, destination, weight).
+
+    Every graph mutation calls invalidate(), which bumps the version so no
+    result computed on an older graph can ever be returned.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.entries = LRUCache(maxsize)
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, algorithm, source, destination, weight='weight'):
+        return (self.version, algorithm, source, destination, weight)
+
+    def lookup(self, algorithm, source, destination, weight='weight'):
+        """Cached entry, or None (counted as a miss)"""
+        entry = self.entries.lookup(self.key(algorithm, source, destination, weight))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, algorithm, source, destination, entry, weight='weight'):
+        self.entries.store(self.key(algorithm, source, destination, weight), entry)
+
+    def invalidate(self):
+        """Forget every result; called whenever the graph changes"""
+        self.version += 1
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
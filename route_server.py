@@ -0,0 +1,405 @@
+"""Local route query service speaking line-delimited JSON.
+
+Each request line is a JSON object such as
+    {"id": 7, "source": "1", "destination": "9", "algorithm": "dijkstra"}
+and is answered with one JSON line carrying the same id. {"op": "stats"}
+returns cache counters and {"op": "ping"} checks liveness.
+
+Queries arriving within a short batching window are grouped by algorithm
+and source. BFS and Dijkstra compute one routing table per source (a
+predecessor map) that answers every destination and stays cached for the
+current graph version; other algorithms are cached per pair. All searches
+run in an executor so the event loop only parses and routes messages. A
+network without node positions is only laid out when the first A* or JPS
+query arrives:
+
+    python route_server.py --generate random --nodes 500 --edges 2000 --port 8765
+    python route_server.py --network topology.rnet --bench 20000
+"""
+import argparse
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from cli import add_network_arguments, prepare_network
+from generators import compute_layout
+from route_cache import LRUCache
+from routing import ALGORITHM_KEYS, POSITIONED, find_path, path_cost
+
+TABLE_ALGORITHMS = ("bfs", "dijkstra")
+
+_worker_network = None
+_worker_pos = None
+
+
+def _init_worker(network, pos):
+    global _worker_network, _worker_pos
+    _worker_network, _worker_pos = network, pos
+
+
+def _routing_table(network, algorithm, source):
+    """Predecessor map {node: parent} of the BFS or Dijkstra tree rooted at source"""
+    import networkx as nx
+
+    if algorithm == "dijkstra":
+        pred, _ = nx.dijkstra_predecessor_and_distance(network, source, weight='weight')
+    else:
+        pred = nx.predecessor(network, source)
+    return {node: parents[0] if parents else None for node, parents in pred.items()}
+
+
+def _solve_batch(jobs, network=None, pos=None):
+    """Executor entry point: jobs are ('table', algorithm, source) or ('pair', algorithm, source, destination)"""
+    if network is None:
+        network, pos = _worker_network, _worker_pos
+
+    results = []
+    for job in jobs:
+        if job[0] == 'table':
+            _, algorithm, source = job
+            results.append(_routing_table(network, algorithm, source))
+        else:
+            _, algorithm, source, destination = job
+            results.append(find_path(algorithm, network, source, destination, pos))
+    return results
+
+
+def path_from_table(table, destination):
+    """Walk a predecessor map back from destination; None if unreachable"""
+    if destination not in table:
+        return None
+    path = []
+    node = destination
+    while node is not None:
+        path.append(node)
+        node = table[node]
+    return path[::-1]
+
+
+class RouteService:
+    """Batches route queries per graph version and answers them from cached tables"""
+
+    def __init__(self, network, pos=None, executor='process', workers=None,
+                 batch_window=0.002, max_batch=256, table_size=1024, pair_cache_size=65536, layout=None):
+        self.executor_kind = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.tables = LRUCache(table_size)
+        self.pairs = LRUCache(pair_cache_size)
+        self.pending = []
+        self.inflight = {}
+        self.clients = set()
+        self.flush_handle = None
+        self.stats = {'queries': 0, 'hits': 0, 'misses': 0, 'coalesced': 0, 'batches': 0}
+        self.version = 0
+        self.network = None
+        self.pos = None
+        self.executor = None
+        # layout(network) -> positions, run on the first positioned query when pos is empty
+        self.layout = layout
+        self.layout_task = None
+        self.set_network(network, pos)
+
+    def set_network(self, network, pos=None):
+        """Swap in a new graph: bumps the version, drops caches and restarts the executor"""
+        self.network = network
+        self.pos = pos or {}
+        self.layout_task = None
+        self.version += 1
+        self.tables.clear()
+        self.pairs.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        if self.executor_kind == 'process':
+            # Spawned workers do not inherit client sockets, which would keep connections half-open
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                initargs=(network, self.pos),
+                                                mp_context=multiprocessing.get_context('spawn'))
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def _answer(self, source, destination, algorithm, path, cached):
+        return {
+            'source': source,
+            'destination': destination,
+            'algorithm': ALGORITHM_KEYS[algorithm][0],
+            'path': path,
+            'cost': path_cost(self.network, path) if path else None,
+            'hops': len(path) - 1 if path else None,
+            'cached': cached,
+            'version': self.version,
+        }
+
+    def _cached_path(self, algorithm, source, destination):
+        """(True, path) when the cache can answer, otherwise (False, None)"""
+        if algorithm in TABLE_ALGORITHMS:
+            table = self.tables.lookup((self.version, algorithm, source))
+            if table is not None:
+                return True, path_from_table(table, destination)
+        else:
+            key = (self.version, algorithm, source, destination)
+            if key in self.pairs:
+                return True, self.pairs.lookup(key)
+        return False, None
+
+    async def query(self, source, destination, algorithm='dijkstra'):
+        """Resolve one route, from cache when possible, otherwise via the next batch"""
+        if algorithm not in ALGORITHM_KEYS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if source not in self.network or destination not in self.network:
+            raise KeyError(f"Unknown node: {source if source not in self.network else destination}")
+
+        if algorithm in POSITIONED and not self.pos and self.layout is not None:
+            await self._ensure_positions()
+
+        self.stats['queries'] += 1
+        hit, path = self._cached_path(algorithm, source, destination)
+        if hit:
+            self.stats['hits'] += 1
+            return self._answer(source, destination, algorithm, path, True)
+
+        # Queries needing a job that is already queued or running share its result
+        if algorithm in TABLE_ALGORITHMS:
+            key = (self.version, 'table', algorithm, source)
+        else:
+            key = (self.version, 'pair', algorithm, source, destination)
+        future = self.inflight.get(key)
+        if future is None:
+            self.stats['misses'] += 1
+            future = self.inflight[key] = asyncio.get_running_loop().create_future()
+            self._schedule(key)
+        else:
+            self.stats['coalesced'] += 1
+
+        result = await asyncio.shield(future)
+        path = path_from_table(result, destination) if key[1] == 'table' else result
+        return self._answer(source, destination, algorithm, path, False)
+
+    async def _ensure_positions(self):
+        """Lay the network out once, off the event loop; concurrent queries wait for the same layout"""
+        if self.layout_task is None:
+            self.layout_task = asyncio.ensure_future(self._compute_layout())
+        await asyncio.shield(self.layout_task)
+
+    async def _compute_layout(self):
+        network = self.network
+        pos = await asyncio.get_running_loop().run_in_executor(None, self.layout, network)
+        if network is self.network and not self.pos:
+            self.set_network(network, pos)
+
+    def _schedule(self, key):
+        self.pending.append(key)
+        if len(self.pending) >= self.max_batch:
+            self._flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+
+    def _flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        keys, self.pending = self.pending, []
+        if not keys:
+            return
+
+        # Spread the batch over the workers, one executor call per chunk
+        self.stats['batches'] += 1
+        chunks = max(1, min(self.workers, len(keys)))
+        for i in range(chunks):
+            asyncio.ensure_future(self._run_chunk(keys[i::chunks]))
+
+    async def _run_chunk(self, keys):
+        jobs = [key[1:] for key in keys]
+        loop = asyncio.get_running_loop()
+        try:
+            if self.executor_kind == 'process':
+                results = await loop.run_in_executor(self.executor, _solve_batch, jobs)
+            else:
+                results = await loop.run_in_executor(self.executor, _solve_batch, jobs, self.network, self.pos)
+        except Exception as e:
+            for key in keys:
+                future = self.inflight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, result in zip(keys, results):
+            version, kind = key[0], key[1]
+            if version == self.version:
+                cache = self.tables if kind == 'table' else self.pairs
+                cache.store((version,) + key[2:], result)
+            future = self.inflight.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    def precompute(self, sources=None, algorithm='dijkstra'):
+        """Warm routing tables for sources (all nodes by default) on the executor"""
+        sources = list(self.network.nodes()) if sources is None else list(sources)
+        loop = asyncio.get_running_loop()
+        futures = []
+        for source in sources:
+            key = (self.version, 'table', algorithm, source)
+            if key[:1] + key[2:] in self.tables:
+                continue
+            if key not in self.inflight:
+                self.inflight[key] = loop.create_future()
+                self._schedule(key)
+            futures.append(self.inflight[key])
+        return asyncio.gather(*futures)
+
+    async def handle_message(self, message):
+        """Answer one decoded request object"""
+        op = message.get('op', 'route')
+        if op == 'ping':
+            return {'ok': True, 'version': self.version}
+        if op == 'stats':
+            return dict(self.stats, tables=len(self.tables), pairs=len(self.pairs), version=self.version)
+        if op != 'route':
+            raise ValueError(f"Unknown op: {op}")
+        return await self.query(str(message['source']), str(message['destination']),
+                                message.get('algorithm', 'dijkstra'))
+
+
+async def _respond(service, writer, line):
+    try:
+        message = json.loads(line)
+    except ValueError:
+        message = None
+    # Valid JSON that is not an object (5, [1], "x") is no more a request than malformed JSON
+    if not isinstance(message, dict):
+        writer.write(b'{"error": "invalid JSON"}\n')
+        return
+    try:
+        reply = await service.handle_message(message)
+    except Exception as e:
+        reply = {'error': str(e)}
+    if 'id' in message:
+        reply['id'] = message['id']
+    writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+
+async def _serve_client(service, reader, writer):
+    service.clients.add(asyncio.current_task())
+    tasks = set()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.ensure_future(_respond(service, writer, line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            if writer.transport.get_write_buffer_size() > 1 << 20:
+                await writer.drain()
+        if tasks:
+            await asyncio.gather(*tasks)
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        service.clients.discard(asyncio.current_task())
+        writer.close()
+
+
+async def start_server(service, host='127.0.0.1', port=8765, unix_path=None):
+    """Start listening on a local TCP port or Unix socket"""
+    handler = lambda reader, writer: _serve_client(service, reader, writer)
+    if unix_path:
+        return await asyncio.start_unix_server(handler, path=unix_path)
+    return await asyncio.start_server(handler, host=host, port=port)
+
+
+async def run_load_test(host, port, nodes, count, algorithm='dijkstra', concurrency=64, unix_path=None):
+    """Pipeline count random queries over one connection; returns queries per second"""
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    sources = random.sample(nodes, min(len(nodes), max(1, concurrency)))
+    requests = [{'id': i, 'source': random.choice(sources), 'destination': random.choice(nodes),
+                 'algorithm': algorithm} for i in range(count)]
+
+    async def send():
+        for request in requests:
+            writer.write(json.dumps(request).encode('utf-8') + b'\n')
+            if writer.transport.get_write_buffer_size() > 1 << 16:
+                await writer.drain()
+        await writer.drain()
+
+    start = time.perf_counter()
+    sender = asyncio.ensure_future(send())
+    errors = 0
+    for _ in range(count):
+        reply = json.loads(await reader.readline())
+        errors += 'error' in reply
+    elapsed = time.perf_counter() - start
+    await sender
+    writer.close()
+    await writer.wait_closed()
+    return count / elapsed, errors
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve route queries over line-delimited JSON")
+    add_network_arguments(parser)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--executor', choices=('process', 'thread'), default='process')
+    parser.add_argument('--workers', type=int, help="executor workers (default: CPU count)")
+    parser.add_argument('--precompute', action='store_true', help="build Dijkstra tables for every node at startup")
+    parser.add_argument('--bench', type=int, metavar='N', help="run N queries from a local client and exit")
+    return parser
+
+
+async def _main(args):
+    network, pos = prepare_network(args, need_positions=False)
+    layout = None if args.layout == 'none' else functools.partial(compute_layout, layout_type=args.layout)
+    service = RouteService(network, pos, executor=args.executor, workers=args.workers, layout=layout)
+    server = await start_server(service, args.host, args.port, args.unix)
+    try:
+        if args.precompute:
+            await service.precompute()
+        if args.bench:
+            qps, errors = await run_load_test(args.host, server.sockets[0].getsockname()[1] if not args.unix else None,
+                                              [str(node) for node in network.nodes()], args.bench,
+                                              unix_path=args.unix)
+            print(f"{args.bench} queries: {qps:.0f} queries/s, {errors} errors, stats {service.stats}")
+            return
+        print(f"Serving routes for {network.number_of_nodes()} nodes on "
+              f"{args.unix or f'{args.host}:{args.port}'}", file=sys.stderr)
+        await server.serve_forever()
+    finally:
+        server.close()
+        await server.wait_closed()
+        if service.clients:
+            await asyncio.wait(service.clients, timeout=1)
+        service.close()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import math
+import time
+
+import networkx as nx
+
+
+def bfs_path(network, source, destination):
+    """Breadth-First Search pathfinding"""
+    try:
+        return nx.shortest_path(network, source=source, target=destination)
+    except nx.NetworkXNoPath:
+        return None
+
+
+def dfs_path(network, source, destination):
+    """Depth-First Search pathfinding"""
+    visited = {source}
+    stack = [source]
+    parent = {source: None}
+
+    while stack:
+        node = stack.pop()
+        if node == destination:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            return path[::-1]
+
+        for neighbor in network.neighbors(node):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                stack.append(neighbor)
+                parent[neighbor] = node
+    return None
+
+
+def dijkstra_path(network, source, destination):
+    """Dijkstra's shortest path algorithm"""
+    try:
+        return nx.dijkstra_path(network, source=source, target=destination, weight='weight')
+    except nx.NetworkXNoPath:
+        return None
+
+
+def bellman_ford_path(network, source, destination):
+    """Bellman-Ford shortest path algorithm"""
+    try:
+        return nx.bellman_ford_path(network, source=source, target=destination, weight='weight')
+    except nx.NetworkXNoPath:
+        return None
+
+
+def heuristic_scale(network, pos, weight='weight'):
+    """Largest factor k with weight >= k * Euclidean length on every edge (0 without positions).
+
+    k times the straight-line distance then never overestimates a route, so
+    A* stays admissible; on geometric networks, where weights are lengths,
+    k is 1. The scan is cached on the graph per positions mapping; call
+    forget_search_caches after changing weights or positions.
+    """
+    if not pos:
+        return 0.0
+    cached = network.graph.get('heuristic_scale')
+    if cached is not None and cached[0] == id(pos):
+        return cached[1]
+
+    scale = math.inf
+    for u, v, attrs in network.edges(data=True):
+        if u in pos and v in pos:
+            length = math.dist(pos[u][:2], pos[v][:2])
+            if length > 0:
+                scale = min(scale, attrs.get(weight, 1) / length)
+    scale = 0.0 if scale == math.inf else max(scale, 0.0)
+    network.graph['heuristic_scale'] = (id(pos), scale)
+    return scale
+
+
+def negative_weight(network, weight='weight'):
+    """First link (u, v, weight) with a negative weight, or None.
+
+    Cached on the graph like heuristic_scale; call forget_search_caches
+    after changing weights.
+    """
+    graph = network.graph
+    if 'negative_weight' not in graph:
+        graph['negative_weight'] = next(((u, v, w) for u, v, w in network.edges(data=weight, default=1) if w < 0),
+                                        None)
+    return graph['negative_weight']
+
+
+def forget_search_caches(network):
+    """Drop the cached heuristic scale, negative weight scan and grid index after the network changes"""
+    network.graph.pop('heuristic_scale', None)
+    network.graph.pop('negative_weight', None)
+    network.graph.pop('grid_index', None)
+
+
+def euclidean_heuristic(pos, scale=1.0):
+    """A* heuristic: scale times the straight-line distance; zero when positions are missing"""
+    def heuristic(u, v):
+        if scale and pos and u in pos and v in pos:
+            x1, y1 = pos[u][:2]
+            x2, y2 = pos[v][:2]
+            return scale * math.hypot(x1 - x2, y1 - y2)
+        return 0
+
+    return heuristic
+
+
+def astar_path(network, source, destination, pos=None):
+    """A* pathfinding algorithm"""
+    heuristic = euclidean_heuristic(pos, heuristic_scale(network, pos))
+    try:
+        return nx.astar_path(network, source, destination, heuristic=heuristic, weight='weight')
+    except nx.NetworkXNoPath:
+        return None
+
+
+def jps_path(network, source, destination, pos=None):
+    """Jump point search on uniform-cost grids; A* on any other network"""
+    from jps import grid_index, jump_point_search
+
+    index = grid_index(network)
+    if index is None:
+        return astar_path(network, source, destination, pos)
+    return jump_point_search(index, source, destination)
+
+
+# (display name, key, function); key matches the GUI color and checkbox names
+ALGORITHMS = [
+    ("BFS", "bfs", bfs_path),
+    ("DFS", "dfs", dfs_path),
+    ("Dijkstra", "dijkstra", dijkstra_path),
+    ("Bellman-Ford", "bellman", bellman_ford_path),
+    ("A*", "astar", astar_path),
+    ("JPS", "jps", jps_path),
+]
+
+# Algorithms that take node positions
+POSITIONED = ("astar", "jps")
+
+ALGORITHM_KEYS = {key: (name, function) for name, key, function in ALGORITHMS}
+
+
+def find_path(key, network, source, destination, pos=None):
+    """Run the algorithm registered under key"""
+    name, function = ALGORITHM_KEYS[key]
+    if key in POSITIONED:
+        return function(network, source, destination, pos)
+    return function(network, source, destination)
+
+
+def path_cost(network, path, weight='weight'):
+    """Sum of edge weights along path"""
+    return sum(network[path[i]][path[i + 1]][weight] for i in range(len(path) - 1))
+
+
+def timed_path(key, network, source, destination, pos=None):
+    """Run an algorithm once and return (path, seconds)"""
+    start_time = time.perf_counter()
+    path = find_path(key, network, source, destination, pos)
+    return path, time.perf_counter() - start_time
+
+
+def measured_path(key, network, source, destination, pos=None, repeats=5):
+    """Run an algorithm repeats times and return (path, median seconds)"""
+    samples = []
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter_ns()
+        path = find_path(key, network, source, destination, pos)
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    return path, samples[len(samples) // 2] / 1e9
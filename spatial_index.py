@@ -0,0 +1,288 @@
+import heapq
+import math
+from collections import defaultdict
+
+
+class _Grid:
+    """Uniform grid mapping cells to the set of keys overlapping them"""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = defaultdict(set)
+
+    def cell_of(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def insert(self, key, cells):
+        for cell in cells:
+            self.cells[cell].add(key)
+
+    def discard(self, key, cells):
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.cells[cell]
+
+    def ring(self, cx, cy, k):
+        """Yield the occupied cells at Chebyshev distance k from (cx, cy)"""
+        if k == 0:
+            bucket = self.cells.get((cx, cy))
+            if bucket:
+                yield bucket
+            return
+        for dx in range(-k, k + 1):
+            for cell in ((cx + dx, cy - k), (cx + dx, cy + k)):
+                bucket = self.cells.get(cell)
+                if bucket:
+                    yield bucket
+        for dy in range(-k + 1, k):
+            for cell in ((cx - k, cy + dy), (cx + k, cy + dy)):
+                bucket = self.cells.get(cell)
+                if bucket:
+                    yield bucket
+
+    def segment_cells(self, x1, y1, x2, y2):
+        """Cells crossed by the segment, walked with a grid DDA"""
+        cx, cy = self.cell_of(x1, y1)
+        ex, ey = self.cell_of(x2, y2)
+        cells = [(cx, cy)]
+        dx, dy = x2 - x1, y2 - y1
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        if dx != 0:
+            next_x = (cx + (step_x > 0)) * self.cell_size
+            t_max_x = (next_x - x1) / dx
+            t_delta_x = self.cell_size / abs(dx)
+        else:
+            t_max_x = t_delta_x = math.inf
+        if dy != 0:
+            next_y = (cy + (step_y > 0)) * self.cell_size
+            t_max_y = (next_y - y1) / dy
+            t_delta_y = self.cell_size / abs(dy)
+        else:
+            t_max_y = t_delta_y = math.inf
+
+        limit = abs(ex - cx) + abs(ey - cy)
+        while (cx, cy) != (ex, ey) and len(cells) <= limit:
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+            cells.append((cx, cy))
+        if cells[-1] != (ex, ey):
+            cells.append((ex, ey))
+        return cells
+
+
+def _point_segment_distance(px, py, x1, y1, x2, y2):
+    dx, dy = x2 - x1, y2 - y1
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(px - x1, py - y1)
+    t = max(0.0, min(1.0, ((px - x1) * dx + (py - y1) * dy) / length_sq))
+    return math.hypot(px - (x1 + t * dx), py - (y1 + t * dy))
+
+
+class SpatialIndex:
+    """Uniform-grid index over node positions and edge segments for hit-testing.
+
+    Nodes live in a grid sized to the average node spacing, so a nearest-node
+    query only inspects the few cells around the click. Edges are registered
+    in every cell their segment crosses on a second, coarser grid.
+    """
+
+    def __init__(self, cell_size=0.1, edge_cell_size=0.1):
+        self.default_cell_size = cell_size
+        self.default_edge_cell_size = edge_cell_size
+        self.pos = {}
+        self._incident = defaultdict(set)
+        self._edge_cells = {}
+        self._built_size = 0
+        self._reset(cell_size, edge_cell_size)
+
+    def _reset(self, cell_size, edge_cell_size):
+        self._nodes = _Grid(cell_size)
+        self._edges = _Grid(edge_cell_size)
+        self._node_cell = {}
+        self._edge_cells = {}
+        # Occupied cell range; only ever grows, which keeps it a safe search limit
+        self._cell_bounds = None
+
+    def __len__(self):
+        return len(self.pos)
+
+    def __contains__(self, node):
+        return node in self.pos
+
+    def clear(self):
+        """Drop every node and edge"""
+        self.pos = {}
+        self._incident = defaultdict(set)
+        self._built_size = 0
+        self._reset(self.default_cell_size, self.default_edge_cell_size)
+
+    def rebuild(self, pos, edges=()):
+        """Rebuild the index from a position mapping and an edge iterable"""
+        self.clear()
+        if pos:
+            xs = [float(xy[0]) for xy in pos.values()]
+            ys = [float(xy[1]) for xy in pos.values()]
+            extent = max(max(xs) - min(xs), max(ys) - min(ys))
+            spacing = extent / math.sqrt(len(pos)) if extent > 0 else self.default_cell_size
+            cell_size = min(self.default_cell_size, max(spacing, 1e-9))
+            self._reset(cell_size, max(cell_size, self.default_edge_cell_size))
+
+        for node, (x, y) in pos.items():
+            self._insert_node(node, float(x), float(y))
+        for u, v in edges:
+            self.add_edge(u, v)
+        self._built_size = len(self.pos)
+
+    def _insert_node(self, node, x, y):
+        self.pos[node] = (x, y)
+        cell = self._nodes.cell_of(x, y)
+        self._node_cell[node] = cell
+        self._nodes.insert(node, (cell,))
+        bounds = self._cell_bounds
+        if bounds is None:
+            self._cell_bounds = [cell[0], cell[1], cell[0], cell[1]]
+        else:
+            bounds[0], bounds[1] = min(bounds[0], cell[0]), min(bounds[1], cell[1])
+            bounds[2], bounds[3] = max(bounds[2], cell[0]), max(bounds[3], cell[1])
+
+    def _edge_key(self, u, v):
+        return (u, v) if (u, v) in self._edge_cells or (v, u) not in self._edge_cells else (v, u)
+
+    def update_node(self, node, xy):
+        """Add node at xy, or move it there along with its incident edges"""
+        x, y = float(xy[0]), float(xy[1])
+        if node in self.pos:
+            self._nodes.discard(node, (self._node_cell[node],))
+        self._insert_node(node, x, y)
+
+        for edge in self._incident.get(node, ()):
+            self._edges.discard(edge, self._edge_cells[edge])
+            self._index_edge(edge)
+
+        if len(self.pos) > 4 * max(self._built_size, 256):
+            edges = list(self._edge_cells)
+            self.rebuild(dict(self.pos), edges)
+
+    def remove_node(self, node):
+        """Remove node and its incident edges"""
+        if node not in self.pos:
+            return
+        for u, v in list(self._incident.get(node, ())):
+            self.remove_edge(u, v)
+        self._nodes.discard(node, (self._node_cell.pop(node),))
+        self._incident.pop(node, None)
+        del self.pos[node]
+
+    def _index_edge(self, edge):
+        u, v = edge
+        (x1, y1), (x2, y2) = self.pos[u], self.pos[v]
+        cells = self._edges.segment_cells(x1, y1, x2, y2)
+        self._edge_cells[edge] = cells
+        self._edges.insert(edge, cells)
+
+    def add_edge(self, u, v):
+        """Register the segment between two indexed nodes"""
+        if u not in self.pos or v not in self.pos:
+            return
+        edge = self._edge_key(u, v)
+        if edge in self._edge_cells:
+            return
+        self._index_edge(edge)
+        self._incident[u].add(edge)
+        self._incident[v].add(edge)
+
+    def remove_edge(self, u, v):
+        """Forget the segment between u and v"""
+        edge = self._edge_key(u, v)
+        cells = self._edge_cells.pop(edge, None)
+        if cells is None:
+            return
+        self._edges.discard(edge, cells)
+        self._incident[u].discard(edge)
+        self._incident[v].discard(edge)
+
+    def nearest_node(self, x, y, radius):
+        """Closest node within radius of (x, y), or None"""
+        grid = self._nodes
+        cx, cy = grid.cell_of(x, y)
+        best, best_dist = None, radius
+        max_ring = int(math.ceil(radius / grid.cell_size)) + 1
+
+        for k in range(max_ring + 1):
+            if (k - 1) * grid.cell_size > best_dist:
+                break
+            for bucket in grid.ring(cx, cy, k):
+                for node in bucket:
+                    nx_, ny_ = self.pos[node]
+                    dist = math.hypot(x - nx_, y - ny_)
+                    if dist < best_dist:
+                        best, best_dist = node, dist
+        return best
+
+    def nearest_edge(self, x, y, radius):
+        """Closest edge (u, v) whose segment passes within radius of (x, y), or None"""
+        grid = self._edges
+        cx, cy = grid.cell_of(x, y)
+        reach = int(math.ceil(radius / grid.cell_size))
+        best, best_dist = None, radius
+        seen = set()
+
+        for k in range(reach + 1):
+            for bucket in grid.ring(cx, cy, k):
+                for edge in bucket:
+                    if edge in seen:
+                        continue
+                    seen.add(edge)
+                    (x1, y1), (x2, y2) = self.pos[edge[0]], self.pos[edge[1]]
+                    dist = _point_segment_distance(x, y, x1, y1, x2, y2)
+                    if dist < best_dist:
+                        best, best_dist = edge, dist
+        return best
+
+    def nodes_within(self, x, y, radius):
+        """Every node within radius of (x, y)"""
+        grid = self._nodes
+        cx, cy = grid.cell_of(x, y)
+        found = []
+        for k in range(int(math.ceil(radius / grid.cell_size)) + 1):
+            for bucket in grid.ring(cx, cy, k):
+                for node in bucket:
+                    nx_, ny_ = self.pos[node]
+                    if math.hypot(x - nx_, y - ny_) <= radius:
+                        found.append(node)
+        return found
+
+    def nearest_nodes(self, x, y, count, accept=None):
+        """Up to count (distance, node) pairs closest to (x, y), nearest first; accept filters nodes"""
+        grid = self._nodes
+        cx, cy = grid.cell_of(x, y)
+        best = []
+        if self._cell_bounds is None:
+            return best
+        min_x, min_y, max_x, max_y = self._cell_bounds
+        max_ring = max(cx - min_x, max_x - cx, cy - min_y, max_y - cy, 0)
+
+        for k in range(max_ring + 1):
+            # Every node in ring k is at least (k - 1) cells away
+            if len(best) == count and (k - 1) * grid.cell_size > -best[0][0]:
+                break
+            for bucket in grid.ring(cx, cy, k):
+                for node in bucket:
+                    if accept is not None and not accept(node):
+                        continue
+                    nx_, ny_ = self.pos[node]
+                    dist = math.hypot(x - nx_, y - ny_)
+                    if len(best) < count:
+                        heapq.heappush(best, (-dist, node))
+                    elif dist < -best[0][0]:
+                        heapq.heapreplace(best, (-dist, node))
+        return sorted((-dist, node) for dist, node in best)
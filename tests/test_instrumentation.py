@@ -0,0 +1,60 @@
+import random
+
+import networkx as nx
+import pytest
+
+from generators import generate_grid_network
+from instrumentation import INSTRUMENTED, SearchStats, bellman_ford_search, instrumented_path
+from routing import ALGORITHMS, find_path
+
+
+def square(weight):
+    network = nx.cycle_graph(['a', 'b', 'c', 'd'])
+    nx.set_edge_attributes(network, 1, 'weight')
+    network['c']['d']['weight'] = weight
+    return network
+
+
+@pytest.mark.parametrize('key', ['dijkstra', 'astar', 'bellman'])
+def test_negative_weight_is_rejected(key):
+    with pytest.raises(ValueError):
+        instrumented_path(key, square(-1), 'a', 'd')
+
+
+def test_bellman_ford_stops_on_directed_negative_cycle():
+    network = nx.DiGraph()
+    network.add_weighted_edges_from([('a', 'b', 1), ('b', 'c', -3), ('c', 'b', 1), ('c', 'd', 1)])
+    with pytest.raises(ValueError):
+        bellman_ford_search(network, 'a', 'd', SearchStats())
+
+
+def test_bellman_ford_allows_directed_negative_links():
+    network = nx.DiGraph()
+    network.add_weighted_edges_from([('a', 'b', 4), ('a', 'c', 1), ('b', 'd', 1), ('c', 'b', -2)])
+    assert bellman_ford_search(network, 'a', 'd', SearchStats()) == ['a', 'c', 'b', 'd']
+
+
+def test_every_search_handles_non_negative_weights():
+    network = square(0)
+    for key in INSTRUMENTED:
+        assert instrumented_path(key, network, 'a', 'c')[0] is not None
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_instrumented_searches_return_the_routing_paths(seed):
+    # Counters on or off must never change the route that is shown
+    rng = random.Random(seed)
+    if seed % 3 == 0:
+        network = generate_grid_network(8, 8)
+        pos = nx.get_node_attributes(network, 'pos')
+    else:
+        network = nx.connected_watts_strogatz_graph(60, 4, 0.2, seed=seed)
+        for u, v in network.edges():
+            network[u][v]['weight'] = rng.randint(1, 3)
+        pos = nx.random_layout(network, seed=seed)
+    nodes = list(network)
+    for _ in range(25):
+        source, destination = rng.sample(nodes, 2)
+        for name, key, function in ALGORITHMS:
+            assert instrumented_path(key, network, source, destination, pos)[0] == \
+                find_path(key, network, source, destination, pos), name
@@ -0,0 +1,21 @@
+import networkx as nx
+import pytest
+
+from network_io import CompactNetwork, load_binary, save_binary
+
+
+@pytest.mark.parametrize('labels', [['a', 'b', 'c'], [0, 1, 2]])
+def test_binary_round_trip_keeps_labels(tmp_path, labels):
+    network = nx.path_graph(labels)
+    filename = tmp_path / 'network.rnet'
+    save_binary(CompactNetwork.from_networkx(network), filename)
+    restored = load_binary(filename).to_networkx()
+    assert sorted(restored.nodes()) == sorted(network.nodes())
+    assert sorted(map(sorted, restored.edges())) == sorted(map(sorted, network.edges()))
+
+
+@pytest.mark.parametrize('labels', [[(0, 0), (0, 1), (1, 1)], [0.5, 1.5, 2.5], [True, False], [0, 'a', 'b']])
+def test_labels_that_would_not_round_trip_are_rejected(tmp_path, labels):
+    network = nx.path_graph(labels)
+    with pytest.raises(ValueError):
+        save_binary(CompactNetwork.from_networkx(network), tmp_path / 'network.rnet')
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+import tkinter
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def has_display():
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not has_display(), reason="no display")
+def test_startup_check():
+    # A fresh interpreter, so the clock and sys.modules are those of a real launch
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'main.py'), '--startup-check'],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,513 @@
+"""Replay time-varying link weights from a trace and measure route stability.
+
+A trace holds one weight update per line, "time source target weight"
+(comma or whitespace separated, '#' comments, optional header), in time
+order. Updates are applied in windows of --interval trace seconds, like a
+router's SPF hold timer; at the end of each window only the monitored
+routes the window's updates could have changed are recomputed:
+
+    python traces.py --network topology.rnet --trace weights.csv --routes 200 --interval 0.5
+    python traces.py --generate random --nodes 500 --edges 2000 --synthesize 100000 --trace weights.csv
+
+Per algorithm it reports recomputations, route flaps (a recomputation that
+picked a different path) and stale-route durations (from the first update
+that invalidated a route to the recomputation that replaced it).
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import signal
+import sys
+import threading
+import time
+
+from routing import ALGORITHM_KEYS, ALGORITHMS, POSITIONED, find_path, forget_search_caches, path_cost
+
+CHUNK_BYTES = 2 * 1024 * 1024
+
+# Algorithms whose routes ignore weights never need recomputing
+UNWEIGHTED = ("bfs", "dfs")
+
+
+def _number(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return None
+
+
+class UpdateStream:
+    """Iterable of (time, source, target, weight) updates, reading the file in large chunks.
+
+    offset is the byte offset just past the last update yielded and last is
+    that update, so a replay can checkpoint between windows and later resume
+    with start=offset.
+    """
+
+    def __init__(self, filename, progress=None, cancel=None, start=0):
+        self.filename = filename
+        self.progress = progress
+        self.cancel = cancel
+        self.offset = start
+        self.last = None
+        self.exhausted = False
+
+    def __iter__(self):
+        total = os.path.getsize(self.filename)
+        # Only the start of the file can hold a header
+        first = self.offset == 0
+        position = self.offset
+        with open(self.filename, 'rb') as f:
+            f.seek(position)
+            while True:
+                lines = f.readlines(CHUNK_BYTES)
+                if not lines:
+                    break
+                for raw in lines:
+                    position += len(raw)
+                    line = raw.decode('utf-8', errors='replace').strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    fields = [field.strip() for field in (line.split(',') if ',' in line else line.split())]
+                    if len(fields) < 4:
+                        continue
+                    t, weight = _number(fields[0]), _number(fields[3])
+                    if t is None or weight is None:
+                        if first:
+                            first = False
+                            continue  # header row
+                        raise ValueError(f"Bad trace line: {line}")
+                    first = False
+                    self.offset = position
+                    self.last = (t, fields[1], fields[2], int(weight) if weight.is_integer() else weight)
+                    yield self.last
+                if self.progress:
+                    self.progress(f.tell(), total)
+                if self.cancel is not None and self.cancel.is_set():
+                    raise InterruptedError("Trace replay cancelled")
+        self.exhausted = True
+
+
+def iter_updates(filename, progress=None, cancel=None):
+    """Stream (time, source, target, weight) updates, reading the file in large chunks"""
+    return iter(UpdateStream(filename, progress, cancel))
+
+
+def iter_windows(updates, interval):
+    """Group time-ordered updates into (recompute time, [updates]) windows.
+
+    Like an SPF hold timer, a window opens at the first update after the
+    previous recomputation and closes interval trace seconds later; with
+    interval 0 each distinct timestamp is its own window.
+    """
+    window_end = None
+    batch = []
+    for update in updates:
+        t = update[0]
+        if window_end is not None and (t > window_end if interval > 0 else t != window_end):
+            yield window_end, batch
+            batch = []
+            window_end = None
+        if window_end is None:
+            window_end = t + max(interval, 0)
+        batch.append(update)
+    if batch:
+        yield window_end, batch
+
+
+def synthesize_trace(network, filename, updates, rate=1000.0, seed=None, low=1, high=10):
+    """Write a random trace of weight updates at about rate updates per trace second"""
+    rng = random.Random(seed)
+    edges = list(network.edges())
+    t = 0.0
+    with open(filename, 'w') as f:
+        f.write("time,source,target,weight\n")
+        for _ in range(updates):
+            t += rng.expovariate(rate)
+            u, v = rng.choice(edges)
+            f.write(f"{t:.6f},{u},{v},{rng.randint(low, high)}\n")
+
+
+class _Route:
+    """One monitored (algorithm, source, destination) route"""
+    __slots__ = ('key', 'pair', 'path', 'edges', 'cost')
+
+    def __init__(self, key, pair):
+        self.key = key
+        self.pair = pair
+        self.path = None
+        self.edges = frozenset()
+        self.cost = math.inf
+
+
+class _Pair:
+    """Distances from a monitored source and to its destination, plus what is needed to
+    bound paths through links whose weight dropped since they were computed"""
+    __slots__ = ('source', 'destination', 'routes', 'from_source', 'to_destination', 'reach', 'rest')
+
+    def __init__(self, source, destination):
+        self.source = source
+        self.destination = destination
+        self.routes = []
+        self.from_source = {}
+        self.to_destination = {}
+        self.reach = math.inf
+        self.rest = math.inf
+
+
+class TraceReplay:
+    """Apply weight updates to a network and keep monitored routes current.
+
+    A pair's routes are re-checked only when an update could change them: a
+    weight increase on one of their edges, or a decrease after which a lower
+    bound on paths through decreased links, built from the distances of the
+    last check, undercuts a route's current cost. A re-check refreshes those
+    distances and recomputes only routes that are no longer shortest.
+    Unweighted algorithms are never recomputed.
+    """
+
+    def __init__(self, network, pairs, algorithm_keys, pos=None, weight='weight'):
+        import networkx as nx
+
+        self.network = network
+        self.pos = pos
+        self.weight = weight
+        self._distances = lambda node: nx.single_source_dijkstra_path_length(network, node, weight=weight)
+        self.pairs = []
+        self.by_edge = {}
+        self.stats = {key: {'routes': 0, 'recomputes': 0, 'flaps': 0, 'stale_total': 0.0, 'stale_max': 0.0}
+                      for key in algorithm_keys}
+        self.updates = 0
+        self.ignored = 0
+        self.windows = 0
+        self.seconds = 0.0
+        self.paused = False
+        # Current weight of every link the trace has changed, for checkpoints
+        self.overrides = {}
+
+        for source, destination in pairs:
+            if source not in network or destination not in network:
+                continue
+            pair = _Pair(source, destination)
+            for key in algorithm_keys:
+                route = _Route(key, pair)
+                self.stats[key]['routes'] += 1
+                self._recompute(route)
+                if key not in UNWEIGHTED:
+                    pair.routes.append(route)
+            if pair.routes:
+                self._rebuild_trees(pair)
+                self.pairs.append(pair)
+
+    def _edge_key(self, u, v):
+        return (u, v) if u <= v else (v, u)
+
+    def _rebuild_trees(self, pair):
+        pair.from_source = self._distances(pair.source)
+        pair.to_destination = self._distances(pair.destination)
+        pair.reach = pair.rest = math.inf
+
+    def _recompute(self, route):
+        """Find the route again; returns True when the path changed"""
+        for edge in route.edges:
+            self.by_edge[edge].discard(route)
+
+        pair = route.pair
+        path = find_path(route.key, self.network, pair.source, pair.destination, self.pos)
+        changed = path != route.path
+        route.path = path
+        route.edges = frozenset(self._edge_key(a, b) for a, b in zip(path, path[1:])) if path else frozenset()
+        route.cost = path_cost(self.network, path, self.weight) if path else math.inf
+        for edge in route.edges:
+            self.by_edge.setdefault(edge, set()).add(route)
+        return changed
+
+    def apply_window(self, window_end, updates):
+        """Apply one window of updates, then re-check the pairs they may have changed"""
+        self.windows += 1
+        touched = {}
+        changed = False
+        for t, u, v, new_weight in updates:
+            self.updates += 1
+            if not self.network.has_edge(u, v):
+                self.ignored += 1
+                continue
+            data = self.network[u][v]
+            old_weight = data.get(self.weight, 1)
+            if new_weight == old_weight:
+                continue
+            data[self.weight] = new_weight
+            self.overrides[self._edge_key(u, v)] = new_weight
+            changed = True
+            delta = new_weight - old_weight
+
+            # Routes over the link move with it; an increase may make another path shorter
+            for route in self.by_edge.get(self._edge_key(u, v), ()):
+                route.cost += delta
+                if delta > 0 and route.key not in UNWEIGHTED:
+                    touched.setdefault(route.pair, t)
+
+            # A decrease can only help paths through this link. Past a path's last
+            # decreased link the old distances to the destination still hold, and
+            # before it the path costs at least the old distance or the cheapest
+            # way across any decreased link (reach).
+            if delta < 0:
+                for pair in self.pairs:
+                    if pair in touched:
+                        continue
+                    ds, dd = pair.from_source, pair.to_destination
+                    su, sv = ds.get(u, math.inf), ds.get(v, math.inf)
+                    du, dv = dd.get(u, math.inf), dd.get(v, math.inf)
+                    pair.reach = min(pair.reach, min(su, sv) + new_weight)
+                    bound = min(min(su, pair.reach) + new_weight + dv,
+                                min(sv, pair.reach) + new_weight + du,
+                                pair.reach + pair.rest)
+                    pair.rest = min(pair.rest, new_weight + min(du, dv))
+                    if bound < max(route.cost for route in pair.routes):
+                        touched[pair] = t
+
+        # A* scales its heuristic to the lightest link per unit length
+        if changed:
+            forget_search_caches(self.network)
+        # Pairs are re-checked in a fixed order so stale sums come out the same on every run
+        for pair in self.pairs:
+            if pair not in touched:
+                continue
+            since = touched[pair]
+            self._rebuild_trees(pair)
+            shortest = pair.from_source.get(pair.destination, math.inf)
+            for route in pair.routes:
+                if route.cost <= shortest:
+                    continue
+                stats = self.stats[route.key]
+                stats['recomputes'] += 1
+                if self._recompute(route):
+                    stale = window_end - since
+                    stats['flaps'] += 1
+                    stats['stale_total'] += stale
+                    stats['stale_max'] = max(stats['stale_max'], stale)
+
+    def state(self, elapsed=0.0):
+        """Everything needed to continue the replay later, as plain data; elapsed is unrecorded run time"""
+        return {
+            'algorithm_keys': list(self.stats),
+            'stats': self.stats,
+            'counters': (self.updates, self.ignored, self.windows, self.seconds + elapsed),
+            'overrides': self.overrides,
+            'pairs': [(pair.source, pair.destination, pair.from_source, pair.to_destination, pair.reach, pair.rest,
+                       [(route.key, route.path, route.cost) for route in pair.routes])
+                      for pair in self.pairs],
+        }
+
+    @classmethod
+    def restore(cls, network, state, pos=None, weight='weight'):
+        """Rebuild a replay from state() without recomputing any route; reapplies the changed weights"""
+        replay = cls(network, [], state['algorithm_keys'], pos, weight)
+        replay.stats = state['stats']
+        replay.updates, replay.ignored, replay.windows, replay.seconds = state['counters']
+        replay.overrides = state['overrides']
+        for (u, v), new_weight in replay.overrides.items():
+            network[u][v][weight] = new_weight
+        forget_search_caches(network)
+
+        for source, destination, from_source, to_destination, reach, rest, routes in state['pairs']:
+            pair = _Pair(source, destination)
+            pair.from_source, pair.to_destination, pair.reach, pair.rest = from_source, to_destination, reach, rest
+            for key, path, cost in routes:
+                route = _Route(key, pair)
+                route.path, route.cost = path, cost
+                route.edges = frozenset(replay._edge_key(a, b) for a, b in zip(path, path[1:])) if path else frozenset()
+                for edge in route.edges:
+                    replay.by_edge.setdefault(edge, set()).add(route)
+                pair.routes.append(route)
+            replay.pairs.append(pair)
+        return replay
+
+    def summary(self):
+        """Per-algorithm recomputes, flaps and stale durations"""
+        rows = []
+        for key, stats in self.stats.items():
+            row = {'algorithm': ALGORITHM_KEYS[key][0]}
+            row.update(stats)
+            row['stale_mean'] = stats['stale_total'] / stats['flaps'] if stats['flaps'] else 0.0
+            rows.append(row)
+        return rows
+
+
+def replay_trace(network, filename, pairs, algorithm_keys, pos=None, interval=1.0, progress=None, cancel=None,
+                 checkpoint=None, checkpoint_every=30.0, resume=None):
+    """Replay a trace file against network (modified in place); returns the TraceReplay
+
+    With checkpoint set, the replay state is written to that file every
+    checkpoint_every seconds by a background writer, and once more when
+    cancel stops the replay, which then returns with paused set. resume is
+    a state from checkpoint.load_checkpoint; pairs are then taken from it
+    and the result matches a replay that was never interrupted.
+    """
+    from checkpoint import CheckpointWriter, graph_fingerprint, restore_rng, rng_state, save_checkpoint
+
+    settings = {'filename': os.path.abspath(filename), 'interval': interval, 'algorithm_keys': list(algorithm_keys)}
+    fingerprint = graph_fingerprint(network) if checkpoint or resume else None
+    if resume is not None:
+        if resume['fingerprint'] != fingerprint:
+            raise ValueError("The checkpoint was taken on a different network")
+        if resume['settings'] != settings:
+            raise ValueError("The checkpoint was taken with a different trace, interval or algorithms")
+        replay = TraceReplay.restore(network, resume['replay'], pos)
+        restore_rng(resume['rng'])
+        stream = UpdateStream(filename, progress, None if checkpoint else cancel, resume['offset'])
+        updates = itertools.chain(resume['pending'], stream)
+    else:
+        replay = TraceReplay(network, pairs, algorithm_keys, pos)
+        stream = UpdateStream(filename, progress, None if checkpoint else cancel)
+        updates = stream
+
+    def snapshot():
+        # The update that closed the last window has been read but not applied yet
+        pending = [] if stream.exhausted or stream.last is None else [stream.last]
+        return {'fingerprint': fingerprint, 'settings': settings, 'offset': stream.offset, 'pending': pending,
+                'rng': rng_state(), 'replay': replay.state(time.perf_counter() - start)}
+
+    writer = CheckpointWriter(checkpoint) if checkpoint else None
+    start = time.perf_counter()
+    last_checkpoint = start
+    try:
+        for window_end, window in iter_windows(updates, interval):
+            replay.apply_window(window_end, window)
+            if writer is None:
+                continue
+            # Checkpoints are only taken between windows, where the state is consistent
+            if cancel is not None and cancel.is_set():
+                save_checkpoint(checkpoint, snapshot())
+                replay.paused = True
+                break
+            if time.perf_counter() - last_checkpoint >= checkpoint_every:
+                writer.submit(snapshot())
+                last_checkpoint = time.perf_counter()
+    finally:
+        if writer is not None:
+            writer.close()
+    replay.seconds += time.perf_counter() - start
+    return replay
+
+
+def sample_pairs(network, count, seed=None):
+    rng = random.Random(seed)
+    nodes = list(network.nodes())
+    return [tuple(rng.sample(nodes, 2)) for _ in range(count)] if len(nodes) > 1 else []
+
+
+class TraceJob(threading.Thread):
+    """Run replay_trace on a background thread, exposing progress for polling"""
+
+    def __init__(self, network, filename, pairs, algorithm_keys, pos=None, interval=1.0):
+        super().__init__(daemon=True)
+        self.network = network
+        self.filename = filename
+        self.pairs = pairs
+        self.algorithm_keys = algorithm_keys
+        self.pos = pos
+        self.interval = interval
+        self.fraction = 0.0
+        self.result = None
+        self.error = None
+        self.done = False
+        self.cancel_event = threading.Event()
+
+    def _progress(self, done, total):
+        self.fraction = done / total if total else 1.0
+
+    def run(self):
+        try:
+            self.result = replay_trace(self.network, self.filename, self.pairs, self.algorithm_keys, self.pos,
+                                       self.interval, self._progress, self.cancel_event)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def cancel(self):
+        self.cancel_event.set()
+
+
+def build_parser():
+    from cli import add_network_arguments
+
+    parser = argparse.ArgumentParser(description="Replay a link-weight trace and report route stability")
+    add_network_arguments(parser)
+    parser.add_argument('--trace', required=True, help="weight update trace (time,source,target,weight)")
+    parser.add_argument('--synthesize', type=int, metavar='N', help="write a random trace of N updates and exit")
+    parser.add_argument('--rate', type=float, default=1000.0, help="updates per trace second when synthesizing")
+    parser.add_argument('--routes', type=int, default=100, help="random source/destination pairs to monitor")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="hold timer: trace seconds between route recomputations (0 = every timestamp)")
+    parser.add_argument('--algorithms', default="bfs,dijkstra,bellman,astar",
+                        help="comma-separated subset of " + ','.join(key for _, key, _ in ALGORITHMS))
+    parser.add_argument('--output', help="write the summary as JSON")
+    parser.add_argument('--checkpoint', help="periodically save the replay state to this file; Ctrl+C pauses")
+    parser.add_argument('--checkpoint-every', type=float, default=30.0, metavar='SECONDS',
+                        help="seconds between checkpoints (default 30)")
+    parser.add_argument('--resume', action='store_true', help="continue from the --checkpoint file")
+    return parser
+
+
+def main(argv=None):
+    from cli import prepare_network
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    algorithm_keys = [key.strip() for key in args.algorithms.split(',') if key.strip()]
+    unknown = [key for key in algorithm_keys if key not in ALGORITHM_KEYS]
+    if unknown:
+        parser.error(f"unknown algorithms: {', '.join(unknown)}")
+
+    network, pos = prepare_network(args, need_positions=any(key in POSITIONED for key in algorithm_keys))
+
+    if args.synthesize:
+        synthesize_trace(network, args.trace, args.synthesize, args.rate, args.seed)
+        print(f"Wrote {args.synthesize} updates to {args.trace}")
+        return 0
+
+    resume = None
+    cancel = None
+    if args.checkpoint:
+        from checkpoint import load_checkpoint
+
+        if args.resume:
+            resume = load_checkpoint(args.checkpoint)
+        # Ctrl+C stops at the next window boundary and saves a final checkpoint
+        cancel = threading.Event()
+        signal.signal(signal.SIGINT, lambda signum, frame: cancel.set())
+    elif args.resume:
+        parser.error("--resume needs --checkpoint")
+
+    try:
+        replay = replay_trace(network, args.trace, sample_pairs(network, args.routes, args.seed), algorithm_keys,
+                              pos, args.interval, cancel=cancel, checkpoint=args.checkpoint,
+                              checkpoint_every=args.checkpoint_every, resume=resume)
+    except ValueError as e:
+        parser.error(str(e))
+    if replay.paused:
+        print(f"Paused after {replay.updates} updates; state saved to {args.checkpoint}, continue with --resume")
+        return 130
+    rows = replay.summary()
+
+    print(f"{replay.updates} updates ({replay.ignored} for unknown links) in {replay.windows} windows, "
+          f"{replay.seconds:.2f}s ({replay.updates / max(replay.seconds, 1e-9):.0f} updates/s)")
+    print(f"{'Algorithm':<14} {'Routes':>7} {'Recomputes':>11} {'Flaps':>7} {'Stale mean':>11} {'Stale max':>10}")
+    for row in rows:
+        print(f"{row['algorithm']:<14} {row['routes']:>7} {row['recomputes']:>11} {row['flaps']:>7} "
+              f"{row['stale_mean']:>11.3f} {row['stale_max']:>10.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'updates': replay.updates, 'ignored': replay.ignored, 'windows': replay.windows,
+                       'seconds': replay.seconds, 'algorithms': rows}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())